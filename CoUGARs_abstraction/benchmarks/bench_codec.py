@@ -0,0 +1,89 @@
+"""
+Compares decoding fleet status from the binary format in telemetry_codec against
+parsing the same status out of a free text std_msgs/String style message, and sending
+full keyframes every time against DeltaEncoder's keyframes plus deltas.
+
+Run with:  python3 -m testing_turtle_gui.benchmarks.bench_codec
+"""
+import random
+import time
+
+from testing_turtle_gui.fleet_schema import FleetSchema
+from testing_turtle_gui.telemetry_codec import StatusEncoder, StatusDecoder, DeltaEncoder
+
+MESSAGES = 50_000
+
+
+#the kind of free text a vehicle would otherwise publish on a String topic
+def make_text(vehicle_id, seq, stamp_ns, states, texts):
+    fields = [f"vehicle={vehicle_id}", f"seq={seq}", f"stamp={stamp_ns}"]
+    fields += [f"{key}={value}" for key, value in states.items()]
+    fields += [f"{key}={value}" for key, value in texts.items()]
+    return ";".join(fields)
+
+
+def parse_text(text, status_keys):
+    states = {}
+    texts = {}
+    header = {}
+    for field in text.split(";"):
+        key, _, value = field.partition("=")
+        if key in status_keys:
+            states[key] = int(value)
+        elif key in ("vehicle", "seq", "stamp"):
+            header[key] = int(value)
+        else:
+            texts[key] = value
+    return header, states, texts
+
+
+def main():
+    schema = FleetSchema({"vehicle_ids": list(range(1, 13))})
+    encoder = StatusEncoder(schema)
+    delta_encoder = DeltaEncoder(schema, keyframe_interval=20)
+    decoder = StatusDecoder(schema)
+    delta_decoder = StatusDecoder(schema)
+    status_keys = set(key for key, _ in schema.status_fields)
+    rng = random.Random(0)
+
+    #each vehicle keeps its status and one field flips now and then, like a real mission
+    fleet_states = {vehicle_id: {key: 1 for key, _ in schema.status_fields} for vehicle_id in schema.vehicle_ids}
+    fleet_seq = {vehicle_id: 0 for vehicle_id in schema.vehicle_ids}
+    binary, delta, text = [], [], []
+    for seq in range(MESSAGES):
+        vehicle_id = rng.choice(schema.vehicle_ids)
+        states = fleet_states[vehicle_id]
+        if rng.random() < 0.05:
+            states[rng.choice(list(states))] = rng.randint(0, 2)
+        texts = {"Status_messages": rng.choice(["running", "waiting"]), "Last_messages": "depth 14.6 m"}
+        binary.append(encoder.encode(vehicle_id, fleet_seq[vehicle_id], time.time_ns(), states, texts))
+        fleet_seq[vehicle_id] += 1
+        delta.append(delta_encoder.encode(vehicle_id, time.time_ns(), states, texts))
+        text.append(make_text(vehicle_id, seq, time.time_ns(), states, texts).encode("utf-8"))
+
+    start = time.perf_counter()
+    for payload in text:
+        parse_text(payload.decode("utf-8"), status_keys)
+    text_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for payload in binary:
+        decoder.decode(payload)
+    binary_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for payload in delta:
+        delta_decoder.decode(payload)
+    delta_s = time.perf_counter() - start
+
+    print(f"{'format':<8} {'bytes/msg':>10} {'msgs/s':>12}")
+    print(f"{'string':<8} {sum(map(len, text)) / MESSAGES:>10.1f} {MESSAGES / text_s:>12.0f}")
+    print(f"{'binary':<8} {sum(map(len, binary)) / MESSAGES:>10.1f} {MESSAGES / binary_s:>12.0f}")
+    print(f"{'delta':<8} {sum(map(len, delta)) / MESSAGES:>10.1f} {MESSAGES / delta_s:>12.0f}")
+    print()
+    print("delta encoder:", delta_encoder.stats.summary())
+    print("delta decoder:", delta_decoder.stats.summary())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Fills a ConsoleSearchIndex with simulated console lines from a fleet of vehicles and
+times typical filter-as-you-type queries.
+
+Run with:  python3 -m testing_turtle_gui.benchmarks.bench_console_search [lines]
+"""
+import random
+import sys
+import time
+
+from testing_turtle_gui.console_log import make_entry
+from testing_turtle_gui.console_search import ConsoleSearchIndex
+
+VEHICLES = 12
+TEMPLATES = [
+    "INFO: Heading {:.1f} degrees. Depth {:.1f} meters",
+    "INFO: Battery at {}%",
+    "INFO: DVL reports bottom lock achieved",
+    "WARNING: Depth sensor value out of expected range",
+    "WARNING: Modem ping {} ms late",
+    "ERROR: Manipulator arm failed to extend",
+    "ERROR: Leak detected in forward hull",
+    "DEBUG: Factor graph optimized in {} ms",
+    #a fresh number in every line, so the token vocabulary keeps growing
+    "DEBUG: Modem packet {} received",
+]
+QUERIES = [
+    ("ERROR", None, None),
+    ("leak", None, None),
+    ("DVL", None, None),
+    ("dep", None, None),
+    #one and two characters, matching a large part of the vocabulary
+    ("1", None, None),
+    ("de", None, None),
+    ("7q", None, None),
+    #in many packet numbers but few lines
+    ("12345", None, None),
+    ("", "ERROR", 3),
+    ("modem late", "WARNING", None),
+    ("leak", "ERROR", 7),
+    ("doesnotexist", None, None),
+]
+
+
+def make_line(rng, i):
+    template = rng.choice(TEMPLATES)
+    if "{:.1f}" in template:
+        return template.format(rng.uniform(0, 360), rng.uniform(0, 50))
+    return template.format(i if "packet" in template else rng.randint(0, 100))
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(0)
+    index = ConsoleSearchIndex()
+
+    start = time.perf_counter()
+    for i in range(lines):
+        index.add(make_entry(rng.randint(1, VEHICLES), make_line(rng, i)))
+    build_s = time.perf_counter() - start
+    print(f"indexed {lines} lines in {build_s:.1f} s ({build_s / lines * 1e6:.1f} us/line)")
+
+    for text, severity, vehicle in QUERIES:
+        runs = 20
+        start = time.perf_counter()
+        for _ in range(runs):
+            results = index.search(text, severity=severity, vehicle=vehicle, limit=500)
+        elapsed_ms = (time.perf_counter() - start) / runs * 1000
+        print(f"{text!r:>16} severity={severity!s:<8} vehicle={vehicle!s:<5} {len(results):>4} results {elapsed_ms:7.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Compares the two ways main() keeps Python signal handling alive inside the Qt event loop:
+the old 100 ms no-op QTimer and the signal wakeup socket + QSocketNotifier in event_loop.
+
+For each mode it measures
+  - how late a signal handler runs after the signal is sent
+  - how late a message from a simulated ros executor thread reaches the GUI thread
+    through RosQtBridge
+  - cpu used by the process while the GUI sits idle
+
+Run with:  QT_QPA_PLATFORM=offscreen python3 -m testing_turtle_gui.benchmarks.bench_event_loop
+"""
+import os
+import random
+import signal
+import statistics
+import threading
+import time
+
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from testing_turtle_gui.event_loop import EVENT_LOOP_MODES, install_quit_on_signals
+from testing_turtle_gui.ros_bridge import RosQtBridge
+
+SAMPLES = 40
+IDLE_SECONDS = 3.0
+
+
+def cpu_seconds():
+    times = os.times()
+    return times.user + times.system
+
+
+#runs the Qt event loop for a while, the threads being measured keep running meanwhile
+def run_loop(seconds):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def measure(mode):
+    waker = install_quit_on_signals(QApplication.instance(), mode, signals=())
+    rng = random.Random(0)
+
+    #signal handler latency
+    signal_delays = []
+    sent = {}
+    signal.signal(signal.SIGUSR1, lambda *args: signal_delays.append(time.perf_counter_ns() - sent["ns"]))
+
+    def send_signals():
+        for _ in range(SAMPLES):
+            time.sleep(rng.uniform(0.02, 0.12))
+            sent["ns"] = time.perf_counter_ns()
+            os.kill(os.getpid(), signal.SIGUSR1)
+
+    sender = threading.Thread(target=send_signals)
+    sender.start()
+    while sender.is_alive():
+        run_loop(0.2)
+    run_loop(0.2)
+    sender.join()
+
+    #ros -> GUI message latency
+    message_delays = []
+    bridge = RosQtBridge(lambda topic, stamp_ns: message_delays.append(time.perf_counter_ns() - stamp_ns))
+
+    def publish():
+        for _ in range(SAMPLES):
+            time.sleep(rng.uniform(0.005, 0.02))
+            bridge.enqueue("topic", time.perf_counter_ns())
+
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    while publisher.is_alive():
+        run_loop(0.1)
+    run_loop(0.1)
+    publisher.join()
+
+    #idle cpu
+    start_cpu = cpu_seconds()
+    start = time.perf_counter()
+    run_loop(IDLE_SECONDS)
+    idle_cpu = (cpu_seconds() - start_cpu) / (time.perf_counter() - start) * 100
+
+    signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+    if mode == "timer":
+        waker.stop()
+    else:
+        waker.close()
+    return signal_delays, message_delays, idle_cpu
+
+
+def ms(values, percentile):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile / 100))] / 1e6
+
+
+def main():
+    app = QApplication([])
+    print(f"{'mode':<9} {'signal mean':>12} {'signal p99':>11} {'msg mean':>9} {'msg p99':>8} {'idle cpu':>9}")
+    for mode in EVENT_LOOP_MODES:
+        signal_delays, message_delays, idle_cpu = measure(mode)
+        print(f"{mode:<9} {statistics.mean(signal_delays) / 1e6:>10.2f}ms {ms(signal_delays, 99):>9.2f}ms "
+              f"{statistics.mean(message_delays) / 1e6:>7.2f}ms {ms(message_delays, 99):>6.2f}ms {idle_cpu:>8.2f}%")
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,304 @@
+"""
+Headless benchmark of how fast MainWindow absorbs fleet status updates.
+
+Each scenario builds a MainWindow for a number of vehicles (with a stub ros node that
+only counts what the GUI publishes), and a driver thread feeds it synthetic FleetStatus
+messages through window.ros_bridge at a fixed rate, like MinimalSubscriber does. It reports
+  - messages and widget cell updates absorbed per second
+  - p50/p99 latency from a message being handed to the bridge to the window painting it
+  - event loop stalls, measured by a 5 ms heartbeat timer
+  - RSS growth over the scenario
+and writes the results as JSON, which --compare checks against an earlier run.
+
+Run with:
+  QT_QPA_PLATFORM=offscreen python3 -m testing_turtle_gui.benchmarks.bench_gui \\
+      --vehicles 3 12 50 --rates 100 1000 5000 --duration 5 --output gui_bench.json
+  QT_QPA_PLATFORM=offscreen python3 -m testing_turtle_gui.benchmarks.bench_gui --compare gui_bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+from PyQt6.QtCore import QObject, QEvent, QEventLoop, QTimer, Qt, PYQT_VERSION_STR
+from PyQt6.QtWidgets import QApplication
+
+from testing_turtle_gui.fleet_schema import FleetSchema
+from testing_turtle_gui.latency_stats import LatencyHistogram
+from testing_turtle_gui.tabbed_window import MainWindow
+from testing_turtle_gui.telemetry_codec import FleetStatus, KIND_DELTA
+
+HEARTBEAT_MS = 5
+#a heartbeat this late counts as a stall
+STALL_MS = 20
+#metrics where bigger is better, for --compare
+HIGHER_IS_BETTER = {"messages_per_s", "cell_updates_per_s"}
+
+
+class StubRosNode:
+    """
+    Takes the place of MinimalPublisher, the GUI's publishes are only counted.
+    """
+
+    def __init__(self):
+        self.published = 0
+
+    def publish_text(self, text):
+        self.published += 1
+
+    def publish_commands(self, commands):
+        self.published += len(commands)
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        #peak rather than current rss, in kB on linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+class PaintProbe(QObject):
+    """
+    Measures update-to-paint latency. The stamps of the messages that changed a visible
+    widget are collected, and when the window next paints (its UpdateRequest is processed)
+    every collected stamp gets its latency recorded.
+    """
+
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+        self.latency = LatencyHistogram()
+        self.paints = 0
+        self._applied = []
+        apply_fleet_status = window.apply_fleet_status
+
+        def recording_apply(status):
+            if self.changes_visible_widget(status):
+                self._applied.append(status.stamp_ns)
+            apply_fleet_status(status)
+
+        window.apply_fleet_status = recording_apply
+        window.installEventFilter(self)
+
+    def changes_visible_widget(self, status):
+        coug_number = status.vehicle_id
+        feedback_dict = self.window.feedback_dict
+        for changes in (status.states, status.texts):
+            for key, value in changes.items():
+                if feedback_dict[key][coug_number] == value:
+                    continue
+                for handle in self.window.widget_registry.handles_for(key, coug_number).values():
+                    if handle.widget.isVisible():
+                        return True
+        return False
+
+    def eventFilter(self, watched, event):
+        if watched is self.window and event.type() == QEvent.Type.UpdateRequest:
+            #paint now, so the time after painting can be taken
+            watched.event(event)
+            now_ns = time.perf_counter_ns()
+            self.paints += 1
+            for stamp_ns in self._applied:
+                self.latency.record(now_ns - stamp_ns)
+            self._applied.clear()
+            return True
+        return False
+
+
+class StallProbe(QObject):
+    def __init__(self):
+        super().__init__()
+        self.stalls = 0
+        self.stall_ms = 0.0
+        self.max_stall_ms = 0.0
+        self._last = time.perf_counter()
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.beat)
+        self.timer.start(HEARTBEAT_MS)
+
+    def beat(self):
+        now = time.perf_counter()
+        late_ms = (now - self._last) * 1000 - HEARTBEAT_MS
+        self._last = now
+        if late_ms >= STALL_MS:
+            self.stalls += 1
+            self.stall_ms += late_ms
+            self.max_stall_ms = max(self.max_stall_ms, late_ms)
+
+
+class Driver:
+    """
+    Feeds FleetStatus messages to window.ros_bridge from its own thread at rate msgs/s.
+    Every message carries a few status codes (each changes with probability churn), now
+    and then a status string, and console lines at console_rate lines/s.
+    """
+
+    def __init__(self, window, rate, churn, console_rate, seed=0):
+        self.window = window
+        self.rate = rate
+        self.churn = churn
+        self.console_probability = min(1.0, console_rate / rate) if rate else 0.0
+        self.rng = random.Random(seed)
+        self.status_keys = [key for key, _ in window.fleet_schema.status_fields]
+        self.vehicle_ids = window.fleet_schema.vehicle_ids
+        self.sent = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def make_status(self):
+        rng = self.rng
+        states = {}
+        for key in rng.sample(self.status_keys, 3):
+            states[key] = rng.randint(0, 2) if rng.random() < self.churn else 1
+        texts = {"Status_messages": rng.choice(["running", "waiting"])} if rng.random() < self.churn else {}
+        console = [("INFO", f"depth {rng.uniform(0, 30):.1f} m")] if rng.random() < self.console_probability else []
+        return FleetStatus(rng.choice(self.vehicle_ids), self.sent, time.perf_counter_ns(), KIND_DELTA, states, texts, console)
+
+    def _run(self):
+        bridge = self.window.ros_bridge
+        start = time.perf_counter()
+        while not self._stop.is_set():
+            due = int((time.perf_counter() - start) * self.rate)
+            while self.sent < due:
+                bridge.enqueue("fleet_status", self.make_status())
+                self.sent += 1
+            time.sleep(0.001)
+
+
+def run_loop(seconds):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def run_scenario(vehicles, rate, duration, churn, console_rate):
+    window = MainWindow(StubRosNode(), FleetSchema({"vehicle_ids": list(range(1, vehicles + 1)), "general_page_size": min(vehicles, 6)}))
+    window.show()
+    run_loop(0.2)
+
+    paint_probe = PaintProbe(window)
+    stall_probe = StallProbe()
+    driver = Driver(window, rate, churn, console_rate)
+    rss_start = rss_mb()
+    scheduler_start = window.update_scheduler.stats()
+
+    start = time.perf_counter()
+    driver.start()
+    run_loop(duration)
+    driver.stop()
+    #let the GUI drain what is still queued
+    drain_start = time.perf_counter()
+    while window.ros_bridge.backlog() and time.perf_counter() - drain_start < 10:
+        run_loop(0.01)
+    run_loop(0.1)
+    elapsed = time.perf_counter() - start
+
+    scheduler = window.update_scheduler.stats()
+    latency = paint_probe.latency.summary()
+    result = {
+        "vehicles": vehicles,
+        "offered_rate": rate,
+        "duration_s": round(elapsed, 3),
+        "messages": driver.sent,
+        "messages_per_s": round(window.ros_bridge.delivered_count / elapsed, 1),
+        "cell_updates_per_s": round((scheduler["updates_applied"] - scheduler_start["updates_applied"]) / elapsed, 1),
+        "frames": scheduler["frames"] - scheduler_start["frames"],
+        "paints": paint_probe.paints,
+        "update_to_paint_p50_ms": round(latency.get("p50_ms", 0.0), 3),
+        "update_to_paint_p99_ms": round(latency.get("p99_ms", 0.0), 3),
+        "stalls": stall_probe.stalls,
+        "stall_total_ms": round(stall_probe.stall_ms, 1),
+        "stall_max_ms": round(stall_probe.max_stall_ms, 1),
+        "drain_s": round(time.perf_counter() - drain_start, 3),
+        "rss_growth_mb": round(rss_mb() - rss_start, 2),
+    }
+
+    stall_probe.timer.stop()
+    window.removeEventFilter(paint_probe)
+    window.close()
+    window.deleteLater()
+    run_loop(0.1)
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(baseline, current):
+    baseline_runs = {(run["vehicles"], run["offered_rate"]): run for run in baseline["scenarios"]}
+    print(f"compared with {baseline.get('commit') or 'baseline'}")
+    for run in current["scenarios"]:
+        old = baseline_runs.get((run["vehicles"], run["offered_rate"]))
+        if old is None:
+            continue
+        changes = []
+        for metric in ("messages_per_s", "cell_updates_per_s", "update_to_paint_p99_ms", "stall_total_ms", "rss_growth_mb"):
+            if not old.get(metric):
+                continue
+            change = (run[metric] - old[metric]) / abs(old[metric]) * 100
+            worse = change < 0 if metric in HIGHER_IS_BETTER else change > 0
+            changes.append(f"{metric} {change:+.0f}%{' (worse)' if worse and abs(change) >= 10 else ''}")
+        print(f"  {run['vehicles']} vehicles @ {run['offered_rate']}/s: " + ", ".join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless MainWindow update throughput benchmark")
+    parser.add_argument("--vehicles", type=int, nargs="+", default=[3, 12])
+    parser.add_argument("--rates", type=int, nargs="+", default=[100, 1000, 5000], help="messages per second")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per scenario")
+    parser.add_argument("--churn", type=float, default=0.05, help="probability that a sent field changes")
+    parser.add_argument("--console-rate", type=float, default=50.0, help="console lines per second")
+    parser.add_argument("--output", help="write the results to this json file")
+    parser.add_argument("--compare", help="json file from an earlier run to compare with")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    results = {
+        "commit": git_commit(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "pyqt": PYQT_VERSION_STR,
+        "qpa": app.platformName(),
+        "settings": {"duration_s": args.duration, "churn": args.churn, "console_rate": args.console_rate},
+        "scenarios": [],
+    }
+    for vehicles in args.vehicles:
+        for rate in args.rates:
+            result = run_scenario(vehicles, rate, args.duration, args.churn, args.console_rate)
+            results["scenarios"].append(result)
+            print(json.dumps(result), file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            compare(json.load(baseline_file), results)
+
+
+if __name__ == '__main__':
+    main()
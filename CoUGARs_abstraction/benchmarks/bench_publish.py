@@ -0,0 +1,70 @@
+"""
+Publish throughput of a std_msgs/String publisher with the old publish_text (new message
+and an INFO log line per publish) against a reused message and each HotPathLogger mode.
+
+Run with:  python3 -m testing_turtle_gui.benchmarks.bench_publish 2>/dev/null
+(the log lines go to stderr, the results to stdout)
+"""
+import time
+
+import rclpy
+from rclpy.node import Node
+from std_msgs.msg import String
+
+from testing_turtle_gui.hot_path_log import HotPathLogger, LOG_MODES
+
+MESSAGES = 20_000
+
+
+def old_publish(node, publisher, text):
+    msg = String()
+    msg.data = text
+    publisher.publish(msg)
+    node.get_logger().info(f'Publishing from GUI: "{text}"')
+
+
+def run(publish):
+    start = time.perf_counter()
+    for i in range(MESSAGES):
+        publish(f"random number: {i % 3}")
+    return MESSAGES / (time.perf_counter() - start)
+
+
+def main():
+    rclpy.init()
+    node = Node("bench_publish")
+    publisher = node.create_publisher(String, "bench_publish", 10)
+    results = []
+
+    results.append(("new msg + info log", run(lambda text: old_publish(node, publisher, text))))
+
+    msg = String()
+
+    def reused_publish(text):
+        msg.data = text
+        publisher.publish(msg)
+
+    results.append(("reused msg, no log", run(reused_publish)))
+
+    for mode in LOG_MODES:
+        hot_log = HotPathLogger(node.get_logger(), mode)
+
+        def logged_publish(text):
+            msg.data = text
+            publisher.publish(msg)
+            hot_log.log('Publishing from GUI: "%s"', text)
+
+        results.append((f"reused msg, {mode} log", run(logged_publish)))
+        #joins the async worker, so it does not compete with the next mode
+        hot_log.close()
+
+    print(f"{'publish path':<24} {'msgs/s':>10}")
+    for name, rate in results:
+        print(f"{name:<24} {rate:>10.0f}")
+
+    node.destroy_node()
+    rclpy.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Cost of recording fleet status messages with TelemetryRecorder, and of reading them back
+and seeking through the sparse index.
+
+The GUI records on the ros executor threads, the budget is 1% of one thread at 5000 msgs/s
+(2 µs per message).
+
+Run with:  python3 -m testing_turtle_gui.benchmarks.bench_recorder
+"""
+import random
+import tempfile
+import time
+
+from testing_turtle_gui.fleet_schema import FleetSchema
+from testing_turtle_gui.telemetry_codec import DeltaEncoder, KIND_KEYFRAME, HEADER
+from testing_turtle_gui.telemetry_recorder import TelemetryRecorder, RecordingReader
+
+MESSAGES = 300_000
+RATE = 5000
+
+
+def main():
+    schema = FleetSchema({"vehicle_ids": list(range(1, 13))})
+    encoder = DeltaEncoder(schema)
+    rng = random.Random(0)
+    fleet_states = {vehicle_id: {key: 1 for key, _ in schema.status_fields} for vehicle_id in schema.vehicle_ids}
+    messages = []
+    for _ in range(2000):
+        vehicle_id = rng.choice(schema.vehicle_ids)
+        states = fleet_states[vehicle_id]
+        if rng.random() < 0.05:
+            states[rng.choice(list(states))] = rng.randint(0, 2)
+        payload = encoder.encode(vehicle_id, time.time_ns(), states, {"Status_messages": "running"})
+        kind = HEADER.unpack_from(payload)[1]
+        messages.append((f"coug{vehicle_id}/fleet_status", payload, vehicle_id if kind == KIND_KEYFRAME else None))
+
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = TelemetryRecorder(directory, segment_bytes=8 * 1024 * 1024)
+        #receive times as if the messages came in at RATE
+        start_ns = time.time_ns()
+        step_ns = 1_000_000_000 // RATE
+        start = time.perf_counter()
+        for i in range(MESSAGES):
+            topic, payload, keyframe_vehicle = messages[i % len(messages)]
+            recorder.record(topic, payload, start_ns + i * step_ns, keyframe_vehicle)
+        record_s = time.perf_counter() - start
+        recorder.close()
+        stats = recorder.stats()
+
+        start = time.perf_counter()
+        reader = RecordingReader(directory)
+        count = sum(1 for _ in reader.records())
+        read_s = time.perf_counter() - start
+
+        seek_times = []
+        for _ in range(100):
+            target_ns = start_ns + rng.randrange(MESSAGES) * step_ns
+            start = time.perf_counter()
+            entry = reader.seek_entry(target_ns)
+            for record in reader.records(entry.segment, entry.offset):
+                if record.recv_ns >= target_ns:
+                    break
+            seek_times.append(time.perf_counter() - start)
+
+    per_message_us = record_s / MESSAGES * 1e6
+    print(f"recorded {MESSAGES} messages, {stats['bytes'] / 1e6:.1f} MB in {stats['segments']} segments")
+    print(f"record: {per_message_us:.2f} µs/msg, {per_message_us * RATE / 1e4:.2f}% of a thread at {RATE} msgs/s")
+    print(f"read back: {count} records, {count / read_s:.0f} records/s")
+    print(f"seek: mean {sum(seek_times) / len(seek_times) * 1e3:.2f} ms, max {max(seek_times) * 1e3:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
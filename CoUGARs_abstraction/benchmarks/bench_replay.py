@@ -0,0 +1,85 @@
+"""
+Throughput of the whole update path: a recorded mission is replayed as fast as possible
+into a MainWindow (decode, ros bridge, feedback_dict, update scheduler, widgets, console).
+
+Without a recording one is generated first (12 Cougs, mostly deltas, some console lines).
+
+Run with:  QT_QPA_PLATFORM=offscreen python3 -m testing_turtle_gui.benchmarks.bench_replay [recording dir]
+"""
+import random
+import sys
+import tempfile
+import time
+
+from PyQt6.QtCore import QEventLoop
+from PyQt6.QtWidgets import QApplication
+
+from testing_turtle_gui.fleet_schema import FleetSchema
+from testing_turtle_gui.tabbed_window import MainWindow
+from testing_turtle_gui.telemetry_codec import DeltaEncoder, KIND_KEYFRAME, HEADER
+from testing_turtle_gui.telemetry_recorder import TelemetryRecorder, RecordingReader
+from testing_turtle_gui.telemetry_replay import ReplaySource
+
+MESSAGES = 100_000
+RATE = 5000
+
+
+def make_recording(directory, schema):
+    encoder = DeltaEncoder(schema)
+    recorder = TelemetryRecorder(directory)
+    rng = random.Random(0)
+    fleet_states = {vehicle_id: {key: 1 for key, _ in schema.status_fields} for vehicle_id in schema.vehicle_ids}
+    start_ns = time.time_ns()
+    for i in range(MESSAGES):
+        vehicle_id = rng.choice(schema.vehicle_ids)
+        states = fleet_states[vehicle_id]
+        if rng.random() < 0.05:
+            states[rng.choice(list(states))] = rng.randint(0, 2)
+        console = [("INFO", f"depth {rng.uniform(0, 30):.1f} m")] if rng.random() < 0.1 else None
+        payload = encoder.encode(vehicle_id, start_ns, states, {"Status_messages": "running"}, console)
+        kind = HEADER.unpack_from(payload)[1]
+        recorder.record(f"coug{vehicle_id}/fleet_status", payload, start_ns + i * (1_000_000_000 // RATE),
+                        vehicle_id if kind == KIND_KEYFRAME else None)
+    recorder.close()
+
+
+def main():
+    schema = FleetSchema({"vehicle_ids": list(range(1, 13))})
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as directory:
+        if len(sys.argv) > 1:
+            directory = sys.argv[1]
+        else:
+            make_recording(directory, schema)
+        reader = RecordingReader(directory)
+
+        window = MainWindow(None, schema)
+        window.show()
+        source = ReplaySource(reader, window, speed=0.0)
+        source.finished.connect(app.quit)
+        source.start()
+        app.exec()
+
+        elapsed = source.elapsed_s()
+        print(f"replayed {source.delivered_count} messages in {elapsed:.2f} s: {source.delivered_count / elapsed:.0f} msgs/s")
+        print("bridge:", {"received": window.ros_bridge.received_count, "delivered": window.ros_bridge.delivered_count})
+        print("update scheduler:", window.update_scheduler.stats())
+
+        duration_ns = reader.time_index[-1].recv_ns - source.start_ns
+        seek_s = []
+        #paused, so the replay stops right after each seek. A seek is timed from the call
+        #until the rebuilt keyframes are applied to the window (seeked comes in after them)
+        source.pause()
+        wait = QEventLoop()
+        source.seeked.connect(wait.quit)
+        for fraction in (0.75, 0.25, 0.5):
+            start = time.perf_counter()
+            source.seek(source.start_ns + int(duration_ns * fraction))
+            wait.exec()
+            seek_s.append(time.perf_counter() - start)
+        print(f"seek (rebuild state at a point, to the window): mean {sum(seek_s) / len(seek_s) * 1e3:.1f} ms")
+        source.stop()
+
+
+if __name__ == '__main__':
+    main()
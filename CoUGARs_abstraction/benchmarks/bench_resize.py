@@ -0,0 +1,67 @@
+"""
+Compares the cost of resizing the tabs with the old per-resize style sheet against
+FleetTabBar, for tab pages holding more and more child widgets.
+
+Run with:  QT_QPA_PLATFORM=offscreen python3 -m testing_turtle_gui.benchmarks.bench_resize
+"""
+import sys
+import time
+
+from PyQt6.QtWidgets import QApplication, QTabWidget, QWidget, QVBoxLayout, QLabel
+
+from testing_turtle_gui.fleet_tab_bar import FleetTabBar, TAB_STYLE_SHEET
+
+RESIZES = 40
+CHILD_COUNTS = [50, 200, 800, 3200]
+
+
+#the style sheet MainWindow.resizeTabs used to set on every resize event
+def legacy_style_sheet(width_px):
+    return TAB_STYLE_SHEET.replace("height: 30px;", f"height: 30px;\n    width: {width_px - 15}px;")
+
+
+def make_tabs(child_count, tab_bar=None):
+    tabs = QTabWidget()
+    if tab_bar:
+        tabs.setTabBar(tab_bar)
+    for tab in range(4):
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        for i in range(child_count // 4):
+            layout.addWidget(QLabel(f"label {i}"))
+        tabs.addTab(page, f"Tab {tab}")
+    tabs.resize(1200, 900)
+    tabs.show()
+    return tabs
+
+
+def time_resizes(app, tabs, resize_tabs):
+    app.processEvents()
+    start = time.perf_counter()
+    for i in range(RESIZES):
+        width = 1200 + (i % 2) * 40
+        tabs.resize(width, 900)
+        resize_tabs(width // 4)
+        app.processEvents()
+    return (time.perf_counter() - start) / RESIZES * 1000
+
+
+def main():
+    app = QApplication(sys.argv)
+    print(f"{'children':>10} {'style sheet (ms)':>18} {'FleetTabBar (ms)':>18}")
+    for child_count in CHILD_COUNTS:
+        tabs = make_tabs(child_count)
+        legacy_ms = time_resizes(app, tabs, lambda width_px: tabs.setStyleSheet(legacy_style_sheet(width_px)))
+        tabs.close()
+
+        tab_bar = FleetTabBar()
+        tabs = make_tabs(child_count, tab_bar)
+        tabs.setStyleSheet(TAB_STYLE_SHEET)
+        tab_bar_ms = time_resizes(app, tabs, lambda width_px: tab_bar.set_tab_width(width_px - 15))
+        tabs.close()
+
+        print(f"{child_count:>10} {legacy_ms:>18.2f} {tab_bar_ms:>18.2f}")
+
+
+if __name__ == '__main__':
+    main()
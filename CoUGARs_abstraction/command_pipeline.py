@@ -0,0 +1,241 @@
+import json
+import time
+import uuid
+from itertools import count
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from testing_turtle_gui.latency_stats import LatencyHistogram
+
+#Commands and acknowledgements are json in std_msgs/String messages. Commands go out on the
+#vehicle's coug{n}/cmd topic and the vehicles answer on 'topic'.
+#  command  {"id": "3f9c2a1b-17", "origin": "3f9c2a1b", "vehicle": 1, "command": "start_mission",
+#            "text": "Starting the missions...", "attempt": 1}
+#  ack      {"ack": "3f9c2a1b-17", "vehicle": 1, "attempt": 1, "accepted": true, "detail": "mission started"}
+#The origin is a random id picked every time a GUI starts, so ids never repeat across GUIs
+#or restarts, and an ack only matches the command it was sent for.
+#A vehicle acks every attempt it receives and echoes the attempt number, so the round trip
+#of a retried command is measured from the attempt that got through. Resent attempts of
+#a command the vehicle already carried out should just be acked again.
+
+PENDING = "pending"
+ACKED = "acked"
+REJECTED = "rejected"
+TIMED_OUT = "timed out"
+
+
+class Command:
+    """
+    One command sent to one vehicle, and where it is in its life: pending until the
+    vehicle acks or rejects it, or until it runs out of retries.
+    """
+
+    __slots__ = ("id", "origin", "vehicle_id", "name", "text", "batch", "state", "attempt", "attempt_ns",
+                 "first_sent_ns", "deadline_ns", "round_trip_ns", "detail")
+
+    def __init__(self, command_id, vehicle_id, name, text, batch=None, origin=""):
+        self.id = command_id
+        #the session of the GUI that sent the command, also the prefix of its id
+        self.origin = origin
+        self.vehicle_id = vehicle_id
+        self.name = name
+        self.text = text
+        #commands sent together by one button share a batch
+        self.batch = batch
+        self.state = PENDING
+        self.attempt = 0
+        #attempt number -> when it was sent
+        self.attempt_ns = {}
+        self.first_sent_ns = None
+        self.deadline_ns = None
+        self.round_trip_ns = None
+        self.detail = ""
+
+    def encode(self):
+        return json.dumps({"id": self.id, "origin": self.origin, "vehicle": self.vehicle_id, "command": self.name,
+                           "text": self.text, "attempt": self.attempt})
+
+    def describe(self):
+        if self.state == PENDING:
+            return f"Coug {self.vehicle_id} pending" + (f" (try {self.attempt})" if self.attempt > 1 else "")
+        text = f"Coug {self.vehicle_id} {self.state}"
+        if self.round_trip_ns is not None:
+            text += f" in {self.round_trip_ns / 1e6:.0f} ms"
+        if self.detail:
+            text += f" ({self.detail})"
+        return text
+
+
+#returns the ack dict, or None when text is not an ack (e.g. a plain text message or our own command)
+def parse_ack(text):
+    if not text.startswith("{"):
+        return None
+    try:
+        message = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(message, dict) or "ack" not in message:
+        return None
+    return message
+
+
+#True for commands published by a GUI, they come back to us when we subscribe to the same topic
+def is_command(text):
+    return text.startswith('{"id":')
+
+
+class CommandTracker(QObject):
+    """
+    Tags commands with an id and target vehicle, sends them, and tracks them until they
+    are acknowledged. A command that is not acked within timeout_ms is resent, up to
+    max_retries times, then marked timed out.
+
+    Round trip times are kept in histograms per vehicle and per command name, so the
+    performance of each vehicle's link can be compared. Lives on the GUI thread.
+    """
+
+    #emitted with the Command every time its state changes (or it is resent)
+    command_changed = pyqtSignal(object)
+
+    def __init__(self, send, timeout_ms=2000, max_retries=2, parent=None):
+        """
+        Parameters:
+            send (function): publishes commands, called as send([command, ...]) with every
+                command of a batch (or every command due for a retry) at once
+            timeout_ms (int): how long to wait for an ack before resending
+            max_retries (int): how many times a command is resent before giving up
+            parent (QObject): optional Qt parent
+        """
+        super().__init__(parent)
+        self.send = send
+        self.timeout_ms = timeout_ms
+        self.max_retries = max_retries
+        #command ids are "<session>-<n>", unique across GUIs and restarts
+        self.session = uuid.uuid4().hex[:8]
+        self._ids = count(1)
+        self._batches = count(1)
+        #command id -> Command, only commands still waiting for an ack
+        self.pending = {}
+        #last finished commands, newest last
+        self.history = []
+        self.history_size = 200
+
+        self.latency_by_vehicle = {}
+        self.latency_by_command = {}
+        self.sent_count = 0
+        self.retry_count = 0
+        self.acked_count = 0
+        self.rejected_count = 0
+        self.timed_out_count = 0
+        self.unmatched_ack_count = 0
+
+        #only runs while commands are pending
+        self._timeout_timer = QTimer(self)
+        self._timeout_timer.setSingleShot(True)
+        self._timeout_timer.timeout.connect(self._check_timeouts)
+
+    def submit(self, vehicle_ids, name, text):
+        """
+        Sends one command to each of the vehicles, all in the same batch.
+
+        Parameters:
+            vehicle_ids (list): the vehicles to send to
+            name (str): what the vehicle should do, e.g. "start_mission"
+            text (str): human readable description, shown in the GUI and the vehicle's log
+
+        Returns the list of Commands.
+        """
+        batch = next(self._batches)
+        commands = [Command(f"{self.session}-{next(self._ids)}", vehicle_id, name, text, batch, self.session)
+                    for vehicle_id in vehicle_ids]
+        for command in commands:
+            self.pending[command.id] = command
+        self._send_attempts(commands)
+        self._schedule_timeout()
+        return commands
+
+    def handle_ack(self, ack):
+        """
+        Parameters:
+            ack (dict): a parsed ack message, see parse_ack
+        """
+        now_ns = time.perf_counter_ns()
+        command = self.pending.get(ack.get("ack"))
+        if command is None or ack.get("vehicle") != command.vehicle_id:
+            #late ack for a command that timed out, a command from another GUI, or from the wrong vehicle
+            self.unmatched_ack_count += 1
+            return None
+        del self.pending[command.id]
+        sent_ns = command.attempt_ns.get(ack.get("attempt"), command.attempt_ns[command.attempt])
+        command.round_trip_ns = now_ns - sent_ns
+        self.latency_by_vehicle.setdefault(command.vehicle_id, LatencyHistogram()).record(command.round_trip_ns)
+        self.latency_by_command.setdefault(command.name, LatencyHistogram()).record(command.round_trip_ns)
+        command.detail = str(ack.get("detail", ""))
+        if ack.get("accepted", True):
+            command.state = ACKED
+            self.acked_count += 1
+        else:
+            command.state = REJECTED
+            self.rejected_count += 1
+        self._finish(command)
+        return command
+
+    def _send_attempts(self, commands):
+        now_ns = time.perf_counter_ns()
+        for command in commands:
+            command.attempt += 1
+            command.attempt_ns[command.attempt] = now_ns
+            if command.first_sent_ns is None:
+                command.first_sent_ns = now_ns
+            command.deadline_ns = now_ns + self.timeout_ms * 1_000_000
+        self.sent_count += len(commands)
+        self.send(commands)
+        for command in commands:
+            self.command_changed.emit(command)
+
+    def _check_timeouts(self):
+        now_ns = time.perf_counter_ns()
+        retries = []
+        for command in list(self.pending.values()):
+            if command.deadline_ns > now_ns:
+                continue
+            if command.attempt <= self.max_retries:
+                retries.append(command)
+            else:
+                del self.pending[command.id]
+                command.state = TIMED_OUT
+                self.timed_out_count += 1
+                self._finish(command)
+        if retries:
+            self.retry_count += len(retries)
+            self._send_attempts(retries)
+        self._schedule_timeout()
+
+    #wakes up when the next pending command runs out of time
+    def _schedule_timeout(self):
+        if not self.pending:
+            self._timeout_timer.stop()
+            return
+        next_deadline_ns = min(command.deadline_ns for command in self.pending.values())
+        self._timeout_timer.start(max(0, -(-(next_deadline_ns - time.perf_counter_ns()) // 1_000_000)))
+
+    def _finish(self, command):
+        self.history.append(command)
+        if len(self.history) > self.history_size:
+            del self.history[0]
+        if not self.pending:
+            self._timeout_timer.stop()
+        self.command_changed.emit(command)
+
+    def stats(self):
+        return {
+            "sent": self.sent_count,
+            "retries": self.retry_count,
+            "acked": self.acked_count,
+            "rejected": self.rejected_count,
+            "timed_out": self.timed_out_count,
+            "unmatched_acks": self.unmatched_ack_count,
+            "pending": len(self.pending),
+            "round_trip_by_vehicle": {vehicle_id: histogram.summary() for vehicle_id, histogram in self.latency_by_vehicle.items()},
+            "round_trip_by_command": {name: histogram.summary() for name, histogram in self.latency_by_command.items()},
+        }
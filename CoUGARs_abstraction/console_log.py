@@ -0,0 +1,246 @@
+import time
+from collections import namedtuple
+from itertools import count
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer
+from PyQt6.QtGui import QBrush, QColor
+from PyQt6.QtWidgets import QListView, QAbstractItemView
+
+#one console line. seq is unique across the whole fleet and only ever increases
+ConsoleEntry = namedtuple("ConsoleEntry", ["seq", "vehicle", "severity", "text", "stamp"])
+
+SEVERITIES = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
+#color of each severity in the console, the brushes are only built once
+SEVERITY_COLORS = {
+    "DEBUG": "gray",
+    "INFO": "black",
+    "WARNING": "darkorange",
+    "ERROR": "red",
+}
+
+_sequence = count()
+
+
+#pulls the severity out of lines like "ERROR: Manipulator arm failed to extend"
+def severity_of(text):
+    head = text.lstrip("- [").upper()
+    for severity in SEVERITIES:
+        if head.startswith(severity):
+            return severity
+    return "INFO"
+
+
+def make_entry(vehicle, text, severity=None, stamp=None):
+    return ConsoleEntry(next(_sequence), vehicle, severity or severity_of(text), text, stamp if stamp is not None else time.time())
+
+
+class RingBuffer:
+    """
+    Fixed capacity buffer, the oldest item is dropped when a new one is appended to a
+    full buffer. Appending and indexing are O(1).
+    """
+
+    def __init__(self, capacity, on_evict=None):
+        """
+        Parameters:
+            capacity (int): how many items are kept
+            on_evict (function): optional, called with every item that gets dropped
+        """
+        self.capacity = capacity
+        self.on_evict = on_evict
+        self._items = [None] * capacity
+        self._start = 0
+        self._size = 0
+
+    #returns the item that was dropped to make room, or None
+    def append(self, item):
+        evicted = None
+        if self._size < self.capacity:
+            self._items[(self._start + self._size) % self.capacity] = item
+            self._size += 1
+        else:
+            evicted = self._items[self._start]
+            self._items[self._start] = item
+            self._start = (self._start + 1) % self.capacity
+            if self.on_evict:
+                self.on_evict(evicted)
+        return evicted
+
+    #drops and returns the oldest item
+    def pop_oldest(self):
+        if not self._size:
+            raise IndexError("pop from an empty ring buffer")
+        evicted = self._items[self._start]
+        self._items[self._start] = None
+        self._start = (self._start + 1) % self.capacity
+        self._size -= 1
+        if self.on_evict:
+            self.on_evict(evicted)
+        return evicted
+
+    def is_full(self):
+        return self._size == self.capacity
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("ring buffer index out of range")
+        return self._items[(self._start + index) % self.capacity]
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self._items[(self._start + i) % self.capacity]
+
+    def clear(self):
+        if self.on_evict:
+            for item in self:
+                self.on_evict(item)
+        self._items = [None] * self.capacity
+        self._start = 0
+        self._size = 0
+
+
+class ConsoleLogModel(QAbstractListModel):
+    """
+    List model over one vehicle's console ring buffer. Rows are only read when the view
+    paints them, so the cost of an append does not depend on how much history is kept.
+    """
+
+    _brushes = {}
+
+    def __init__(self, buffer, parent=None):
+        """
+        Parameters:
+            buffer (RingBuffer): the vehicle's console entries, owned by feedback_dict (any list of entries works for a read only model)
+            parent (QObject): optional Qt parent
+        """
+        super().__init__(parent)
+        self.buffer = buffer
+
+    #replaces every row, for a model showing search results
+    def set_entries(self, buffer):
+        self.beginResetModel()
+        self.buffer = buffer
+        self.endResetModel()
+
+    #drops every line, the buffer tells its on_evict about each of them
+    def clear(self):
+        self.beginResetModel()
+        self.buffer.clear()
+        self.endResetModel()
+
+    def append(self, entry):
+        if self.buffer.is_full():
+            self.beginRemoveRows(QModelIndex(), 0, 0)
+            self.buffer.pop_oldest()
+            self.endRemoveRows()
+        row = len(self.buffer)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.buffer.append(entry)
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.buffer)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.ToolTipRole:
+            return self.buffer[index.row()].text
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self.brush(self.buffer[index.row()].severity)
+        return None
+
+    @classmethod
+    def brush(cls, severity):
+        brush = cls._brushes.get(severity)
+        if brush is None:
+            brush = QBrush(QColor(SEVERITY_COLORS.get(severity, "black")))
+            cls._brushes[severity] = brush
+        return brush
+
+
+class ConsoleLogView(QListView):
+    """
+    Shows a ConsoleLogModel. Every row has the same height so Qt only lays out and paints
+    the visible rows. It keeps following new lines while scrolled to the bottom, and
+    stays put when the user has scrolled up to read the history.
+    """
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setTextElideMode(Qt.TextElideMode.ElideRight)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self._follow = True
+        #scrolling to the bottom forces the item layout, so it is done once per event loop pass rather than per line
+        self._follow_timer = QTimer(self)
+        self._follow_timer.setSingleShot(True)
+        self._follow_timer.timeout.connect(self.scrollToBottom)
+        self.live_model = model
+        #one model for search results, its rows are replaced by every new search
+        self.results_model = ConsoleLogModel(RingBuffer(model.buffer.capacity), parent=self)
+        #entry -> bool of the search being shown, new live lines that pass it are added to the results
+        self._matches = None
+        self.setModel(model)
+        for watched in (model, self.results_model):
+            watched.rowsAboutToBeInserted.connect(self._check_follow)
+            watched.rowsInserted.connect(self._follow_new_rows)
+        model.rowsInserted.connect(self._add_matching_rows)
+        model.modelReset.connect(self._clear_results)
+
+    def show_entries(self, entries, matches=None):
+        """
+        Shows search results instead of the live log.
+
+        Parameters:
+            entries (list): the results, oldest first, None goes back to the live log
+            matches (function): optional matches(entry) -> bool, lines arriving later that
+                pass it are added to the results
+        """
+        if entries is None:
+            self._matches = None
+            self.setModel(self.live_model)
+            self.scrollToBottom()
+            return
+        results = RingBuffer(self.live_model.buffer.capacity)
+        for entry in entries[-results.capacity:]:
+            results.append(entry)
+        self._matches = matches
+        self.results_model.set_entries(results)
+        if self.model() is not self.results_model:
+            self.setModel(self.results_model)
+
+    def _add_matching_rows(self, parent, first, last):
+        if self._matches is None or self.model() is not self.results_model:
+            return
+        for row in range(first, last + 1):
+            entry = self.live_model.buffer[row]
+            if self._matches(entry):
+                self.results_model.append(entry)
+
+    #the live log was emptied, the search keeps going on the lines that come in from now on
+    def _clear_results(self):
+        if self._matches is not None:
+            self.results_model.set_entries(RingBuffer(self.live_model.buffer.capacity))
+
+    def _check_follow(self, *args):
+        if self._follow_timer.isActive() or self.sender() is not self.model():
+            return
+        scroll_bar = self.verticalScrollBar()
+        self._follow = scroll_bar.value() >= scroll_bar.maximum()
+
+    def _follow_new_rows(self, *args):
+        if self.sender() is not self.model():
+            return
+        if self._follow and not self._follow_timer.isActive():
+            self._follow_timer.start(0)
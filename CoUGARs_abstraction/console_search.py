@@ -0,0 +1,173 @@
+import heapq
+import itertools
+import re
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+class ConsoleSearchIndex:
+    """
+    Token index over every console line kept in the vehicles' ring buffers.
+
+    Lines are added as they arrive and removed when their ring buffer drops them, so the
+    index always matches what is retained. Each token maps to the lines containing it,
+    in arrival order, and an index of the one, two and three character pieces of every
+    token finds the tokens containing a typed substring. Searches walk the smallest
+    matching posting list from the newest line backwards and stop once they have enough
+    results, so filter-as-you-type stays fast however many lines are retained. A term
+    contained in more than MAX_MERGED_TOKENS tokens (a single digit, say) is usually in
+    so many lines that walking the newest lines finds them faster than merging that
+    many postings, that is checked on a sample of the postings.
+    """
+
+    MAX_MERGED_TOKENS = 64
+
+    def __init__(self):
+        #seq -> ConsoleEntry
+        self._entries = {}
+        #token -> {seq: None}, dicts keep insertion (= seq) order and delete in O(1)
+        self._postings = {}
+        #piece of one to three characters -> set of tokens containing it
+        self._grams = {}
+        self._by_severity = {}
+        self._by_vehicle = {}
+
+    def add(self, entry):
+        self._entries[entry.seq] = entry
+        for token in set(TOKEN_RE.findall(entry.text.lower())):
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+                for gram in self._grams_of(token):
+                    self._grams.setdefault(gram, set()).add(token)
+            posting[entry.seq] = None
+        self._by_severity.setdefault(entry.severity, {})[entry.seq] = None
+        self._by_vehicle.setdefault(entry.vehicle, {})[entry.seq] = None
+
+    #called by the ring buffers when they drop a line
+    def remove(self, entry):
+        if self._entries.pop(entry.seq, None) is None:
+            return
+        for token in set(TOKEN_RE.findall(entry.text.lower())):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.pop(entry.seq, None)
+            if not posting:
+                del self._postings[token]
+                for gram in self._grams_of(token):
+                    tokens = self._grams.get(gram)
+                    if tokens:
+                        tokens.discard(token)
+                        if not tokens:
+                            del self._grams[gram]
+        self._by_severity.get(entry.severity, {}).pop(entry.seq, None)
+        self._by_vehicle.get(entry.vehicle, {}).pop(entry.seq, None)
+
+    def search(self, text="", severity=None, vehicle=None, limit=500):
+        """
+        Finds retained console lines, newest first.
+
+        Parameters:
+            text (str): every whitespace separated term must appear in the line (case insensitive substring)
+            severity (str): optional, only lines of this severity
+            vehicle (int): optional, only lines from this vehicle
+            limit (int): stop after this many results
+        """
+        terms = text.lower().split()
+
+        #every filter narrows the result to a set of candidate postings, walk the smallest one.
+        #A term can hold punctuation ("error:", "r-pi", "14.6") the tokens don't, so its word
+        #parts only pick the candidates, and the whole term is then checked against the line
+        candidates = []
+        for term in terms:
+            for part in set(TOKEN_RE.findall(term)):
+                tokens = self._tokens_containing(part)
+                if not tokens:
+                    return []
+                if len(tokens) > self.MAX_MERGED_TOKENS and self._common(tokens, limit):
+                    #matches() checks it on the lines of another candidate, or on the newest lines
+                    continue
+                postings = [self._postings[token] for token in tokens]
+                candidates.append((sum(len(posting) for posting in postings), postings))
+        if severity is not None:
+            posting = self._by_severity.get(severity, {})
+            candidates.append((len(posting), [posting]))
+        if vehicle is not None:
+            posting = self._by_vehicle.get(vehicle, {})
+            candidates.append((len(posting), [posting]))
+        if not candidates:
+            candidates.append((len(self._entries), [self._entries]))
+
+        _, driver_postings = min(candidates, key=lambda candidate: candidate[0])
+
+        results = []
+        previous_seq = None
+        for seq in self._newest_first(driver_postings):
+            #a line containing two matching tokens comes out of the merge twice, next to each other
+            if seq == previous_seq:
+                continue
+            previous_seq = seq
+            entry = self._entries[seq]
+            if not self.matches(entry, terms, severity, vehicle):
+                continue
+            results.append(entry)
+            if len(results) >= limit:
+                break
+        return results
+
+    @staticmethod
+    def matches(entry, terms, severity=None, vehicle=None):
+        """
+        Whether a line passes the filters of a search, e.g. for lines that arrive after it.
+
+        Parameters:
+            entry (ConsoleEntry): the line
+            terms (list): lower case terms, like search's text.lower().split()
+            severity (str): optional, the line must have this severity
+            vehicle (int): optional, the line must be from this vehicle
+        """
+        if severity is not None and entry.severity != severity:
+            return False
+        if vehicle is not None and entry.vehicle != vehicle:
+            return False
+        if terms:
+            lowered = entry.text.lower()
+            return all(term in lowered for term in terms)
+        return True
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _tokens_containing(self, term):
+        #a term of up to three characters is a piece itself
+        if len(term) <= 3:
+            return self._grams.get(term, ())
+        gram_sets = [self._grams.get(gram) for gram in self._trigrams_of(term)]
+        if not all(gram_sets):
+            return []
+        gram_sets.sort(key=len)
+        tokens = set.intersection(*gram_sets)
+        return [token for token in tokens if term in token]
+
+    #whether walking the newest lines reaches limit matches before merging the tokens' postings would
+    def _common(self, tokens, limit):
+        sample = list(itertools.islice(tokens, self.MAX_MERGED_TOKENS))
+        lines = sum(len(self._postings[token]) for token in sample) * len(tokens) / len(sample)
+        return limit * len(self._entries) / lines < len(tokens)
+
+    @staticmethod
+    def _trigrams_of(token):
+        return {token[i:i + 3] for i in range(len(token) - 2)}
+
+    #every piece of one, two and three characters
+    @staticmethod
+    def _grams_of(token):
+        return {token[i:i + size] for size in (1, 2, 3) for i in range(len(token) - size + 1)}
+
+    #merges posting lists (each in seq order) into one newest first stream of seqs
+    @staticmethod
+    def _newest_first(postings):
+        if len(postings) == 1:
+            return reversed(postings[0])
+        return heapq.merge(*(reversed(posting) for posting in postings), reverse=True)
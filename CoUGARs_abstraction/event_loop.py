@@ -0,0 +1,69 @@
+import signal
+import socket
+
+from PyQt6.QtCore import QObject, QSocketNotifier, QTimer
+
+EVENT_LOOP_MODES = ["notifier", "timer"]
+
+
+class SignalWakeup(QObject):
+    """
+    Runs Python signal handlers (e.g. Ctrl+C) as soon as the signal arrives while the Qt
+    event loop is idle.
+
+    Python only runs signal handlers when the interpreter gets control, which never
+    happens while Qt sits in its C++ event loop. Instead of waking the loop with a
+    polling timer, the C level handler writes the signal number to a socket
+    (signal.set_wakeup_fd) and a QSocketNotifier watching that socket wakes the loop.
+    Nothing runs while no signal arrives.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._read_socket, self._write_socket = socket.socketpair()
+        self._read_socket.setblocking(False)
+        self._write_socket.setblocking(False)
+        self._previous_fd = signal.set_wakeup_fd(self._write_socket.fileno())
+        self.notifier = QSocketNotifier(self._read_socket.fileno(), QSocketNotifier.Type.Read, self)
+        self.notifier.activated.connect(self._drain)
+
+    #the Python handlers have already been queued by the time we get here, reading just empties the socket
+    def _drain(self, *args):
+        try:
+            while self._read_socket.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def close(self):
+        self.notifier.setEnabled(False)
+        signal.set_wakeup_fd(self._previous_fd)
+        self._read_socket.close()
+        self._write_socket.close()
+
+
+def install_quit_on_signals(app, mode="notifier", signals=(signal.SIGINT, signal.SIGTERM)):
+    """
+    Makes Ctrl+C (and SIGTERM) quit the Qt application cleanly, so the ros nodes are
+    destroyed on the way out.
+
+    Parameters:
+        app (QApplication): the application to quit
+        mode (str): "notifier" wakes the event loop only when a signal arrives, "timer" is
+            the old 100 ms no-op timer (signals are handled up to 100 ms late and the
+            loop wakes 10 times a second when idle)
+        signals (tuple): the signals that quit the application
+
+    Returns the SignalWakeup or QTimer, which has to be kept alive.
+    """
+    for signal_number in signals:
+        signal.signal(signal_number, lambda *args: app.quit())
+
+    if mode == "notifier":
+        return SignalWakeup(app)
+    if mode == "timer":
+        timer = QTimer(app)
+        timer.timeout.connect(lambda: None)
+        timer.start(100)
+        return timer
+    raise ValueError(f"event loop mode must be one of {EVENT_LOOP_MODES}, not {mode!r}")
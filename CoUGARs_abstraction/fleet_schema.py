@@ -0,0 +1,96 @@
+import json
+
+from testing_turtle_gui.console_log import RingBuffer
+
+
+#The fleet the GUI starts with when no fleet config file is given.
+#Each status field is [feedback_dict key, label shown in the GUI]
+DEFAULT_FLEET = {
+    "vehicle_ids": [1, 2, 3],
+
+    #0->negative, 1->positive, 2->waiting
+    "connections": [
+        ["Wifi_connections", "Wifi"],
+        ["Radio_connections", "Radio"],
+        ["Modem_connections", "Modem"],
+    ],
+    "sensors": [
+        ["Modem_sensors", "Modem"],
+        ["DVL_sensors", "DVL"],
+        ["GPS_sensors", "GPS"],
+        ["IMU_sensors", "IMU"],
+        ["Leak_sensors", "Leak Detector"],
+        ["Battery_sensors", "Battery"],
+    ],
+    "nodes": [
+        ["Safety_Monitoring_nodes", "Safety Monitoring"],
+        ["Depth_Controller_nodes", "Depth Controller"],
+        ["Heading_Controller_nodes", "Heading Controller"],
+        ["Factor_Graph_nodes", "Factor Graph"],
+        ["Modem_Timing_nodes", "Modem Timing"],
+    ],
+
+    #the sensors that also get a row in the vehicle's column on the General page
+    "general_page_sensors": ["Modem_sensors", "DVL_sensors", "GPS_sensors", "IMU_sensors"],
+    #how many vehicle columns the General page shows at a time
+    "general_page_size": 3,
+    #how many console lines are kept per vehicle, older lines are dropped
+    "console_capacity": 5000,
+}
+
+#feedback_dict keys that hold text, and the one that holds the console log
+TEXT_FIELDS = ["Status_messages", "Last_messages", "Missions", "Modems"]
+CONSOLE_FIELD = "Console_messages"
+
+
+class FleetSchema:
+    """
+    Describes the fleet: which vehicles there are and which connections, sensors and
+    nodes each of them reports. The GUI's state store (feedback_dict), the General page
+    columns and the per-vehicle pages are all generated from it.
+    """
+
+    def __init__(self, config=None):
+        """
+        Parameters:
+            config (dict): fleet description in the same shape as DEFAULT_FLEET, missing
+                keys fall back to DEFAULT_FLEET
+        """
+        config = {**DEFAULT_FLEET, **(config or {})}
+        self.vehicle_ids = [int(vehicle_id) for vehicle_id in config["vehicle_ids"]]
+        self.connections = [tuple(field) for field in config["connections"]]
+        self.sensors = [tuple(field) for field in config["sensors"]]
+        self.nodes = [tuple(field) for field in config["nodes"]]
+        self.general_page_sensors = [field for field in self.sensors if field[0] in config["general_page_sensors"]]
+        self.general_page_size = int(config["general_page_size"])
+        self.console_capacity = int(config["console_capacity"])
+        for key in ("general_page_size", "console_capacity"):
+            if getattr(self, key) < 1:
+                raise ValueError(f"{key} must be at least 1, not {getattr(self, key)}")
+
+        #every field shown with a status icon, in schema order
+        self.status_fields = self.connections + self.sensors + self.nodes
+        self.labels = dict(self.status_fields)
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path) as config_file:
+            return cls(json.load(config_file))
+
+    #same thing as the old hand written feedback_dict, for every vehicle in the fleet
+    def make_feedback_dict(self):
+        feedback_dict = {}
+        for key, _ in self.status_fields:
+            feedback_dict[key] = {vehicle_id: 0 for vehicle_id in self.vehicle_ids}
+        for key in TEXT_FIELDS:
+            feedback_dict[key] = {vehicle_id: "" for vehicle_id in self.vehicle_ids}
+        feedback_dict[CONSOLE_FIELD] = {vehicle_id: RingBuffer(self.console_capacity) for vehicle_id in self.vehicle_ids}
+        return feedback_dict
+
+    #the vehicle ids shown on one page of the General tab
+    def general_page_vehicles(self, page):
+        start = page * self.general_page_size
+        return self.vehicle_ids[start:start + self.general_page_size]
+
+    def general_page_count(self):
+        return max(1, -(-len(self.vehicle_ids) // self.general_page_size))
@@ -0,0 +1,228 @@
+import heapq
+import json
+import random
+import time
+from collections import OrderedDict
+
+import rclpy
+from rclpy.node import Node
+from std_msgs.msg import String, UInt8MultiArray, UInt16
+
+from testing_turtle_gui.fleet_schema import FleetSchema
+from testing_turtle_gui.qos_profiles import QosConfig
+from testing_turtle_gui.simulated_coug import SimulatedCoug, parse_fault
+from testing_turtle_gui.telemetry_codec import MAX_CONSOLE_LINES, DeltaEncoder
+
+#Stands in for the Cougs when testing the GUI without vehicles. Every simulated Coug
+#publishes delta encoded FleetStatus on coug{n}/fleet_status (or all on fleet_status),
+#answers commands from coug{n}/cmd with acks on 'topic', and sends a keyframe when the GUI
+#asks on 'fleet_keyframe_request'. Run it next to the GUI:
+#  python3 -m testing_turtle_gui.fleet_simulator --ros-args -p fleet_config:=fleet.json \
+#      -p rate_multiplier:=100.0 -p ack_loss:=0.1 -p "faults:=['leak:2:30', 'link_loss:1:10:20']"
+#Faults can also be injected while running:
+#  ros2 topic pub --once fleet_sim/fault std_msgs/String "data: 'node_crash:3'"
+#One python process publishes a few ten thousand messages per second at most, the status
+#log says when the offered rate is not reached. For higher rates run several simulators,
+#each with its own fleet_config.
+
+
+class FleetSimulator(Node):
+    MAX_HANDLED_COMMANDS = 256
+
+    def __init__(self):
+        super().__init__('fleet_simulator')
+        #the same fleet json as the GUI (see fleet_schema.DEFAULT_FLEET), defaults to Cougs 1-3
+        fleet_config = self.declare_parameter('fleet_config', '').value
+        self.fleet_schema = FleetSchema.from_json(fleet_config) if fleet_config else FleetSchema()
+        qos_config = self.declare_parameter('qos_config', '').value
+        self.qos_config = QosConfig.from_json(qos_config) if qos_config else QosConfig()
+        #status messages and console lines per second per Coug at field rates
+        self.status_rate = self.declare_parameter('status_rate', 2.0).value
+        self.console_rate = self.declare_parameter('console_rate', 0.5).value
+        #10.0, 100.0 or 1000.0 load tests the GUI at that many times the field rates
+        self.rate_multiplier = self.declare_parameter('rate_multiplier', 1.0).value
+        #"vehicle" publishes on coug{n}/fleet_status, "shared" everything on fleet_status
+        topic_mode = self.declare_parameter('topic_mode', 'vehicle').value
+        keyframe_interval = self.declare_parameter('keyframe_interval', 20).value
+        #acks wait ack_delay_ms plus up to ack_jitter_ms, and ack_loss of them are never sent
+        self.ack_delay_ms = self.declare_parameter('ack_delay_ms', 50.0).value
+        self.ack_jitter_ms = self.declare_parameter('ack_jitter_ms', 20.0).value
+        self.ack_loss = self.declare_parameter('ack_loss', 0.0).value
+        #faults to inject, "kind:vehicle:at_s[:duration_s]" with vehicle 0 for every Coug, see simulated_coug.parse_fault
+        faults = self.declare_parameter('faults', ['']).value
+        seed = self.declare_parameter('seed', 0).value
+        tick_rate = self.declare_parameter('tick_rate', 200.0).value
+
+        if topic_mode not in ('vehicle', 'shared'):
+            raise ValueError(f"topic_mode must be 'vehicle' or 'shared', not {topic_mode!r}")
+        self.rng = random.Random(seed)
+        self.cougs = {vehicle_id: SimulatedCoug(vehicle_id, self.fleet_schema, seed + vehicle_id)
+                      for vehicle_id in self.fleet_schema.vehicle_ids}
+        self.encoder = DeltaEncoder(self.fleet_schema, keyframe_interval)
+
+        self.status_publishers = {}
+        for vehicle_id in self.fleet_schema.vehicle_ids:
+            topic = f'coug{vehicle_id}/fleet_status' if topic_mode == 'vehicle' else 'fleet_status'
+            if topic_mode == 'shared' and self.status_publishers:
+                self.status_publishers[vehicle_id] = next(iter(self.status_publishers.values()))
+                continue
+            self.status_publishers[vehicle_id] = self.create_publisher(
+                UInt8MultiArray, topic, self.qos_config.profile(topic),
+                event_callbacks=self.qos_config.publisher_events(topic, self.on_qos_event))
+        self.ack_publisher = self.create_publisher(String, 'topic', self.qos_config.profile('topic'))
+
+        self.command_subscriptions = {}
+        for vehicle_id in self.fleet_schema.vehicle_ids:
+            topic = f'coug{vehicle_id}/cmd'
+            self.command_subscriptions[vehicle_id] = self.create_subscription(
+                String, topic, lambda msg, vehicle_id=vehicle_id: self.command_callback(msg, vehicle_id),
+                self.qos_config.profile(topic))
+        self.keyframe_request_subscription = self.create_subscription(
+            UInt16, 'fleet_keyframe_request', self.keyframe_request_callback,
+            self.qos_config.profile('fleet_keyframe_request'))
+        self.fault_subscription = self.create_subscription(String, 'fleet_sim/fault', self.fault_callback, 10)
+
+        #(kind, vehicle_id, at_s, duration_s), soonest last
+        self.scheduled_faults = sorted((parse_fault(fault) for fault in faults if fault),
+                                       key=lambda fault: fault[2], reverse=True)
+        #(due_ns, order, ack json), a heap
+        self.pending_acks = []
+        #vehicle_id -> {(origin, command id): (accepted, detail)}, so a resent attempt is acked without running
+        #the command again. Only the latest MAX_HANDLED_COMMANDS per vehicle are kept, retries come within seconds
+        self.handled_commands = {vehicle_id: OrderedDict() for vehicle_id in self.fleet_schema.vehicle_ids}
+        #vehicle_id -> status messages owed, fractions carry over to the next tick
+        self.due = {vehicle_id: self.rng.random() for vehicle_id in self.fleet_schema.vehicle_ids}
+        self.counts = {"published": 0, "suppressed": 0, "bytes": 0, "commands": 0, "acks": 0, "acks_lost": 0}
+        self._msg = UInt8MultiArray()
+        self._ack_msg = String()
+        self.start_ns = time.perf_counter_ns()
+        self._last_tick_ns = self.start_ns
+        self._last_report = (self.start_ns, 0)
+
+        self.tick_timer = self.create_timer(1.0 / tick_rate, self.tick)
+        self.report_timer = self.create_timer(5.0, self.report)
+        self.get_logger().info(
+            f'Simulating Cougs {self.fleet_schema.vehicle_ids} at {self.rate_multiplier:g}x field rates: '
+            f'{self.status_rate * self.rate_multiplier * len(self.cougs):g} status msgs/s offered')
+
+    def tick(self):
+        now_ns = time.perf_counter_ns()
+        dt = (now_ns - self._last_tick_ns) / 1e9
+        self._last_tick_ns = now_ns
+        elapsed_s = (now_ns - self.start_ns) / 1e9
+
+        while self.scheduled_faults and self.scheduled_faults[-1][2] <= elapsed_s:
+            kind, vehicle_id, _, duration_s = self.scheduled_faults.pop()
+            self.inject(kind, vehicle_id, duration_s)
+
+        status_rate = self.status_rate * self.rate_multiplier
+        console_rate = self.console_rate * self.rate_multiplier
+        msg = self._msg
+        for vehicle_id, coug in self.cougs.items():
+            coug.step(dt, console_rate)
+            self.due[vehicle_id] += status_rate * dt
+            messages = int(self.due[vehicle_id])
+            if not messages:
+                continue
+            self.due[vehicle_id] -= messages
+            if not coug.publishing():
+                coug.take_console()
+                self.counts["suppressed"] += messages
+                continue
+            publisher = self.status_publishers[vehicle_id]
+            for _ in range(messages):
+                #lines beyond what one message holds wait for the next one
+                console = coug.take_console(MAX_CONSOLE_LINES)
+                payload = self.encoder.encode(vehicle_id, time.time_ns(), coug.states, coug.texts, console)
+                msg.data = payload
+                publisher.publish(msg)
+                self.counts["bytes"] += len(payload)
+            self.counts["published"] += messages
+
+        pending_acks = self.pending_acks
+        ack_msg = self._ack_msg
+        while pending_acks and pending_acks[0][0] <= now_ns:
+            ack_msg.data = heapq.heappop(pending_acks)[2]
+            self.ack_publisher.publish(ack_msg)
+            self.counts["acks"] += 1
+
+    def command_callback(self, msg, vehicle_id):
+        try:
+            command = json.loads(msg.data)
+        except ValueError:
+            self.get_logger().warning(f'Coug {vehicle_id}: ignoring command that is not json: "{msg.data}"')
+            return
+        coug = self.cougs[vehicle_id]
+        if not coug.link_up():
+            #the command never reaches the vehicle
+            return
+        self.counts["commands"] += 1
+        handled = self.handled_commands[vehicle_id]
+        key = (command.get("origin"), command.get("id"))
+        result = handled.get(key)
+        if result is None:
+            result = handled[key] = coug.handle_command(command.get("command"))
+            if len(handled) > self.MAX_HANDLED_COMMANDS:
+                handled.popitem(last=False)
+        if self.rng.random() < self.ack_loss:
+            self.counts["acks_lost"] += 1
+            return
+        accepted, detail = result
+        ack = json.dumps({"ack": command.get("id"), "vehicle": vehicle_id, "attempt": command.get("attempt"),
+                          "accepted": accepted, "detail": detail})
+        delay_ms = self.ack_delay_ms + self.rng.random() * self.ack_jitter_ms
+        heapq.heappush(self.pending_acks, (time.perf_counter_ns() + int(delay_ms * 1e6), self.counts["commands"], ack))
+
+    def keyframe_request_callback(self, msg):
+        if msg.data in self.cougs:
+            self.encoder.request_keyframe(msg.data)
+
+    def fault_callback(self, msg):
+        try:
+            kind, vehicle_id, _, duration_s = parse_fault(msg.data)
+        except ValueError as error:
+            self.get_logger().error(str(error))
+            return
+        self.inject(kind, vehicle_id, duration_s)
+
+    #vehicle_id 0 injects the fault into every Coug
+    def inject(self, kind, vehicle_id, duration_s):
+        targets = list(self.cougs.values()) if vehicle_id == 0 else [self.cougs[vehicle_id]] if vehicle_id in self.cougs else []
+        if not targets:
+            self.get_logger().error(f'No Coug {vehicle_id} to inject {kind} into')
+            return
+        for coug in targets:
+            coug.inject(kind, duration_s)
+        self.get_logger().warning(f'Injected {kind} into Coug(s) {", ".join(str(coug.vehicle_id) for coug in targets)}')
+
+    def report(self):
+        now_ns = time.perf_counter_ns()
+        last_ns, last_published = self._last_report
+        self._last_report = (now_ns, self.counts["published"])
+        rate = (self.counts["published"] - last_published) / ((now_ns - last_ns) / 1e9)
+        offered = self.status_rate * self.rate_multiplier * sum(coug.publishing() for coug in self.cougs.values())
+        self.get_logger().info(
+            f'{rate:.0f} status msgs/s of {offered:g} offered'
+            + (' (not keeping up)' if rate < offered * 0.9 else '')
+            + f', {self.counts["bytes"] / max(1, self.counts["published"]):.0f} B/msg, '
+            f'{self.counts["commands"]} commands, {self.counts["acks"]} acks, {self.counts["acks_lost"]} acks lost, '
+            f'{self.counts["suppressed"]} msgs lost to link loss')
+
+    def on_qos_event(self, event):
+        self.get_logger().warning(f'{event.topic}: {event.detail}')
+
+
+def main():
+    rclpy.init()
+    node = FleetSimulator()
+    try:
+        rclpy.spin(node)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        node.destroy_node()
+        rclpy.try_shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+from PyQt6.QtWidgets import QTabBar
+
+
+#style for the tabs, set once. The tab width comes from FleetTabBar.tabSizeHint instead of the style sheet
+TAB_STYLE_SHEET = """
+QTabBar::tab {
+    height: 30px;
+    font-size: 12pt;
+    padding: 5px;
+    background: lightgray;  /* background color of non-selected tab */
+    color: black;           /* font color of non-selected tab */
+}
+QTabBar::tab:selected {
+    background: blue;       /* background color of selected tab */
+    color: white;           /* font color of selected tab */
+    font-weight: bold;
+}
+"""
+
+
+class FleetTabBar(QTabBar):
+    """
+    Tab bar whose tab width is set directly instead of through a style sheet.
+
+    Changing the width only re-lays out the tabs. It does not re-parse QSS or re-polish
+    the widgets inside the tab pages, so the cost of a resize does not depend on how
+    many widgets the pages hold.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tab_width = None
+
+    def tab_width(self):
+        return self._tab_width
+
+    def set_tab_width(self, width_px):
+        if width_px == self._tab_width:
+            return
+        self._tab_width = width_px
+        #setIconSize marks the tab layout dirty, so the new size hints are picked up
+        self.setIconSize(self.iconSize())
+
+    def tabSizeHint(self, index):
+        size = super().tabSizeHint(index)
+        if self._tab_width is not None:
+            size.setWidth(self._tab_width)
+        return size
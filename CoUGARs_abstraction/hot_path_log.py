@@ -0,0 +1,123 @@
+import threading
+from collections import deque
+
+LOG_MODES = ["sync", "sampled", "async", "off"]
+
+#same values as rclpy's LoggingSeverity (and python's logging levels)
+SEVERITY_LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+
+class HotPathLogger:
+    """
+    Logging for code that runs for every message (e.g. publishing).
+
+    Records are given as a format string and its arguments, and are only formatted when
+    they are actually written:
+      sync     every record is written right away, like calling the logger directly
+      sampled  the first record of every sample_every is written, with how many were
+               skipped since the last one written
+      async    records go on a queue and a background thread formats and writes them,
+               when more than max_pending are waiting new ones are dropped (and counted)
+      off      nothing is written
+    Records below the logger's level are never formatted. close stops the async thread,
+    nothing is written after it.
+    """
+
+    def __init__(self, logger, mode="sampled", severity="info", sample_every=100, max_pending=10000):
+        """
+        Parameters:
+            logger (RcutilsLogger): e.g. node.get_logger()
+            mode (str): one of LOG_MODES
+            severity (str): "debug", "info", "warning" or "error"
+            sample_every (int): for "sampled", write one record out of this many
+            max_pending (int): for "async", how many records can wait to be written
+        """
+        if mode not in LOG_MODES:
+            raise ValueError(f"log mode must be one of {LOG_MODES}, not {mode!r}")
+        self.logger = logger
+        self.mode = mode
+        self.severity = severity
+        self.sample_every = max(1, int(sample_every))
+        self.max_pending = max_pending
+        self._write = getattr(logger, severity)
+        self._seen = 0
+        #records skipped since the last one written
+        self._unwritten = 0
+        self.written_count = 0
+        self.skipped_count = 0
+        self.dropped_count = 0
+        self._closed = False
+        self.refresh_level()
+
+        self._pending = deque()
+        self._wakeup = threading.Event()
+        self._worker = None
+        if mode == "async":
+            self._worker = threading.Thread(target=self._drain_forever, name="hot_path_log", daemon=True)
+            self._worker.start()
+
+    #the level is looked up once, call this if the logger's level is changed at runtime
+    def refresh_level(self):
+        self.enabled = not self._closed and self.mode != "off" and self.logger.get_effective_level() <= SEVERITY_LEVELS[self.severity]
+
+    def log(self, message, *args):
+        """
+        Parameters:
+            message (str): %-style format string, e.g. 'Publishing from GUI: "%s"'
+            args: the values for message, only formatted if the record is written
+        """
+        if not self.enabled:
+            return
+        if self.mode == "sync":
+            self._emit(message, args)
+        elif self.mode == "sampled":
+            if self._seen == 0:
+                self._emit(message, args, self._unwritten)
+                self._unwritten = 0
+            else:
+                self._unwritten += 1
+                self.skipped_count += 1
+            self._seen = (self._seen + 1) % self.sample_every
+        elif len(self._pending) < self.max_pending:
+            #deque.append is atomic, the worker is only woken when it may be asleep
+            self._pending.append((message, args))
+            if len(self._pending) == 1:
+                self._wakeup.set()
+        else:
+            self.dropped_count += 1
+
+    def _emit(self, message, args, skipped=0):
+        text = message % args if args else message
+        if skipped:
+            text += f" ({skipped} similar not logged)"
+        self._write(text)
+        self.written_count += 1
+
+    def _drain_forever(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending:
+                message, args = self._pending.popleft()
+                self._emit(message, args)
+            if self._closed:
+                return
+
+    #writes whatever the async worker has not written yet, e.g. before shutting down
+    def flush(self):
+        while self._pending:
+            try:
+                message, args = self._pending.popleft()
+            except IndexError:
+                break
+            self._emit(message, args)
+
+    #writes what is still pending and stops the async thread, the logger is off afterwards
+    def close(self):
+        self._closed = True
+        self.enabled = False
+        if self._worker:
+            self._wakeup.set()
+            self._worker.join()
+            self._worker = None
+        self.flush()
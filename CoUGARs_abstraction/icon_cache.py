@@ -0,0 +1,65 @@
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QIcon
+
+
+class IconCache:
+    """
+    Rasterizes every status icon once and hands out the same QPixmap afterwards.
+
+    Pixmaps are keyed by (state, size, device pixel ratio). An icon source can be a
+    QStyle.StandardPixmap (like the ones in MainWindow.icons_dict) or a path to an image
+    file such as a custom SVG status icon. Call invalidate() when the window moves to a
+    screen with a different device pixel ratio or the style changes.
+    """
+
+    def __init__(self, icons, style):
+        """
+        Parameters:
+            icons (dict): state -> QStyle.StandardPixmap or image file path
+            style (QStyle): style used to look up the standard pixmaps
+        """
+        self.icons = icons
+        self.style = style
+        self._icons = {}
+        self._pixmaps = {}
+
+    #fills the cache for every state at the given sizes, called once at startup
+    def prefill(self, sizes, device_pixel_ratio):
+        for state in self.icons:
+            for size in sizes:
+                self.pixmap(state, size, device_pixel_ratio)
+
+    def pixmap(self, state, size, device_pixel_ratio=1.0):
+        key = (state, size, device_pixel_ratio)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            pixmap = self.icon(state).pixmap(QSize(size, size), device_pixel_ratio)
+            self._pixmaps[key] = pixmap
+        return pixmap
+
+    def icon(self, state):
+        icon = self._icons.get(state)
+        if icon is None:
+            source = self.icons[state]
+            if isinstance(source, str):
+                icon = QIcon(source)
+            else:
+                icon = self.style.standardIcon(source)
+            self._icons[state] = icon
+        return icon
+
+    #sets a new icon source for a state, e.g. a custom SVG file, and drops its old pixmaps
+    def set_icon(self, state, source):
+        self.icons[state] = source
+        self._icons.pop(state, None)
+        for key in [key for key in self._pixmaps if key[0] == state]:
+            del self._pixmaps[key]
+
+    def invalidate(self, style=None):
+        if style is not None:
+            self.style = style
+        self._icons.clear()
+        self._pixmaps.clear()
+
+    def __len__(self):
+        return len(self._pixmaps)
@@ -0,0 +1,96 @@
+import math
+
+
+class LatencyHistogram:
+    """
+    Fixed memory histogram of durations in nanoseconds.
+
+    Buckets grow geometrically (BUCKETS_PER_DOUBLING buckets for every doubling), so
+    percentiles are accurate to a few percent from 1 µs up to minutes, and recording a
+    sample is a log and an index no matter how many samples were recorded.
+    """
+
+    BUCKETS_PER_DOUBLING = 16
+    #everything below MIN_NS goes in the first bucket
+    MIN_NS = 1000
+    #doublings above MIN_NS covered, 40 reach from 1 µs to about 12 days, longer durations go in the last bucket
+    MAX_DOUBLINGS = 40
+    BUCKET_COUNT = BUCKETS_PER_DOUBLING * MAX_DOUBLINGS
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * self.BUCKET_COUNT
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = None
+
+    def record(self, ns):
+        ns = max(int(ns), 0)
+        self.counts[self.bucket_of(ns)] += 1
+        self.count += 1
+        self.total_ns += ns
+        if self.min_ns is None or ns < self.min_ns:
+            self.min_ns = ns
+        if self.max_ns is None or ns > self.max_ns:
+            self.max_ns = ns
+
+    def bucket_of(self, ns):
+        if ns <= self.MIN_NS:
+            return 0
+        bucket = int(math.log2(ns / self.MIN_NS) * self.BUCKETS_PER_DOUBLING) + 1
+        return min(bucket, self.BUCKET_COUNT - 1)
+
+    #upper edge of a bucket, in nanoseconds
+    def bucket_limit(self, bucket):
+        return self.MIN_NS * 2 ** (bucket / self.BUCKETS_PER_DOUBLING)
+
+    def percentile(self, percent):
+        """
+        Parameters:
+            percent (float): 0-100
+
+        Returns the duration in nanoseconds that percent of the samples are at or below,
+        or None when nothing was recorded.
+        """
+        if not self.count:
+            return None
+        target = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for bucket, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                #the bucket edge can overshoot the largest sample
+                return min(self.bucket_limit(bucket), self.max_ns)
+        return self.max_ns
+
+    def merge(self, other):
+        for bucket, bucket_count in enumerate(other.counts):
+            self.counts[bucket] += bucket_count
+        self.count += other.count
+        self.total_ns += other.total_ns
+        if other.count:
+            self.min_ns = other.min_ns if self.min_ns is None else min(self.min_ns, other.min_ns)
+            self.max_ns = other.max_ns if self.max_ns is None else max(self.max_ns, other.max_ns)
+
+    #count, mean and percentiles in milliseconds
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ns / self.count / 1e6,
+            "p50_ms": self.percentile(50) / 1e6,
+            "p90_ms": self.percentile(90) / 1e6,
+            "p99_ms": self.percentile(99) / 1e6,
+            "max_ms": self.max_ns / 1e6,
+        }
+
+    def format(self):
+        summary = self.summary()
+        if not summary["count"]:
+            return "no samples"
+        return (f"n={summary['count']} mean={summary['mean_ms']:.2f}ms p50={summary['p50_ms']:.2f}ms "
+                f"p90={summary['p90_ms']:.2f}ms p99={summary['p99_ms']:.2f}ms max={summary['max_ms']:.2f}ms")
@@ -0,0 +1,90 @@
+import time
+
+from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QLabel, QWidget
+
+from testing_turtle_gui import perf_probes
+
+
+class PerfOverlay(QLabel):
+    """
+    Panel floating over the top left of the window with the rate and latency percentiles
+    of every perf probe, the number of widgets, and the ros bridge and update scheduler
+    counters. It is refreshed twice a second, only while it is shown.
+    """
+
+    REFRESH_MS = 500
+
+    def __init__(self, window):
+        """
+        Parameters:
+            window (MainWindow): the window to show the overlay over and take the counters from
+        """
+        super().__init__(window)
+        self.main_window = window
+        self.setFont(QFont("Monospace", 9))
+        self.setTextFormat(Qt.TextFormat.PlainText)
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 190); color: white; padding: 6px;")
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        #probe call counts at the last refresh, the rates shown are since then
+        self._last_counts = {}
+        self._last_refresh_ns = time.perf_counter_ns()
+        self.hide()
+
+    def toggle(self):
+        if self.isVisible():
+            self.timer.stop()
+            self.hide()
+        else:
+            #rates start over, instead of averaging over the time the overlay was hidden
+            self._last_counts = {name: summary["count"] for name, summary in perf_probes.snapshot().items()}
+            self._last_refresh_ns = time.perf_counter_ns()
+            self.refresh()
+            self.move(10, 10)
+            self.show()
+            self.raise_()
+            self.timer.start(self.REFRESH_MS)
+
+    def refresh(self):
+        self.setText(self.report())
+        self.adjustSize()
+
+    def report(self):
+        lines = []
+        if perf_probes.ENABLED:
+            now_ns = time.perf_counter_ns()
+            elapsed_s = max(1e-9, (now_ns - self._last_refresh_ns) / 1e9)
+            self._last_refresh_ns = now_ns
+            lines.append(f"{'probe':<32}{'calls/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+            for name, summary in perf_probes.snapshot().items():
+                rate = (summary["count"] - self._last_counts.get(name, 0)) / elapsed_s
+                self._last_counts[name] = summary["count"]
+                if not summary["count"]:
+                    lines.append(f"{name:<32}{rate:>9.1f}")
+                    continue
+                lines.append(f"{name:<32}{rate:>9.1f}{summary['p50_ms']:>9.3f}"
+                             f"{summary['p99_ms']:>9.3f}{summary['max_ms']:>9.3f}")
+        else:
+            lines.append("probes off, start with COUGARS_PERF_PROBES=1 to time the hot paths")
+
+        window = self.main_window
+        lines.append("")
+        lines.append(f"widgets {len(window.findChildren(QWidget))}, registered cells {len(window.widget_registry)}, "
+                     f"coug tabs built {len(window.built_coug_tabs)}/{len(window.fleet_schema.vehicle_ids)}")
+        bridge = window.ros_bridge
+        lines.append(f"bridge received {bridge.received_count}, delivered {bridge.delivered_count}, "
+                     f"backlog {bridge.backlog()}")
+        scheduler = window.update_scheduler.stats()
+        lines.append(f"frames {scheduler['frames']}, cell updates {scheduler['updates_applied']} "
+                     f"of {scheduler['updates_received']} ({scheduler['updates_coalesced']} coalesced)")
+        latency = window.telemetry_latency.report()
+        if len(latency) > 1:
+            lines.append("")
+            lines.extend(latency)
+        if window.stall_watchdog:
+            lines.append("")
+            lines.append(window.stall_watchdog.report(5))
+        return "\n".join(lines)
@@ -0,0 +1,84 @@
+import functools
+import os
+import time
+
+from testing_turtle_gui.latency_stats import LatencyHistogram
+
+#Timing probes around the GUI's hot paths, aggregated into LatencyHistograms and shown by
+#perf_overlay.PerfOverlay (Ctrl+Shift+P). They are switched on with COUGARS_PERF_PROBES=1
+#in the environment, which is read once, when this module is imported. When it is off,
+#@probe returns the function itself, so a disabled probe costs nothing at all per call.
+ENABLED = os.environ.get("COUGARS_PERF_PROBES", "") not in ("", "0")
+
+#name -> Probe, in the order the probes were declared
+PROBES = {}
+
+
+class Probe:
+    """
+    Call count and duration histogram of one probed function. Probes are recorded on the
+    thread that calls the function, the GUI's probes all run on the GUI thread.
+    """
+
+    __slots__ = ("name", "histogram", "started_ns")
+
+    def __init__(self, name):
+        self.name = name
+        self.histogram = LatencyHistogram()
+        self.started_ns = time.perf_counter_ns()
+
+    def reset(self):
+        self.histogram.reset()
+        self.started_ns = time.perf_counter_ns()
+
+    #calls per second since the probe was created or last reset
+    def rate(self):
+        elapsed_s = (time.perf_counter_ns() - self.started_ns) / 1e9
+        return self.histogram.count / elapsed_s if elapsed_s > 0 else 0.0
+
+
+def get_probe(name):
+    probe_ = PROBES.get(name)
+    if probe_ is None:
+        probe_ = PROBES[name] = Probe(name)
+    return probe_
+
+
+def probe(name=None):
+    """
+    Decorator that times every call of a function into the probe called name (the
+    function's name by default). Does nothing unless ENABLED.
+    """
+
+    def decorate(function):
+        if not ENABLED:
+            return function
+        histogram = get_probe(name or function.__name__).histogram
+        perf_counter_ns = time.perf_counter_ns
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start_ns = perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.record(perf_counter_ns() - start_ns)
+
+        return timed
+
+    return decorate
+
+
+#{name: {"rate": calls/s, "count", "mean_ms", "p50_ms", "p99_ms", "max_ms"}} of every probe
+def snapshot():
+    result = {}
+    for name, probe_ in PROBES.items():
+        summary = probe_.histogram.summary()
+        summary["rate"] = probe_.rate()
+        result[name] = summary
+    return result
+
+
+def reset():
+    for probe_ in PROBES.values():
+        probe_.reset()
@@ -1,87 +1,270 @@
 import sys
+import time
 import threading
 import signal
 
 import rclpy
 from rclpy.node import Node
-from std_msgs.msg import String
+from std_msgs.msg import String, UInt8MultiArray, UInt16
 
 from PyQt5.QtWidgets import QApplication
 
 import testing_turtle_gui.tabbed_window
-from rclpy.executors import SingleThreadedExecutor
+from testing_turtle_gui.fleet_schema import FleetSchema
+from testing_turtle_gui.telemetry_codec import CodecError, KIND_KEYFRAME
+from testing_turtle_gui.ros_executor import make_executor, FleetCallbackGroups, CallbackDelayMonitor
+from testing_turtle_gui.event_loop import install_quit_on_signals
+from testing_turtle_gui.qos_profiles import QosConfig
+from testing_turtle_gui.hot_path_log import HotPathLogger
+from testing_turtle_gui.perf_probes import probe
+from testing_turtle_gui.stall_watchdog import StallWatchdog
+from testing_turtle_gui.telemetry_recorder import TelemetryRecorder
 
 class MinimalPublisher(Node):
     def __init__(self):
         super().__init__('minimal_publisher')
-        self.publisher_ = self.create_publisher(String, 'topic', 10)
+        #optional json file with per topic qos profiles (see qos_profiles.DEFAULT_QOS)
+        qos_config = self.declare_parameter('qos_config', '').value
+        self.qos_config = QosConfig.from_json(qos_config) if qos_config else QosConfig()
+        #called with every QosEvent once the GUI is up
+        self.qos_event_listener = None
+        self.publisher_ = self.create_publisher(
+            String, 'topic', self.qos_config.profile('topic'),
+            event_callbacks=self.qos_config.publisher_events('topic', self.on_qos_event))
+        #vehicle_id -> publisher on coug{n}/cmd, each created once and reused
+        self.command_publishers = {}
+        #publish serializes the message right away, so one message object is reused for every publish
+        self._text_msg = String()
+        #how published messages are logged: "sync", "sampled", "async" or "off", see hot_path_log.
+        #"async" logs every publish like before, without formatting and writing on the GUI thread
+        publish_log = self.declare_parameter('publish_log', 'async').value
+        sample_every = self.declare_parameter('publish_log_sample_every', 100).value
+        self.publish_log = HotPathLogger(self.get_logger(), publish_log, sample_every=sample_every)
 
+    #only called from the GUI thread, the reused message is not shared between threads
+    @probe()
     def publish_text(self, text):
-        msg = String()
+        msg = self._text_msg
         msg.data = text
         self.publisher_.publish(msg)
-        self.get_logger().info(f'Publishing from GUI: "{text}"')
+        self.publish_log.log('Publishing from GUI: "%s"', text)
+
+    #creates the command publishers up front, so no publisher is created while the executor is spinning
+    def create_command_publishers(self, vehicle_ids):
+        for vehicle_id in vehicle_ids:
+            self.command_publisher(vehicle_id)
+
+    def command_publisher(self, vehicle_id):
+        publisher = self.command_publishers.get(vehicle_id)
+        if publisher is None:
+            topic = f'coug{vehicle_id}/cmd'
+            publisher = self.create_publisher(
+                String, topic, self.qos_config.profile(topic),
+                event_callbacks=self.qos_config.publisher_events(topic, self.on_qos_event))
+            self.command_publishers[vehicle_id] = publisher
+        return publisher
+
+    @probe()
+    def publish_commands(self, commands):
+        """
+        Publishes a batch of commands, each on its vehicle's coug{n}/cmd topic, and logs the
+        batch once.
+
+        Parameters:
+            commands (list): (vehicle_id, text) pairs
+        """
+        msg = self._text_msg
+        for vehicle_id, text in commands:
+            msg.data = text
+            self.command_publisher(vehicle_id).publish(msg)
+        #commands are rare and matter, they are always logged
+        self.get_logger().info(f'Sent {len(commands)} command(s) to Coug(s) {", ".join(str(vehicle_id) for vehicle_id, _ in commands)}')
+
+    def on_qos_event(self, event):
+        self.get_logger().warning(f'{event.topic}: {event.detail}')
+        if self.qos_event_listener:
+            self.qos_event_listener(event)
 
 class MinimalSubscriber(Node):
-    def __init__(self, window):
+    def __init__(self, window, qos_config=None, delay_monitor=None, recorder=None):
+        """
+        Parameters:
+            window (MainWindow): gets the messages through window.ros_bridge
+            qos_config (QosConfig): optional, the qos of each topic, defaults to qos_profiles.DEFAULT_QOS
+            delay_monitor (CallbackDelayMonitor): optional, measures the callbacks' queueing delay
+            recorder (TelemetryRecorder): optional, every received message is recorded to it
+        """
         super().__init__('minimal_subscriber')
+        self.qos_config = qos_config or QosConfig()
+        self.recorder = recorder
+        self.window = window
+        self.delay_monitor = delay_monitor or CallbackDelayMonitor(enabled=False)
+        self.callback_groups = FleetCallbackGroups(window.fleet_schema.vehicle_ids)
+
+        #command confirmations (and aborts) go in the safety group so vehicle traffic never delays them
         self.subscription = self.create_subscription(
             String,
             'topic',
             # self.listener_callback,
-            window.recieve_message,
-            10)
+            #the bridge queues the message and hands it to window.recieve_message on the GUI thread
+            #nothing is merged, every command ack has to get through
+            self.delay_monitor.wrap('topic', self.topic_callback),
+            self.qos_config.profile('topic'),
+            callback_group=self.callback_groups.safety,
+            event_callbacks=self.qos_config.subscription_events('topic', self.on_qos_event))
         self.subscription  # prevent unused variable warning
 
+        #binary fleet status from the vehicles, see telemetry_codec
+        self.status_subscription = self.create_subscription(
+            UInt8MultiArray,
+            'fleet_status',
+            self.delay_monitor.wrap('fleet_status', self.make_status_callback('fleet_status'), with_info=True),
+            self.qos_config.profile('fleet_status'),
+            callback_group=self.callback_groups.fleet,
+            event_callbacks=self.qos_config.subscription_events('fleet_status', self.on_qos_event))
+        #vehicles can also publish on their own topic, handled in that vehicle's callback group
+        self.vehicle_status_subscriptions = {}
+        for vehicle_id in window.fleet_schema.vehicle_ids:
+            topic = f'coug{vehicle_id}/fleet_status'
+            self.vehicle_status_subscriptions[vehicle_id] = self.create_subscription(
+                UInt8MultiArray,
+                topic,
+                self.delay_monitor.wrap(topic, self.make_status_callback(topic), with_info=True),
+                self.qos_config.profile(topic),
+                callback_group=self.callback_groups.vehicle(vehicle_id),
+                event_callbacks=self.qos_config.subscription_events(topic, self.on_qos_event))
+        #asks a vehicle for a keyframe after its delta messages went missing
+        self.keyframe_request_publisher = self.create_publisher(
+            UInt16, 'fleet_keyframe_request', self.qos_config.profile('fleet_keyframe_request'))
+        self.keyframe_requested = set()
+
+    def topic_callback(self, msg):
+        if self.recorder:
+            self.recorder.record('topic', msg.data.encode('utf-8'))
+        self.window.ros_bridge.enqueue('topic', msg)
+
+    #rclpy passes MessageInfo to callbacks with two required arguments
+    def make_status_callback(self, topic):
+        return lambda msg, msg_info: self.status_callback(msg, topic, msg_info)
+
+    #decodes on a ros executor thread, every decoded status is handed to the GUI (none are merged)
+    def status_callback(self, msg, topic='fleet_status', msg_info=None):
+        recv_ns = time.time_ns()
+        payload = bytes(msg.data)
+        try:
+            status = self.window.status_decoder.decode(payload)
+        except CodecError as error:
+            self.get_logger().warning(f'Dropping fleet status: {error}')
+            if self.recorder:
+                self.recorder.record(topic, payload, recv_ns)
+            return
+        if self.recorder:
+            self.recorder.record(topic, payload, recv_ns, status.vehicle_id if status.kind == KIND_KEYFRAME else None)
+        #the topic is the link the status came over, the middleware receive time separates the link from the executor queue
+        self.window.telemetry_latency.received(status, topic, msg_info.get('received_timestamp') if msg_info else None, recv_ns)
+        self.window.ros_bridge.enqueue('fleet_status', status)
+
+        vehicle_id = status.vehicle_id
+        if status.kind == KIND_KEYFRAME:
+            self.keyframe_requested.discard(vehicle_id)
+        elif vehicle_id in self.window.status_decoder.needs_keyframe and vehicle_id not in self.keyframe_requested:
+            #only asked once per gap, the vehicle's periodic keyframes cover a lost request
+            self.keyframe_requested.add(vehicle_id)
+            msg = UInt16()
+            msg.data = vehicle_id
+            self.keyframe_request_publisher.publish(msg)
+            self.get_logger().info(f'Missed fleet status from Coug {vehicle_id}, requesting a keyframe')
+
+    #deadline, liveliness and incompatible qos events, shown in the GUI
+    def on_qos_event(self, event):
+        self.get_logger().warning(f'{event.topic}: {event.detail}')
+        self.window.ros_bridge.enqueue('qos_event', event)
+
     def listener_callback(self, msg):
         self.get_logger().info('I heard: "%s"' % msg.data)
 
+    def log_callback_delays(self):
+        for line in self.delay_monitor.report():
+            self.get_logger().info(line)
+
 def ros_spin_thread(executor):
     executor.spin()
 
 def main():
-    import signal
-    from PyQt5.QtCore import QTimer
-
     rclpy.init()
     pub_node = MinimalPublisher()
 
-    app, window = testing_turtle_gui.tabbed_window.OpenWindow(pub_node)
+    #optional json file describing the fleet (see fleet_schema.DEFAULT_FLEET), defaults to Cougs 1-3
+    fleet_config = pub_node.declare_parameter('fleet_config', '').value
+    fleet_schema = FleetSchema.from_json(fleet_config) if fleet_config else FleetSchema()
+    #"single" or "multi", with "multi" callbacks of different vehicles (and safety topics) run in parallel
+    executor_mode = pub_node.declare_parameter('executor', 'single').value
+    executor_threads = pub_node.declare_parameter('executor_threads', 0).value
+    #logs every callback's queueing delay and run time every measure_period seconds
+    measure_callbacks = pub_node.declare_parameter('measure_callbacks', False).value
+    measure_period = pub_node.declare_parameter('measure_period', 10.0).value
+    #"notifier" wakes the Qt loop only when a signal arrives, "timer" is the old 100 ms polling timer
+    event_loop_mode = pub_node.declare_parameter('event_loop', 'notifier').value
+    #records every received message to this directory (see telemetry_recorder), off when empty
+    record_dir = pub_node.declare_parameter('record_dir', '').value
+    record_segment_mb = pub_node.declare_parameter('record_segment_mb', 64).value
+    #0 keeps every segment
+    record_max_segments = pub_node.declare_parameter('record_max_segments', 0).value
+    recorder = TelemetryRecorder(record_dir, record_segment_mb * 1024 * 1024, record_max_segments) if record_dir else None
+    #GUI event loop round trips longer than this are logged with the GUI thread's stack, 0 turns the watchdog off
+    stall_threshold_ms = pub_node.declare_parameter('stall_threshold_ms', 100).value
+    #the end to end latency histograms (see telemetry_latency) are written to this json file on exit, off when empty
+    latency_export = pub_node.declare_parameter('latency_export', '').value
+
+    pub_node.create_command_publishers(fleet_schema.vehicle_ids)
+
+    app, window = testing_turtle_gui.tabbed_window.OpenWindow(pub_node, fleet_schema)
     global main_window
     main_window = window
 
-    sub_node = MinimalSubscriber(main_window)
+    sub_node = MinimalSubscriber(main_window, pub_node.qos_config, CallbackDelayMonitor(enabled=measure_callbacks), recorder)
+    pub_node.qos_event_listener = lambda event: main_window.ros_bridge.enqueue('qos_event', event)
+    if measure_callbacks:
+        sub_node.create_timer(measure_period, sub_node.log_callback_delays)
+    if stall_threshold_ms:
+        main_window.stall_watchdog = StallWatchdog(stall_threshold_ms, log=pub_node.get_logger().warning, parent=main_window)
+        main_window.stall_watchdog.start()
 
-    executor = SingleThreadedExecutor()
+    executor = make_executor(executor_mode, executor_threads)
     executor.add_node(pub_node)
     executor.add_node(sub_node)
 
     # Spin the executor in the background
-    ros_thread = threading.Thread(target=ros_spin_thread, args=(executor,), daemon=True)
+    #rclpy has no file descriptor Qt could watch, so the executor keeps its own thread. It
+    #sleeps in rcl_wait until ros work arrives, and hands messages over through
+    #window.ros_bridge, which wakes the Qt loop right away. It is stopped on the way out.
+    ros_thread = threading.Thread(target=ros_spin_thread, args=(executor,))
     ros_thread.start()
 
-
-
     # pub_thread = threading.Thread(target=ros_spin_thread, args=(pub_node,), daemon=True)
     # pub_thread.start()
 
     # sub_thread = threading.Thread(target=ros_spin_thread, args=(sub_node,), daemon=True)
     # sub_thread.start()
 
+    #Ctrl+C quits the app, and the nodes below get destroyed properly
+    signal_wakeup = install_quit_on_signals(app, event_loop_mode)
 
-    signal.signal(signal.SIGINT, signal.SIG_DFL)
-
-    def start_timer():
-        timer = QTimer()
-        timer.timeout.connect(lambda: None)
-        timer.start(100)
-
-    # Start timer right after app is fully running
-    QTimer.singleShot(0, start_timer)
-
+    exit_code = 1
     try:
         exit_code = app.exec()
     finally:
+        executor.shutdown()
+        ros_thread.join()
+        if main_window.stall_watchdog:
+            main_window.stall_watchdog.stop()
+            if main_window.stall_watchdog.stall_count:
+                pub_node.get_logger().info('Top GUI stall sites:\n' + main_window.stall_watchdog.report())
+        if latency_export:
+            main_window.telemetry_latency.export(latency_export)
+        pub_node.publish_log.close()
+        if recorder:
+            recorder.close()
         pub_node.destroy_node()
         sub_node.destroy_node()
         rclpy.shutdown()
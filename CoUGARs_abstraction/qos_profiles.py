@@ -0,0 +1,189 @@
+import json
+import re
+from collections import namedtuple
+from fnmatch import fnmatchcase
+
+from rclpy.duration import Duration
+from rclpy.qos import QoSProfile, ReliabilityPolicy, DurabilityPolicy, HistoryPolicy, LivelinessPolicy
+
+try:
+    from rclpy.event_handler import SubscriptionEventCallbacks, PublisherEventCallbacks
+except ImportError:
+    #rclpy before Iron
+    from rclpy.qos_event import SubscriptionEventCallbacks, PublisherEventCallbacks
+
+
+#The QoS every topic gets when no qos config file is given.
+#topics maps topic name patterns (fnmatch, first match wins) to a profile name, topics
+#that match nothing get the "default" profile.
+#A subscriber only gets messages from publishers offering at least what it requests: a
+#deadline or liveliness lease here has to be offered (as short or shorter) by the vehicles,
+#otherwise the GUI shows an incompatible QoS event and receives nothing.
+DEFAULT_QOS = {
+    "profiles": {
+        "default": {
+            "reliability": "reliable",
+            "durability": "volatile",
+            "history": "keep_last",
+            "depth": 10,
+        },
+        #high rate status, only the newest message matters and a lost one is not resent
+        "telemetry": {
+            "reliability": "best_effort",
+            "durability": "volatile",
+            "history": "keep_last",
+            "depth": 1,
+            "deadline_ms": 2000,
+            "liveliness": "automatic",
+            "liveliness_lease_ms": 5000,
+        },
+        #missions and commands, resent by the middleware until delivered. Nothing is kept for late
+        #joining or restarted vehicles (an old emergency_shutdown must never be replayed to them),
+        #CommandTracker resends a command until it is acked, and a command still undelivered
+        #after lifespan_ms is dropped as stale
+        "command": {
+            "reliability": "reliable",
+            "durability": "volatile",
+            "history": "keep_last",
+            "depth": 10,
+            "lifespan_ms": 5000,
+        },
+    },
+    "topics": {
+        "fleet_status": "telemetry",
+        "coug*/fleet_status": "telemetry",
+        #'topic' keeps the default profile, so nodes publishing with default qos still match
+        "coug*/cmd": "command",
+    },
+}
+
+RELIABILITY = {
+    "reliable": ReliabilityPolicy.RELIABLE,
+    "best_effort": ReliabilityPolicy.BEST_EFFORT,
+    "system_default": ReliabilityPolicy.SYSTEM_DEFAULT,
+}
+DURABILITY = {
+    "volatile": DurabilityPolicy.VOLATILE,
+    "transient_local": DurabilityPolicy.TRANSIENT_LOCAL,
+    "system_default": DurabilityPolicy.SYSTEM_DEFAULT,
+}
+HISTORY = {
+    "keep_last": HistoryPolicy.KEEP_LAST,
+    "keep_all": HistoryPolicy.KEEP_ALL,
+    "system_default": HistoryPolicy.SYSTEM_DEFAULT,
+}
+LIVELINESS = {
+    "automatic": LivelinessPolicy.AUTOMATIC,
+    "manual_by_topic": LivelinessPolicy.MANUAL_BY_TOPIC,
+    "system_default": LivelinessPolicy.SYSTEM_DEFAULT,
+}
+
+#a QoS event seen on a topic, handed to the GUI. vehicle_id is None for topics shared by the fleet
+#kind: "deadline_missed", "liveliness_changed" or "incompatible_qos"
+QosEvent = namedtuple("QosEvent", ["topic", "vehicle_id", "kind", "count", "alive", "detail"])
+
+VEHICLE_TOPIC_RE = re.compile(r"(?:^|/)coug(\d+)/")
+
+
+def vehicle_of(topic):
+    match = VEHICLE_TOPIC_RE.search(topic)
+    return int(match.group(1)) if match else None
+
+
+def make_profile(settings):
+    """
+    Parameters:
+        settings (dict): one profile from the qos config, see DEFAULT_QOS
+    """
+    unknown = set(settings) - {"reliability", "durability", "history", "depth", "deadline_ms",
+                               "lifespan_ms", "liveliness", "liveliness_lease_ms"}
+    if unknown:
+        raise ValueError(f"unknown qos settings {sorted(unknown)}")
+    profile = QoSProfile(
+        depth=int(settings.get("depth", 10)),
+        history=HISTORY[settings.get("history", "keep_last")],
+        reliability=RELIABILITY[settings.get("reliability", "reliable")],
+        durability=DURABILITY[settings.get("durability", "volatile")],
+    )
+    if settings.get("deadline_ms"):
+        profile.deadline = Duration(nanoseconds=int(settings["deadline_ms"] * 1e6))
+    if settings.get("lifespan_ms"):
+        profile.lifespan = Duration(nanoseconds=int(settings["lifespan_ms"] * 1e6))
+    if "liveliness" in settings:
+        profile.liveliness = LIVELINESS[settings["liveliness"]]
+    if settings.get("liveliness_lease_ms"):
+        profile.liveliness_lease_duration = Duration(nanoseconds=int(settings["liveliness_lease_ms"] * 1e6))
+    return profile
+
+
+class QosConfig:
+    """
+    Picks the QoS profile of every topic from a declarative config, so QoS can be tuned
+    per topic (e.g. for a lossy radio link) by editing a json file instead of the code.
+    """
+
+    def __init__(self, config=None):
+        """
+        Parameters:
+            config (dict): qos description in the same shape as DEFAULT_QOS, profiles and
+                topics given here are added to (or replace) the DEFAULT_QOS ones
+        """
+        config = config or {}
+        profiles = {**DEFAULT_QOS["profiles"], **config.get("profiles", {})}
+        self.profiles = {name: make_profile(settings) for name, settings in profiles.items()}
+        #patterns from the config are tried before the defaults
+        self.topics = {**config.get("topics", {}), **{pattern: name for pattern, name in DEFAULT_QOS["topics"].items()
+                                                    if pattern not in config.get("topics", {})}}
+        for pattern, name in self.topics.items():
+            if name not in self.profiles:
+                raise ValueError(f"topic {pattern!r} uses unknown qos profile {name!r}")
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path) as config_file:
+            return cls(json.load(config_file))
+
+    def profile_name(self, topic):
+        topic = topic.lstrip("/")
+        for pattern, name in self.topics.items():
+            if fnmatchcase(topic, pattern.lstrip("/")):
+                return name
+        return "default"
+
+    def profile(self, topic):
+        return self.profiles[self.profile_name(topic)]
+
+    def subscription_events(self, topic, handler):
+        """
+        Returns SubscriptionEventCallbacks that turn the topic's deadline, liveliness and
+        incompatible QoS events into QosEvents.
+
+        Parameters:
+            topic (str): the subscribed topic
+            handler (function): called with each QosEvent, on the ros executor thread
+        """
+        vehicle_id = vehicle_of(topic)
+
+        def deadline(info):
+            handler(QosEvent(topic, vehicle_id, "deadline_missed", info.total_count, None,
+                             f"no message within the deadline ({info.total_count} missed in total)"))
+
+        def liveliness(info):
+            alive = info.alive_count > 0
+            handler(QosEvent(topic, vehicle_id, "liveliness_changed", info.not_alive_count, alive,
+                             "publisher alive again" if alive else "publisher lost (liveliness lease expired)"))
+
+        def incompatible(info):
+            handler(QosEvent(topic, vehicle_id, "incompatible_qos", info.total_count, None,
+                             f"publisher QoS incompatible with the {self.profile_name(topic)} profile (policy {info.last_policy_kind})"))
+
+        return SubscriptionEventCallbacks(deadline=deadline, liveliness=liveliness, incompatible_qos=incompatible)
+
+    def publisher_events(self, topic, handler):
+        vehicle_id = vehicle_of(topic)
+
+        def incompatible(info):
+            handler(QosEvent(topic, vehicle_id, "incompatible_qos", info.total_count, None,
+                             f"subscriber QoS incompatible with the {self.profile_name(topic)} profile (policy {info.last_policy_kind})"))
+
+        return PublisherEventCallbacks(incompatible_qos=incompatible)
@@ -0,0 +1,77 @@
+import threading
+from collections import deque
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+
+class RosQtBridge(QObject):
+    """
+    Hands messages from the ros executor threads over to the Qt GUI thread.
+
+    ros callbacks append to a deque (append and popleft are atomic) and wake the GUI
+    thread with a queued signal, only one wakeup is in flight at a time. The GUI thread
+    then delivers the queued messages, in order. Nothing is merged or dropped here:
+    status deltas, acks and QoS events must all be delivered. Coalescing happens in the
+    UpdateScheduler, which redraws each changed cell at most once per frame however many
+    messages changed it.
+
+    The backlog is not bounded. While the GUI thread is stalled every message waits in
+    the deque, backlog() tells how many (the perf overlay shows it, and replays wait while
+    it is too long).
+    """
+
+    #internal wakeup signal, always delivered through a queued connection
+    _wakeup = pyqtSignal()
+
+    def __init__(self, handler, parent=None):
+        """
+        Creates the bridge. Must be called from the GUI thread.
+
+        Parameters:
+            handler (function): called on the GUI thread as handler(topic, message)
+            parent (QObject): optional Qt parent
+        """
+        super().__init__(parent)
+        self.handler = handler
+        self._queue = deque()
+        #guards the wakeup flag and received_count, a multi threaded executor enqueues from several threads at once
+        self._lock = threading.Lock()
+        self._wakeup_pending = False
+        self._wakeup.connect(self._drain, Qt.ConnectionType.QueuedConnection)
+
+        #counters, read from the GUI thread. received_count is written under the lock,
+        #delivered_count only on the GUI thread
+        self.received_count = 0
+        self.delivered_count = 0
+
+    #called from the ros threads
+    def enqueue(self, topic, message):
+        #appended before the flag is checked, so a drain that already started still sees it or wakes up again
+        self._queue.append((topic, message))
+        with self._lock:
+            self.received_count += 1
+            if self._wakeup_pending:
+                return
+            self._wakeup_pending = True
+        self._wakeup.emit()
+
+    #how many messages are waiting for the GUI thread
+    def backlog(self):
+        return len(self._queue)
+
+    #returns a subscription callback bound to a topic name
+    def make_callback(self, topic):
+        def callback(message):
+            self.enqueue(topic, message)
+        return callback
+
+    #runs on the GUI thread
+    def _drain(self):
+        with self._lock:
+            #clear the flag first, anything appended after this point will wake us again
+            self._wakeup_pending = False
+        #only what is queued now, later messages come with the next wakeup instead of keeping the GUI thread here
+        for _ in range(len(self._queue)):
+            topic, message = self._queue.popleft()
+            self.delivered_count += 1
+            self.handler(topic, message)
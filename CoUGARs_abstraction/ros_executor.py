@@ -0,0 +1,118 @@
+import time
+
+from rclpy.callback_groups import MutuallyExclusiveCallbackGroup
+from rclpy.executors import SingleThreadedExecutor, MultiThreadedExecutor
+from rclpy.subscription import Subscription
+
+from testing_turtle_gui.latency_stats import LatencyHistogram
+
+EXECUTOR_MODES = ["single", "multi"]
+
+#rclpy passes MessageInfo (with the time the middleware received the message) to two argument callbacks
+MESSAGE_INFO_SUPPORTED = hasattr(Subscription, "CallbackType")
+
+
+def make_executor(mode="single", threads=0):
+    """
+    Parameters:
+        mode (str): "single" runs every callback in one thread, "multi" runs callbacks
+            from different callback groups in parallel
+        threads (int): worker threads for "multi", 0 lets rclpy pick (one per cpu)
+    """
+    if mode == "single":
+        return SingleThreadedExecutor()
+    if mode == "multi":
+        return MultiThreadedExecutor(num_threads=threads or None)
+    raise ValueError(f"executor mode must be one of {EXECUTOR_MODES}, not {mode!r}")
+
+
+class FleetCallbackGroups:
+    """
+    The callback groups the GUI's subscriptions are split into.
+
+    Each vehicle gets its own mutually exclusive group, so with a multi threaded executor
+    a slow callback for one Coug only holds up that Coug. Safety traffic (command
+    confirmations, aborts) gets a group of its own that no vehicle callback can block.
+    rclpy has no callback priorities, a group of its own is how a callback is kept from
+    waiting behind others.
+    """
+
+    def __init__(self, vehicle_ids):
+        self.safety = MutuallyExclusiveCallbackGroup()
+        #topics shared by the whole fleet
+        self.fleet = MutuallyExclusiveCallbackGroup()
+        self.vehicles = {vehicle_id: MutuallyExclusiveCallbackGroup() for vehicle_id in vehicle_ids}
+
+    def vehicle(self, vehicle_id):
+        group = self.vehicles.get(vehicle_id)
+        if group is None:
+            group = self.vehicles[vehicle_id] = MutuallyExclusiveCallbackGroup()
+        return group
+
+
+class CallbackDelayMonitor:
+    """
+    Measures how long subscription callbacks wait in the executor's queue (from the
+    middleware receiving the message to the callback starting) and how long they run.
+
+    Queueing delay needs MessageInfo from rclpy (Iron and later), on older rclpy only the
+    run time is measured.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        #callback name -> LatencyHistogram
+        self.delays = {}
+        self.run_times = {}
+
+    def wrap(self, name, callback, with_info=False):
+        """
+        Returns a subscription callback that records into the histograms for name, or
+        callback itself when the monitor is disabled.
+
+        Parameters:
+            name (str): shown in the report, e.g. the topic
+            callback (function): the subscription callback, called with the message
+            with_info (bool): callback takes (msg, msg_info) instead, msg_info is None
+                on rclpy without MessageInfo
+        """
+        if not self.enabled:
+            if with_info and not MESSAGE_INFO_SUPPORTED:
+                return lambda msg: callback(msg, None)
+            return callback
+        delays = self.delays.setdefault(name, LatencyHistogram())
+        run_times = self.run_times.setdefault(name, LatencyHistogram())
+
+        if MESSAGE_INFO_SUPPORTED:
+            def measured_callback(msg, msg_info):
+                start_ns = time.time_ns()
+                received_ns = msg_info.get("received_timestamp") if msg_info else None
+                if received_ns:
+                    delays.record(start_ns - received_ns)
+                if with_info:
+                    callback(msg, msg_info)
+                else:
+                    callback(msg)
+                run_times.record(time.time_ns() - start_ns)
+        else:
+            def measured_callback(msg):
+                start_ns = time.perf_counter_ns()
+                if with_info:
+                    callback(msg, None)
+                else:
+                    callback(msg)
+                run_times.record(time.perf_counter_ns() - start_ns)
+        return measured_callback
+
+    #one line per callback
+    def report(self):
+        lines = []
+        for name in sorted(self.run_times):
+            delays = self.delays[name]
+            delay_text = delays.format() if MESSAGE_INFO_SUPPORTED else "not available"
+            lines.append(f"{name}: queue delay {delay_text} | run time {self.run_times[name].format()}")
+        return lines
+
+    def reset(self):
+        for histogram in list(self.delays.values()) + list(self.run_times.values()):
+            histogram.reset()
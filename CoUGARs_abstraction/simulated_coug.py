@@ -0,0 +1,208 @@
+import random
+
+from testing_turtle_gui.fleet_schema import FleetSchema
+
+FAULT_KINDS = ["leak", "link_loss", "node_crash"]
+
+#commands from the GUI buttons (see command_pipeline) and what they do to a simulated coug
+MISSION_COMMANDS = {
+    "load_mission": "mission loaded",
+    "start_mission": "mission started",
+    "abort_mission": "mission aborted",
+    "return_to_base": "returning to base",
+    "recall": "recalled",
+}
+SYSTEM_COMMANDS = {
+    "disarm_thruster": "thruster disarmed",
+    "deactivate_dvl": "DVL deactivated",
+    "toggle_lights": "running lights toggled",
+    "restart_pi": "R-Pi restarted",
+    "system_reboot": "rebooted",
+    "emergency_shutdown": "shut down",
+}
+
+NORMAL_CONSOLE_LINES = [
+    "INFO: DVL reports bottom lock achieved",
+    "INFO: GPS fix acquired, {satellites} satellites",
+    "INFO: Depth {depth:.1f} m, heading {heading:.0f} deg",
+    "DEBUG: Factor graph optimized in {solve_ms} ms",
+    "INFO: Modem ping from topside, range {range_m} m",
+    "WARNING: Depth sensor value out of expected range",
+]
+
+
+def parse_fault(text):
+    """
+    Parses a fault like "leak:2:30" or "link_loss:1:10:20": kind, vehicle id, seconds from
+    the start of the simulation, and for link_loss how many seconds the link stays down.
+
+    Returns (kind, vehicle_id, at_s, duration_s).
+    """
+    parts = text.replace(" ", ":").split(":")
+    if len(parts) < 2 or parts[0] not in FAULT_KINDS:
+        raise ValueError(f"fault must look like kind:vehicle[:at_s[:duration_s]] with kind in {FAULT_KINDS}, not {text!r}")
+    at_s = float(parts[2]) if len(parts) > 2 else 0.0
+    duration_s = float(parts[3]) if len(parts) > 3 else 10.0
+    return parts[0], int(parts[1]), at_s, duration_s
+
+
+class SimulatedCoug:
+    """
+    A pretend Coug: its connection, sensor and node health, status strings, console log
+    and depth/heading/battery, evolving over time, plus faults and command handling.
+    Plain python, the ros side is in fleet_simulator.
+    """
+
+    def __init__(self, vehicle_id, schema=None, seed=None):
+        """
+        Parameters:
+            vehicle_id (int): which coug this is
+            schema (FleetSchema): the fields to report, defaults to FleetSchema()
+            seed (int): optional random seed, for repeatable runs
+        """
+        self.vehicle_id = vehicle_id
+        self.schema = schema or FleetSchema()
+        self.rng = random.Random(seed if seed is not None else vehicle_id)
+        self.states = {key: 1 for key, _ in self.schema.status_fields}
+        self.texts = {"Status_messages": "waiting", "Last_messages": "", "Missions": "no mission", "Modems": "idle"}
+        self.depth = 0.0
+        self.target_depth = 0.0
+        self.heading = self.rng.uniform(0, 360)
+        self.battery = self.rng.uniform(85, 100)
+        self.mission_running = False
+        self.shut_down = False
+        #simulation time (s) until which the link is down
+        self.link_down_until = 0.0
+        self.time = 0.0
+        #console lines waiting to go out with the next status message
+        self.console = []
+
+    def step(self, dt, console_rate=0.5):
+        """
+        Advances the coug by dt seconds.
+
+        Parameters:
+            dt (float): seconds since the last step
+            console_rate (float): average console lines per second
+        """
+        self.time += dt
+        rng = self.rng
+        if self.shut_down:
+            return
+        if self.mission_running:
+            self.depth += (self.target_depth - self.depth) * min(1.0, dt * 0.2)
+            self.heading = (self.heading + rng.gauss(0, 2) * dt) % 360
+            self.battery = max(0.0, self.battery - 0.01 * dt)
+        else:
+            self.depth = max(0.0, self.depth - dt)
+        self.battery = max(0.0, self.battery - 0.001 * dt)
+
+        #connections flicker now and then, the modem more than the others
+        for key, flip_rate in (("Wifi_connections", 0.02), ("Radio_connections", 0.01), ("Modem_connections", 0.05)):
+            if key in self.states and rng.random() < flip_rate * dt:
+                self.states[key] = 1 if self.states[key] != 1 else rng.choice([0, 2])
+        if "Wifi_connections" in self.states and self.depth > 0.5:
+            #no wifi under water
+            self.states["Wifi_connections"] = 0
+        if "GPS_sensors" in self.states:
+            self.states["GPS_sensors"] = 1 if self.depth < 0.5 else 2
+        if "Battery_sensors" in self.states:
+            self.states["Battery_sensors"] = 1 if self.battery > 30 else (2 if self.battery > 15 else 0)
+
+        self.texts["Last_messages"] = f"depth {self.depth:.1f} m, heading {self.heading:.0f} deg, battery {self.battery:.0f}%"
+        if self.battery <= 15 and self.texts["Status_messages"] != "no connection":
+            self.texts["Status_messages"] = "waiting"
+
+        lines = console_rate * dt
+        while lines > 0:
+            if rng.random() < min(1.0, lines):
+                self.log(rng.choice(NORMAL_CONSOLE_LINES).format(
+                    satellites=rng.randint(5, 12), depth=self.depth, heading=self.heading,
+                    solve_ms=rng.randint(2, 40), range_m=rng.randint(20, 900)))
+            lines -= 1
+
+    #text is "SEVERITY: message", like the lines in NORMAL_CONSOLE_LINES
+    def log(self, text):
+        severity, message = text.split(": ", 1)
+        self.console.append((severity, message))
+
+    #takes the console lines waiting to be sent, or the oldest limit of them
+    def take_console(self, limit=None):
+        if limit is None or len(self.console) <= limit:
+            console, self.console = self.console, []
+        else:
+            console, self.console = self.console[:limit], self.console[limit:]
+        return console
+
+    #whether messages get through, commands included
+    def link_up(self):
+        return self.time >= self.link_down_until
+
+    #whether the coug sends status, a shut down coug is silent but still listens for system_reboot
+    def publishing(self):
+        return self.link_up() and not self.shut_down
+
+    def inject(self, kind, duration_s=10.0):
+        """
+        Parameters:
+            kind (str): "leak", "link_loss" or "node_crash"
+            duration_s (float): how long a link loss lasts
+        """
+        if kind == "leak":
+            if "Leak_sensors" in self.states:
+                self.states["Leak_sensors"] = 0
+            self.texts["Status_messages"] = "no connection" if self.depth > 0.5 else "waiting"
+            self.log("ERROR: Leak detected in the main hull, surfacing")
+            self.mission_running = False
+            self.target_depth = 0.0
+        elif kind == "link_loss":
+            self.link_down_until = self.time + duration_s
+        elif kind == "node_crash":
+            nodes = [key for key, _ in self.schema.nodes if self.states.get(key) == 1]
+            if nodes:
+                key = self.rng.choice(nodes)
+                self.states[key] = 0
+                self.log(f"ERROR: {self.schema.labels[key]} node crashed")
+        else:
+            raise ValueError(f"unknown fault {kind!r}, expected one of {FAULT_KINDS}")
+
+    def handle_command(self, name):
+        """
+        Carries out a command from the GUI.
+
+        Returns (accepted, detail) for the ack.
+        """
+        if self.shut_down and name != "system_reboot":
+            return False, "shut down"
+        if name in MISSION_COMMANDS:
+            if name == "start_mission":
+                if self.states.get("Leak_sensors") == 0:
+                    return False, "leak detected"
+                self.mission_running = True
+                self.target_depth = self.rng.uniform(5, 30)
+                self.texts["Status_messages"] = "running"
+                self.texts["Missions"] = "survey running"
+            elif name == "load_mission":
+                self.texts["Missions"] = "survey loaded"
+            else:
+                self.mission_running = False
+                self.target_depth = 0.0
+                self.texts["Status_messages"] = "waiting"
+                self.texts["Missions"] = MISSION_COMMANDS[name]
+            self.log(f"INFO: {MISSION_COMMANDS[name].capitalize()}")
+            return True, MISSION_COMMANDS[name]
+        if name in SYSTEM_COMMANDS:
+            if name == "emergency_shutdown":
+                self.shut_down = True
+                self.mission_running = False
+                for key, _ in self.schema.nodes:
+                    self.states[key] = 0
+            elif name in ("system_reboot", "restart_pi"):
+                self.shut_down = False
+                for key, _ in self.schema.nodes:
+                    self.states[key] = 1
+            elif name == "deactivate_dvl" and "DVL_sensors" in self.states:
+                self.states["DVL_sensors"] = 2
+            self.log(f"WARNING: {SYSTEM_COMMANDS[name].capitalize()}")
+            return True, SYSTEM_COMMANDS[name]
+        return False, f"unknown command {name!r}"
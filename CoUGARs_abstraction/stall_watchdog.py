@@ -0,0 +1,170 @@
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque, namedtuple
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+#one freeze of the GUI thread: when it started, how long it lasted, where the GUI thread
+#was most of the time (its most sampled site), that site's stack, and how many stack samples were taken
+StallEvent = namedtuple("StallEvent", ["start_ns", "duration_ms", "site", "stack", "samples"])
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class StallSite:
+    __slots__ = ("site", "count", "total_ms", "max_ms", "stack")
+
+    def __init__(self, site):
+        self.site = site
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.stack = ""
+
+
+class StallWatchdog(QObject):
+    """
+    Notices when the GUI thread stops running its event loop, and finds out what it is
+    doing instead.
+
+    A thread of its own posts a ping to the event loop every interval_ms, and the GUI
+    thread answers it as soon as it gets back to the loop. While a ping is unanswered for
+    longer than threshold_ms, the GUI thread's python stack is sampled every sample_ms
+    through sys._current_frames. When the answer finally comes, the stall is logged with
+    its duration and the stack of the site it was sampled at most, and added to the
+    "top stall sites" report. The site is the innermost frame in this package, so a stall
+    in Qt code called from refresh_cell is put on that line. A modal dialog's exec (e.g.
+    AbortMissionsDialog) is not a stall: its nested event loop keeps answering pings.
+
+    The GUI thread only answers pings, the sampling and logging happen on the watchdog thread.
+    """
+
+    _ping = pyqtSignal(object)
+
+    def __init__(self, threshold_ms=100, interval_ms=20, sample_ms=25, log=print, max_events=100, parent=None):
+        """
+        Creates the watchdog. Must be called from the GUI thread.
+
+        Parameters:
+            threshold_ms (float): an event loop round trip longer than this is a stall
+            interval_ms (float): time between pings
+            sample_ms (float): time between stack samples during a stall
+            log (function): called with the text of every stall, on the watchdog thread
+            max_events (int): how many of the latest stalls are kept in self.events
+            parent (QObject): optional Qt parent
+        """
+        super().__init__(parent)
+        self.threshold_ns = int(threshold_ms * 1e6)
+        self.interval_s = interval_ms / 1000
+        self.sample_s = sample_ms / 1000
+        self.log = log
+        self.gui_thread_id = threading.get_ident()
+        self._ping.connect(self._pong, Qt.ConnectionType.QueuedConnection)
+
+        self._lock = threading.Lock()
+        #send time of the unanswered ping, and when the GUI thread answered it
+        self._ping_ns = None
+        self._pong_ns = None
+        #stack samples of the current stall
+        self._samples = []
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.events = deque(maxlen=max_events)
+        #site -> StallSite
+        self.sites = {}
+        self.stall_count = 0
+        self.stalled_ms = 0.0
+        self.pings = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    #runs on the GUI thread
+    def _pong(self, ping_ns):
+        pong_ns = time.perf_counter_ns()
+        with self._lock:
+            if ping_ns == self._ping_ns:
+                self._pong_ns = pong_ns
+
+    def _run(self):
+        while not self._stop.wait(self.sample_s if self._samples else self.interval_s):
+            now_ns = time.perf_counter_ns()
+            with self._lock:
+                ping_ns, pong_ns = self._ping_ns, self._pong_ns
+                if ping_ns is None or pong_ns is not None:
+                    self._ping_ns, self._pong_ns = now_ns, None
+            if ping_ns is None:
+                self._send_ping(now_ns)
+            elif pong_ns is not None:
+                if pong_ns - ping_ns >= self.threshold_ns:
+                    self._record_stall(ping_ns, pong_ns)
+                self._samples = []
+                self._send_ping(now_ns)
+            elif now_ns - ping_ns >= self.threshold_ns:
+                self._sample()
+
+    def _send_ping(self, ping_ns):
+        self.pings += 1
+        self._ping.emit(ping_ns)
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.gui_thread_id)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame)
+        del frame
+        self._samples.append((self.site_of(stack), stack))
+
+    #innermost frame of the stack in this package, the innermost frame of all when there is none
+    @staticmethod
+    def site_of(stack):
+        for frame in reversed(stack):
+            if frame.filename.startswith(PACKAGE_DIR):
+                break
+        else:
+            frame = stack[-1]
+        return f"{frame.name} ({os.path.basename(frame.filename)}:{frame.lineno})"
+
+    def _record_stall(self, ping_ns, pong_ns):
+        duration_ms = (pong_ns - ping_ns) / 1e6
+        if self._samples:
+            site = Counter(site for site, _ in self._samples).most_common(1)[0][0]
+            stack = "".join(next(stack for sample_site, stack in reversed(self._samples) if sample_site == site).format())
+        else:
+            #the GUI thread got back to the loop before the first sample
+            site, stack = "unknown (not sampled)", ""
+        event = StallEvent(ping_ns, duration_ms, site, stack, len(self._samples))
+
+        with self._lock:
+            self.events.append(event)
+            self.stall_count += 1
+            self.stalled_ms += duration_ms
+            stall_site = self.sites.get(site)
+            if stall_site is None:
+                stall_site = self.sites[site] = StallSite(site)
+            stall_site.count += 1
+            stall_site.total_ms += duration_ms
+            stall_site.max_ms = max(stall_site.max_ms, duration_ms)
+            stall_site.stack = stack
+        if self.log:
+            self.log(f"GUI thread stalled for {duration_ms:.0f} ms in {site}, {len(self._samples)} stack sample(s):\n{stack}")
+
+    def top_sites(self, count=10):
+        with self._lock:
+            return sorted(self.sites.values(), key=lambda site: site.total_ms, reverse=True)[:count]
+
+    def report(self, count=10):
+        lines = [f"{self.stall_count} stall(s) over {self.threshold_ns / 1e6:.0f} ms, {self.stalled_ms:.0f} ms in total"]
+        for site in self.top_sites(count):
+            lines.append(f"  {site.total_ms:8.0f} ms  {site.count:4d}x  max {site.max_ms:6.0f} ms  {site.site}")
+        return "\n".join(lines)
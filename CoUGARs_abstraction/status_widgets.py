@@ -0,0 +1,89 @@
+from PyQt6.QtWidgets import QWidget, QLabel, QHBoxLayout
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont, QPalette, QColor
+
+
+class StatusIndicator(QWidget):
+    """
+    An icon next to a text label, e.g. the check/x next to "Wifi".
+
+    The icon and text are changed in place with set_state() and set_text(), so updates
+    never rebuild widgets. The icon label has a fixed size, so swapping its pixmap does
+    not trigger a relayout, and setting the same state or text again is a no-op.
+    """
+
+    ICON_SIZE = 16
+
+    def __init__(self, text, icon_cache, state=None, temp_tab_spacing=None, parent=None):
+        """
+        Parameters:
+            text (str): text shown next to the icon
+            icon_cache (IconCache): shared cache of the pre-rendered state pixmaps
+            state (int): initial state, 0->negative, 1->positive, 2->waiting
+            temp_tab_spacing (int): optional left indent
+            parent (QWidget): optional Qt parent
+        """
+        super().__init__(parent)
+        self.icon_cache = icon_cache
+        self._state = None
+
+        temp_layout = QHBoxLayout(self)
+        if temp_tab_spacing:
+            temp_layout.setContentsMargins(temp_tab_spacing, 0, 0, 0)
+        temp_layout.setSpacing(20)
+
+        self.icon_label = QLabel()
+        self.icon_label.setContentsMargins(0, 0, 0, 0)
+        self.icon_label.setFixedSize(self.ICON_SIZE, self.ICON_SIZE)
+        temp_layout.addWidget(self.icon_label, alignment=Qt.AlignmentFlag.AlignVCenter)
+
+        self.text_label = QLabel(text)
+        self.text_label.setFont(QFont("Arial", 13))
+        self.text_label.setContentsMargins(0, 0, 0, 0)
+        temp_layout.addWidget(self.text_label, alignment=Qt.AlignmentFlag.AlignVCenter)
+
+        if state is not None:
+            self.set_state(state)
+
+    def state(self):
+        return self._state
+
+    def set_state(self, state):
+        if state == self._state:
+            return
+        self._state = state
+        self.refresh_icon()
+
+    #re-reads the pixmap from the icon cache, e.g. after the cache was invalidated by a screen change
+    def refresh_icon(self):
+        if self._state is not None:
+            self.icon_label.setPixmap(self.icon_cache.pixmap(self._state, self.ICON_SIZE, self.devicePixelRatioF()))
+
+    def set_text(self, text):
+        if text != self.text_label.text():
+            self.text_label.setText(text)
+
+    def text(self):
+        return self.text_label.text()
+
+
+class StatusLabel(QLabel):
+    """
+    A text label whose text and color are changed in place.
+
+    The color goes through the palette rather than a style sheet, so changing it does
+    not re-polish the widget.
+    """
+
+    def set_text(self, text, color=None):
+        if text != self.text():
+            self.setText(text)
+        if color is not None:
+            self.set_color(color)
+
+    def set_color(self, color):
+        palette = self.palette()
+        if palette.color(QPalette.ColorRole.WindowText) == QColor(color):
+            return
+        palette.setColor(QPalette.ColorRole.WindowText, QColor(color))
+        self.setPalette(palette)
@@ -1,68 +1,76 @@
 import sys 
 import random
+import time
 from PyQt6.QtWidgets import (QScrollArea, QApplication, QMainWindow, 
     QWidget, QPushButton, QTabWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame,
-    QSizePolicy, QSpacerItem, QGridLayout, QStyle, QWidget, QDialog, QDialogButtonBox
+    QSizePolicy, QSpacerItem, QGridLayout, QStyle, QWidget, QDialog, QDialogButtonBox,
+    QLineEdit, QComboBox
 )
-from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtCore import QSize, Qt, QTimer
 from PyQt6.QtGui import QColor, QPalette, QFont, QPixmap, QKeySequence,QShortcut
 
+from testing_turtle_gui.ros_bridge import RosQtBridge
+from testing_turtle_gui.update_scheduler import UpdateScheduler
+from testing_turtle_gui.widget_registry import WidgetRegistry
+from testing_turtle_gui.status_widgets import StatusIndicator, StatusLabel
+from testing_turtle_gui.icon_cache import IconCache
+from testing_turtle_gui.fleet_tab_bar import FleetTabBar, TAB_STYLE_SHEET
+from testing_turtle_gui.fleet_schema import FleetSchema
+from testing_turtle_gui.console_log import ConsoleLogModel, ConsoleLogView, make_entry, SEVERITIES
+from testing_turtle_gui.console_search import ConsoleSearchIndex
+from testing_turtle_gui.telemetry_codec import StatusDecoder
+from testing_turtle_gui.command_pipeline import CommandTracker, parse_ack, is_command, PENDING, ACKED
+from testing_turtle_gui.perf_probes import probe
+from testing_turtle_gui.perf_overlay import PerfOverlay
+from testing_turtle_gui.telemetry_latency import TelemetryLatency
+
 class MainWindow(QMainWindow):
     # Initializes GUI window with a ros node inside
-    def __init__(self, ros_node):
+    def __init__(self, ros_node, fleet_schema=None):
         """
         Initializes GUI window with a ros node inside
 
         Parameters:
             ros_node (node): node passed in from ros in order to access the publisher
+            fleet_schema (FleetSchema): the vehicles and fields to show, defaults to Cougs 1-3
         """
         
         super().__init__()
         self.ros_node = ros_node
+        self.fleet_schema = fleet_schema or FleetSchema()
+        #ros callbacks go through the bridge so that widgets are only touched on the GUI thread
+        self.ros_bridge = RosQtBridge(self.recieve_message, parent=self)
+        #changes to feedback_dict are marked dirty here and drawn once per frame (30 Hz cap)
+        self.update_scheduler = UpdateScheduler(self.refresh_cell, max_hz=30, parent=self)
+        #end to end latency of the fleet status, from the vehicle's stamp to the paint, see telemetry_latency
+        self.telemetry_latency = TelemetryLatency(parent=self)
+        self.update_scheduler.frame_applied.connect(self.telemetry_latency.frame_applied)
+        self.installEventFilter(self.telemetry_latency)
+        #(field, coug, page) -> live widget handles, filled in as the pages are built
+        self.widget_registry = WidgetRegistry()
         self.setWindowTitle("CoUGARS_GUI")
         scale = 300  # dev usage for manually scaling the window
         self.resize(QSize(4 * scale, 3 * scale))
 
         ###This is how the coug info gets into the GUI
-        self.feedback_dict = {
-            #0->negative, 1->positive, 2->waiting
-            #Cougs 1-3 connections
-            "Wifi_connections": {1: 0, 2: 1, 3: 2},
-            "Radio_connections": {1: 0, 2: 0, 3: 0},
-            "Modem_connections": {1: 0, 2: 0, 3: 0},
-
-            #0->negative, 1->positive, 2->waiting
-            #Cougs 1-3 sensors
-            "Modem_sensors": {1: 0, 2: 0, 3: 0},
-            "DVL_sensors": {1: 0, 2: 0, 3: 0},
-            "GPS_sensors": {1: 2, 2: 1, 3: 0},
-            "IMU_sensors": {1: 0, 2: 0, 3: 0},
-            "Leak_sensors": {1: 0, 2: 2, 3: 1},
-            "Battery_sensors": {1: 0, 2: 0, 3: 0},
-
-            #0->negative, 1->positive, 2->waiting
-            #Cougs 1-3 nodes
-            "Safety_Monitoring_nodes": {1: 0, 2: 0, 3: 0},
-            "Depth_Controller_nodes": {1: 0, 2: 0, 3: 0},
-            "Heading_Controller_nodes": {1: 0, 2: 0, 3: 0},
-            "Factor_Graph_nodes": {1: 0, 2: 0, 3: 0},
-            "Modem_Timing_nodes": {1: 0, 2: 0, 3: 0},
-
-            #Cougs 1-3 status messages
-            "Status_messages": {1: "", 2: "", 3: ""},
-
-            #Cougs 1-3 last messages
-            "Last_messages": {1: "", 2: "", 3: ""},
-
-            #Cougs 1-3 message logs, lists of strings
-            "Console_messages": {1: [], 2: [], 3: []},
-
-            #Cougs 1-3 message logs, lists of strings
-            "Missions": {1: "", 2: "", 3: ""},            
-            
-            #Cougs 1-3 message logs, lists of strings
-            "Modems": {1: "", 2: "", 3: ""},
-        }
+        #{field: {coug_number: value}}, generated from the fleet schema
+        #status fields: 0->negative, 1->positive, 2->waiting
+        #Status_messages/Last_messages/Missions/Modems: strings, Console_messages: ring buffers of ConsoleEntry
+        self.feedback_dict = self.fleet_schema.make_feedback_dict()
+        #list models over the console ring buffers, created when a coug tab first shows its console
+        self.console_models = {}
+        #decodes the binary fleet status messages, used on the ros thread by MinimalSubscriber
+        self.status_decoder = StatusDecoder(self.fleet_schema)
+        #search index over every retained console line, lines leave it when their ring buffer drops them
+        self.console_index = ConsoleSearchIndex()
+        for buffer in self.feedback_dict["Console_messages"].values():
+            buffer.on_evict = self.console_index.remove
+        #commands from the buttons get an id and are resent until the vehicles ack them
+        self.command_tracker = CommandTracker(self.send_command, parent=self)
+        self.command_tracker.command_changed.connect(self.show_command_state)
+        #the commands sent by the last button press, their state is shown in confirm_reject_label
+        self.label_commands = []
+        self.label_title = ""
 
         #This is a dictionary to map the feedback_dict to the correct symbols
         #"x" symbol -> SP_DialogNoButton
@@ -73,21 +81,30 @@ class MainWindow(QMainWindow):
             1: QStyle.StandardPixmap.SP_DialogYesButton,
             2: QStyle.StandardPixmap.SP_TitleBarContextHelpButton
         }
+        #the icons are rasterized once here instead of every time a status widget changes
+        self.icon_cache = IconCache(self.icons_dict, self.style())
+        self.icon_cache.prefill([StatusIndicator.ICON_SIZE], self.devicePixelRatioF())
 
         #Create the tabs
         self.tabs = QTabWidget()
+        #the tab widths are set through the tab bar, so the style sheet only has to be parsed once
+        self.tab_bar = FleetTabBar()
+        self.tabs.setTabBar(self.tab_bar)
+        self.tabs.setStyleSheet(TAB_STYLE_SHEET)
+        #resize events are debounced, the tabs are resized once the window stops changing size
+        self.tab_resize_timer = QTimer(self)
+        self.tab_resize_timer.setSingleShot(True)
+        self.tab_resize_timer.setInterval(30)
+        self.tab_resize_timer.timeout.connect(lambda: self.resizeTabs(self.width() // 4))
         #Orient the tabs at the tob of the screen
         self.tabs.setTabPosition(QTabWidget.TabPosition.North)
         #The tabs' order can't be changed or moved
         self.tabs.setMovable(False)
 
-        #Placeholders for the tabs layout, to be accessed later. 
-        self.tab_dict = {
-            "General": [None, QHBoxLayout()],
-            "Coug 1": [None, QHBoxLayout()],
-            "Coug 2": [None, QHBoxLayout()],
-            "Coug 3": [None, QHBoxLayout()]
-        }
+        #Placeholders for the tabs layout, to be accessed later. One tab per vehicle in the fleet
+        self.tab_dict = {"General": [None, QHBoxLayout()]}
+        for coug_number in self.fleet_schema.vehicle_ids:
+            self.tab_dict[f"Coug {coug_number}"] = [None, QHBoxLayout()]
 
         #create the widgets from the tab dict, assign layouts, and add each to self.tabs
         for name in self.tab_dict:
@@ -113,12 +130,9 @@ class MainWindow(QMainWindow):
 
         #Set up the first tab- the general page
         self.set_general_page_widgets()
-        #Set up the second tab - the first coug
-        self.set_specific_coug_widgets(1)
-        #Set up the third tab - the second coug
-        self.set_specific_coug_widgets(2)
-        #Set up the fourth tab - the third coug
-        self.set_specific_coug_widgets(3)
+        #The coug tabs are built the first time they are opened, from whatever is in feedback_dict at that point
+        self.built_coug_tabs = set()
+        self.tabs.currentChanged.connect(self.build_coug_tab_if_needed)
 
         #Emergency exit GUI button
         self.emergency_exit_gui_button = QPushButton("Close GUI")
@@ -133,6 +147,16 @@ class MainWindow(QMainWindow):
         shortcut = QShortcut(QKeySequence("Ctrl+C"), self)
         shortcut.activated.connect(self.close)
 
+        #set by whoever starts a stall_watchdog.StallWatchdog for this window, its top stall sites show in the overlay
+        self.stall_watchdog = None
+        #Ctrl+Shift+P shows the performance overlay, see perf_probes for turning the probes on
+        self.perf_overlay = PerfOverlay(self)
+        perf_shortcut = QShortcut(QKeySequence("Ctrl+Shift+P"), self)
+        perf_shortcut.activated.connect(self.perf_overlay.toggle)
+        #Ctrl+Shift+E writes the latency histograms to a json file in the working directory
+        latency_shortcut = QShortcut(QKeySequence("Ctrl+Shift+E"), self)
+        latency_shortcut.activated.connect(self.export_latency)
+
         #The overall layout is vertical
         self.main_layout = QVBoxLayout()
         #Add the tabs to the main layout
@@ -151,6 +175,20 @@ class MainWindow(QMainWindow):
         #the container with the main layout is set as teh central widget
         self.setCentralWidget(self.container)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        #the window handle only exists once the window is shown
+        if not getattr(self, "_screen_change_connected", False):
+            self.windowHandle().screenChanged.connect(self.screen_changed)
+            self._screen_change_connected = True
+
+    #the device pixel ratio can change with the screen, so the cached icons are rasterized again
+    def screen_changed(self, screen):
+        self.icon_cache.invalidate(self.style())
+        self.icon_cache.prefill([StatusIndicator.ICON_SIZE], self.devicePixelRatioF())
+        for widget in self.findChildren(StatusIndicator):
+            widget.refresh_icon()
+
     #function to close the GUI window(s). Used by the keyboard interrupt signal or the exit button
     def close_window(self):
         print("closing the window now...")
@@ -189,81 +227,104 @@ class MainWindow(QMainWindow):
         # self.print_all_widgets_in_layout(self.general_page_C1_layout)
 
         random_messages = ["running", "no connection", "waiting", "garbage data"]
+        random_console_messages = [
+            "INFO: Waiting for surface command acknowledgment",
+            "WARNING: Depth sensor value out of expected range",
+            "ERROR: Manipulator arm failed to extend",
+            "DVL reports bottom lock achieved",
+        ]
+        for coug_number in self.fleet_schema.vehicle_ids:
+            self.append_console_message(coug_number, random.choice(random_console_messages))
 
         for key, value in self.feedback_dict.items():
             if key in ["Status_messages", "Last_messages"]:
-                for coug_number, data in value.items():
+                for coug_number in value:
                     random_int = random.randint(0,3)
-                    self.feedback_dict[key][coug_number] = random_messages[random_int]
-                    status_color, _ = self.get_status_message_color(random_messages[random_int])
-                    new_label = QLabel(random_messages[random_int])
-                    layout = getattr(self, f"general_page_C{coug_number}_layout")
-                    widget = getattr(self, f"general_page_C{coug_number}_widget")
-                    self.replace_label(f"{key}{coug_number}", layout, widget, new_label, color=status_color)
-            else:
-                for coug_number, data in value.items():
-                    random_int = random.randint(0,2)
-                    self.feedback_dict[key][coug_number] = random_int
-                    prefix = key.split("_")[0]
-                    new_label = self.create_icon_and_text(prefix, self.icons_dict[self.feedback_dict[key][coug_number]], self.tab_spacing)
-                    layout = getattr(self, f"general_page_C{coug_number}_layout")
-                    widget = getattr(self, f"general_page_C{coug_number}_widget")
-                    self.replace_label(f"{key}{coug_number}", layout, widget, new_label)
-
-    #in order to replace a label, you must know the widgets name, the parent layout, and the parent widget
-    def replace_label(self, widget_name, parent_layout, parent_widget, new_label, color=""):
-        """
-        Replaces a label inside of the GUI
-
-        Parameters:
-            widget_name: the name of the widget to be changed
-            parent_layout: the parent layout of the widget to be changed
-            parent_widget: the parent widget of the widget to be changed
-            new_label: the new text/icon the label will be changed to
-            color: optional color to change the label to
-        """
-
-        temp_widget = parent_widget.findChild(QWidget, widget_name)
-        if temp_widget:
-            #the index of the widget in respect to its parent layout
-            index = parent_layout.indexOf(temp_widget)
+                    self.set_feedback(key, coug_number, random_messages[random_int])
+            elif key.endswith(("_connections", "_sensors", "_nodes")):
+                for coug_number in value:
+                    self.set_feedback(key, coug_number, random.randint(0,2))
+
+    #adds a line to a coug's console log, the oldest line is dropped once the retention cap is reached
+    def append_console_message(self, coug_number, text, severity=None, stamp=None):
+        entry = make_entry(coug_number, text, severity, stamp)
+        self.console_index.add(entry)
+        model = self.console_models.get(coug_number)
+        if model:
+            model.append(entry)
         else:
-            print("widget_name not found")
+            self.feedback_dict["Console_messages"][coug_number].append(entry)
+        return entry
+
+    #filter-as-you-type for a coug's console, the results come from the search index
+    def filter_console(self, coug_number, filter_edit, severity_box, console_view):
+        text = filter_edit.text().strip()
+        severity = severity_box.currentText()
+        severity = None if severity == "All" else severity
+        if not text and severity is None:
+            console_view.show_entries(None)
             return
+        results = self.console_index.search(text, severity=severity, vehicle=coug_number)
+        #the index returns the newest lines first, the console reads top to bottom
+        results.reverse()
+        terms = text.lower().split()
+        console_view.show_entries(results, lambda entry: self.console_index.matches(entry, terms, severity, coug_number))
+
+    #empties every coug's console log and takes the lines out of the search index
+    def clear_consoles(self):
+        for coug_number, buffer in self.feedback_dict["Console_messages"].items():
+            model = self.console_models.get(coug_number)
+            if model:
+                model.clear()
+            else:
+                buffer.clear()
+
+    def console_model(self, coug_number):
+        model = self.console_models.get(coug_number)
+        if model is None:
+            model = ConsoleLogModel(self.feedback_dict["Console_messages"][coug_number], parent=self)
+            self.console_models[coug_number] = model
+        return model
+
+    #writes a value into feedback_dict, the widgets are redrawn by the update scheduler on the next frame
+    def set_feedback(self, key, coug_number, value):
+        self.feedback_dict[key][coug_number] = value
+        self.update_scheduler.mark_dirty(key, coug_number)
+
+    #updates the widgets of one feedback_dict cell in place on every page it is shown on, called by the update scheduler
+    @probe()
+    def refresh_cell(self, key, coug_number):
+        value = self.feedback_dict[key][coug_number]
+        for handle in self.widget_registry.handles_for(key, coug_number).values():
+            if key == "Status_messages":
+                status_color, status = self.get_status_message_color(value)
+                handle.widget.set_text(status, status_color)
+            elif key == "Last_messages":
+                status_color, _ = self.get_status_message_color(value)
+                handle.widget.set_text(value, status_color)
+            else:
+                handle.widget.set_state(value)
 
-        parent_layout.removeWidget(temp_widget)
-        #set parent to none so that it doesn't have any lingering consequences
-        temp_widget.setParent(None)
-
-        #The new label has the same name as the old one, so that it can be changed again
-        new_label.setObjectName(widget_name)
-        #set the optional color, if there wasn't a color passed, then it doesn't change anything
-        new_label.setStyleSheet(f"color: {color};")
-        #insert the new widget in the same index as the old one was, so the order of the text doesn't
-        parent_layout.insertWidget(index, new_label)
-
-    def find_label(self, widget_name, parent_layout, parent_widget):
+    def find_label(self, key, coug_number, page="General"):
         """
-        Used by replace label to find a specific label in a layout
+        Looks up the text of a label in the widget registry
 
         Parameters:
-            widget_name: the name of the widget to be changed
-            parent_layout: the parent layout of the widget to be changed
-            parent_widget: the parent widget of the widget to be changed
+            key: the feedback_dict key of the label
+            coug_number: which Coug the label belongs to
+            page: which page the label is on ("General" or "Coug")
         """
 
-        temp_widget = parent_widget.findChild(QWidget, widget_name)
-        if temp_widget:
-            index = parent_layout.indexOf(temp_widget)
-            if isinstance(temp_widget, QLabel):
-                label_text = temp_widget.text()
-                print("Label text:", label_text)
-                return label_text
-            else:
-                print(f"{widget_name} is not a QLabel")
-        else:
-            print("widget_name not found")
+        handle = self.widget_registry.get(key, coug_number, page)
+        if handle is None:
+            print(f"{key}{coug_number} not found on the {page} page")
             return None
+        if isinstance(handle.widget, QLabel):
+            label_text = handle.widget.text()
+            print("Label text:", label_text)
+            return label_text
+        print(f"{key}{coug_number} is not a QLabel")
+        return None
 
     def get_status_message_color(self, message):
         if message.lower() == "running": message_color = "green"
@@ -278,29 +339,18 @@ class MainWindow(QMainWindow):
         return message_color, message
 
     "/*Override the resizeEvent method in the sub class*/"
+    @probe()
     def resizeEvent(self, event):
-        size = self.size()
-        width_px = self.width() // 4
-        self.resizeTabs(width_px)
+        if self.tab_bar.tab_width() is None:
+            #the window is being shown for the first time, size the tabs right away
+            self.resizeTabs(self.width() // 4)
+        else:
+            self.tab_resize_timer.start()
         super().resizeEvent(event)  # Call the base class method after doing custom resizing
 
     "/*resize the tabs according to the width of the window*/"
     def resizeTabs(self, width_px):
-        self.tabs.setStyleSheet(f"""
-        QTabBar::tab {{
-            height: 30px;
-            width: {width_px - 15}px;
-            font-size: 12pt;
-            padding: 5px;
-            background: lightgray;  /* background color of non-selected tab */
-            color: black;           /* font color of non-selected tab */
-        }}
-        QTabBar::tab:selected {{
-            background: blue;       /* background color of selected tab */
-            color: white;           /* font color of selected tab */
-            font-weight: bold;
-        }}
-        """)
+        self.tab_bar.set_tab_width(width_px - 15)
 
     def set_background(self, widget, color):
         palette = widget.palette()
@@ -308,26 +358,49 @@ class MainWindow(QMainWindow):
         widget.setAutoFillBackground(True)
         widget.setPalette(palette)
 
+    #sends a command to the vehicles (all of them by default), confirm_reject_label follows their acks
+    def send_fleet_command(self, name, text, vehicle_ids=None):
+        if vehicle_ids is None:
+            vehicle_ids = self.fleet_schema.vehicle_ids
+        self.label_title = text
+        self.label_commands = self.command_tracker.submit(vehicle_ids, name, text)
+        self.show_command_state()
+
+    #publishes a batch of commands (one attempt each) on the vehicles' coug{n}/cmd topics, called by the command tracker
+    def send_command(self, commands):
+        if self.ros_node:
+            self.ros_node.publish_commands([(command.vehicle_id, command.encode()) for command in commands])
+
+    #returns a button callback that sends one command to one coug
+    def coug_command(self, coug_number, name, text):
+        return lambda: self.send_fleet_command(name, f"{text} (Coug {coug_number})...", [coug_number])
+
+    def show_command_state(self, command=None):
+        if command is not None and command not in self.label_commands:
+            return
+        states = ", ".join(command.describe() for command in self.label_commands)
+        self.confirm_reject_label.setText(f"{self.label_title} {states}")
+        #red once every vehicle answered and at least one didn't ack
+        failed = any(command.state not in (PENDING, ACKED) for command in self.label_commands)
+        done = all(command.state != PENDING for command in self.label_commands)
+        self.confirm_reject_label.setStyleSheet("color: red" if failed and done else "")
+
     def load_coug1_missions_button(self):
-        self.confirm_reject_label.setText("Loading Coug 1 mission...")
-        self.publish_from_gui("Loading the missions...")
+        self.send_fleet_command("load_mission", "Loading Coug 1 mission...", [1])
 
     def load_missions_button(self):
         #add load missions logic
-        self.confirm_reject_label.setText("Loading the missions...")
-        self.publish_from_gui("Loading the missions...")
+        self.send_fleet_command("load_mission", "Loading the missions...")
         # print("Loading the missions...")
 
     def start_missions_button(self):
         #add start missions logic
-        self.confirm_reject_label.setText("Starting the missions...")
-        self.publish_from_gui("Starting the missions...")
+        self.send_fleet_command("start_mission", "Starting the missions...")
         # print("Starting the missions...")
 
     def recallCougs(self):
         #add recall cougs logic
-        self.confirm_reject_label.setText("Recalling the Cougs...")
-        self.publish_from_gui("Recalling the Cougs...")
+        self.send_fleet_command("recall", "Recalling the Cougs...")
         # print("Recalling the Cougs...")
     
     def AbortAllMissions(self):
@@ -336,8 +409,7 @@ class MainWindow(QMainWindow):
 
         dlg = AbortMissionsDialog(self)
         if dlg.exec():
-            self.confirm_reject_label.setText("Aborting all missions...")
-            self.publish_from_gui("Aborting all missions...")
+            self.send_fleet_command("abort_mission", "Aborting all missions...")
         else:
             self.confirm_reject_label.setText("Canceling abort missions command...")
             # self.publish_from_gui("Canceling abort missions command...")
@@ -365,33 +437,72 @@ class MainWindow(QMainWindow):
         self.general_page_C0_widget = QWidget()
         self.general_page_C0_layout = QVBoxLayout()
         self.general_page_C0_widget.setLayout(self.general_page_C0_layout)
-        
-        self.general_page_C1_widget = QWidget()
-        self.general_page_C1_layout = QVBoxLayout()
-        self.general_page_C1_widget.setLayout(self.general_page_C1_layout)
-
-        self.general_page_C2_widget = QWidget()
-        self.general_page_C2_layout = QVBoxLayout()
-        self.general_page_C2_widget.setLayout(self.general_page_C2_layout)
 
-        self.general_page_C3_widget = QWidget()
-        self.general_page_C3_layout = QVBoxLayout()
-        self.general_page_C3_widget.setLayout(self.general_page_C3_layout)
+        #The vehicle columns are paged, only general_page_size of them exist at a time
+        overview_widget = QWidget()
+        overview_layout = QVBoxLayout(overview_widget)
+        overview_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.general_page_nav_widget = QWidget()
+        nav_layout = QHBoxLayout(self.general_page_nav_widget)
+        nav_layout.setContentsMargins(0, 0, 0, 0)
+        self.previous_vehicles_button = QPushButton("<")
+        self.previous_vehicles_button.clicked.connect(lambda: self.show_general_page(self.general_page_number - 1))
+        self.next_vehicles_button = QPushButton(">")
+        self.next_vehicles_button.clicked.connect(lambda: self.show_general_page(self.general_page_number + 1))
+        self.general_page_nav_label = QLabel()
+        self.general_page_nav_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        nav_layout.addWidget(self.previous_vehicles_button)
+        nav_layout.addWidget(self.general_page_nav_label)
+        nav_layout.addWidget(self.next_vehicles_button)
+        #no need for the arrows if the whole fleet fits on one page
+        self.general_page_nav_widget.setVisible(self.fleet_schema.general_page_count() > 1)
+
+        self.general_page_columns_widget = QWidget()
+        self.general_page_columns_layout = QHBoxLayout(self.general_page_columns_widget)
+        self.general_page_columns_layout.setContentsMargins(0, 0, 0, 0)
+
+        overview_layout.addWidget(self.general_page_nav_widget)
+        overview_layout.addWidget(self.general_page_columns_widget)
 
         # Add the container widget to the main layout
         self.general_page_layout.addWidget(self.general_page_C0_widget)
         self.general_page_layout.addWidget(self.make_vline())
-        self.general_page_layout.addWidget(self.general_page_C1_widget)
-        self.general_page_layout.addWidget(self.make_vline())
-        self.general_page_layout.addWidget(self.general_page_C2_widget)
-        self.general_page_layout.addWidget(self.make_vline())
-        self.general_page_layout.addWidget(self.general_page_C3_widget)
+        self.general_page_layout.addWidget(overview_widget, stretch=1)
 
         self.set_general_page_C0_widgets()
 
-        self.set_general_page_column_widgets(self.general_page_C1_layout, 1)
-        self.set_general_page_column_widgets(self.general_page_C2_layout, 2)
-        self.set_general_page_column_widgets(self.general_page_C3_layout, 3)
+        self.general_page_number = None
+        self.general_page_column_widgets = {}
+        self.show_general_page(0)
+
+    #tears down the vehicle columns of the general page and builds the ones for another page
+    def show_general_page(self, page):
+        page = max(0, min(page, self.fleet_schema.general_page_count() - 1))
+        if page == self.general_page_number:
+            return
+        self.general_page_number = page
+
+        for coug_number in self.general_page_column_widgets:
+            self.widget_registry.unregister_vehicle(coug_number, "General")
+        self.general_page_column_widgets = {}
+        while self.general_page_columns_layout.count():
+            item = self.general_page_columns_layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+
+        for i, coug_number in enumerate(self.fleet_schema.general_page_vehicles(page)):
+            if i:
+                self.general_page_columns_layout.addWidget(self.make_vline())
+            column_widget = QWidget()
+            column_layout = QVBoxLayout(column_widget)
+            self.set_general_page_column_widgets(column_layout, coug_number)
+            self.general_page_columns_layout.addWidget(column_widget)
+            self.general_page_column_widgets[coug_number] = column_widget
+
+        self.general_page_nav_label.setText(f"Vehicles page {page + 1} of {self.fleet_schema.general_page_count()}")
+        self.previous_vehicles_button.setEnabled(page > 0)
+        self.next_vehicles_button.setEnabled(page < self.fleet_schema.general_page_count() - 1)
 
     #set the widgets of the first column on the general page
     def set_general_page_C0_widgets(self):
@@ -437,6 +548,7 @@ class MainWindow(QMainWindow):
         self.general_page_C0_layout.addWidget(self.abort_all_missions)
             
     #template to set the rest of widgets on the rest of the columns on the general page
+    @probe()
     def set_general_page_column_widgets(self, layout, coug_number):
         # Create and style the header label
         title_label = QLabel(f"Coug {coug_number}:")
@@ -458,72 +570,61 @@ class MainWindow(QMainWindow):
 
             match title:
                 case "Connections": 
-                    wifi_widget = self.create_icon_and_text("Wifi", self.icons_dict[self.feedback_dict["Wifi_connections"][coug_number]], self.tab_spacing)
-                    wifi_widget.setObjectName(f"Wifi_connections{coug_number}")
-                    layout.addWidget(wifi_widget)
+                    for key, text in self.fleet_schema.connections:
+                        self.add_status_widget(layout, key, coug_number, "General", text, self.tab_spacing)
+                        layout.addSpacing(20)
                     layout.addSpacing(20)
 
-                    radio_widget = self.create_icon_and_text("Radio", self.icons_dict[self.feedback_dict["Radio_connections"][coug_number]], self.tab_spacing)
-                    radio_widget.setObjectName(f"Radio_connections{coug_number}")
-                    layout.addWidget(radio_widget)
-                    layout.addSpacing(20)
-
-                    modem_widget = self.create_icon_and_text("Modem", self.icons_dict[self.feedback_dict["Modem_connections"][coug_number]], self.tab_spacing)
-                    modem_widget.setObjectName(f"Modem_connections{coug_number}")
-                    layout.addWidget(modem_widget)
-                    layout.addSpacing(40)
-
                 case "Sensors":
-                    modem_sensor_widget = self.create_icon_and_text("Modem", self.icons_dict[self.feedback_dict["Modem_sensors"][coug_number]], self.tab_spacing)
-                    modem_sensor_widget.setObjectName(f"Modem_sensors{coug_number}")
-                    layout.addWidget(modem_sensor_widget)
-                    layout.addSpacing(20)
-
-                    DVL_sensor_widget = self.create_icon_and_text("DVL", self.icons_dict[self.feedback_dict["DVL_sensors"][coug_number]], self.tab_spacing)
-                    DVL_sensor_widget.setObjectName(f"DVL_sensors{coug_number}")
-                    layout.addWidget(DVL_sensor_widget)
+                    for key, text in self.fleet_schema.general_page_sensors:
+                        self.add_status_widget(layout, key, coug_number, "General", text, self.tab_spacing)
+                        layout.addSpacing(20)
                     layout.addSpacing(20)
 
-                    GPS_sensor_widget = self.create_icon_and_text("GPS", self.icons_dict[self.feedback_dict["GPS_sensors"][coug_number]], self.tab_spacing)
-                    GPS_sensor_widget.setObjectName(f"GPS_sensors{coug_number}")
-                    layout.addWidget(GPS_sensor_widget)
-                    layout.addSpacing(20)
-                    
-                    IMU_sensor_widget = self.create_icon_and_text("IMU", self.icons_dict[self.feedback_dict["IMU_sensors"][coug_number]], self.tab_spacing)
-                    IMU_sensor_widget.setObjectName(f"IMU_sensors{coug_number}")
-                    layout.addWidget(IMU_sensor_widget)
-                    layout.addSpacing(40)
-
                 case "Status":
                     status = self.feedback_dict["Status_messages"][coug_number]
 
                     status_color, status = self.get_status_message_color(status)
 
-                    label = QLabel(f"{status}", font=QFont("Arial", 13))
+                    label = StatusLabel(f"{status}", font=QFont("Arial", 13))
                     label.setObjectName(f"Status_messages{coug_number}")
-                    label.setStyleSheet(f"color: {status_color};")  # Change 'red' to any color you want (name, hex, rgb)
+                    label.set_color(status_color)  # Change 'red' to any color you want (name, hex, rgb)
                     # label.setIndent(self.tab_spacing)
                     layout.addWidget(label, alignment=Qt.AlignmentFlag.AlignTop)
+                    self.widget_registry.register("Status_messages", coug_number, "General", label, layout)
                     layout.addSpacing(40)
 
                 case "Last Message":
                     last_message = self.feedback_dict["Status_messages"][coug_number]
                     if last_message: 
-                        last_mesage_label = QLabel(self.feedback_dict["Last_messages"][coug_number], font=QFont("Arial", 13), alignment=Qt.AlignmentFlag.AlignTop)
+                        last_mesage_label = StatusLabel(self.feedback_dict["Last_messages"][coug_number], font=QFont("Arial", 13), alignment=Qt.AlignmentFlag.AlignTop)
                     else:
-                        last_mesage_label = QLabel("No messages have been recieved", font=QFont("Arial", 13), alignment=Qt.AlignmentFlag.AlignTop)
-                        last_mesage_label.setStyleSheet(f"color: orange;")
+                        last_mesage_label = StatusLabel("No messages have been recieved", font=QFont("Arial", 13), alignment=Qt.AlignmentFlag.AlignTop)
+                        last_mesage_label.set_color("orange")
 
                     last_mesage_label.setObjectName(f"Last_messages{coug_number}")
                     
                     # last_mesage_label.setIndent(self.tab_spacing)
                     layout.addWidget(last_mesage_label)
+                    self.widget_registry.register("Last_messages", coug_number, "General", last_mesage_label, layout)
                     layout.addSpacing(40)
 
         # Add spacer to push content up
         spacer = QSpacerItem(0, 0, QSizePolicy .Policy.Minimum, QSizePolicy.Policy.Expanding)
         layout.addItem(spacer)
 
+    #builds a coug tab the first time it is opened
+    def build_coug_tab_if_needed(self, index):
+        name = self.tabs.tabText(index)
+        if not name.startswith("Coug "):
+            return
+        coug_number = int(name.split(" ")[1])
+        if coug_number in self.built_coug_tabs:
+            return
+        self.built_coug_tabs.add(coug_number)
+        self.set_specific_coug_widgets(coug_number)
+
+    @probe()
     def set_specific_coug_widgets(self, coug_number):
         #dynamic layout name is now set to QHBoxLayout() from the tab dictionary
         setattr(self, f"coug{coug_number}layout", self.tab_dict[f"Coug {coug_number}"][1])
@@ -554,79 +655,27 @@ class MainWindow(QMainWindow):
         title_label.setAlignment(Qt.AlignmentFlag.AlignHCenter)
         temp_layout.addWidget(title_label)
 
-        # Second text label (wrapped long message)
-        message_text = (
-            "Welcome to the advanced testing log for your GUI layout system. This message is designed to span a significant "
-            "number of lines to ensure that your scrollable area handles content overflow gracefully. Each sentence contributes "
-            "to building a realistic use case where a developer or end user would need to read through a large volume of text.\n\n"
-
-            "In the world of robotics and embedded systems, message logs often include timestamps, sensor readings, diagnostic "
-            "information, and user feedback. These details can accumulate quickly, especially when a system is under load or when "
-            "multiple subsystems are reporting simultaneously. Properly managing how that data is displayed is essential.\n\n"
-
-            "Let’s consider a scenario where your GUI is being used to monitor a fleet of underwater robots. Each unit might "
-            "send frequent status reports including depth, heading, battery level, leak detection status, sonar returns, and "
-            "environmental sensor data such as temperature, salinity, and pressure. If a fault is detected, additional logs are "
-            "generated to help with troubleshooting.\n\n"
-
-            "This message simulates such an output. We begin with a system check: All modules initialized successfully. "
-            "IMU calibration completed. GPS signal locked. Radio module online. WiFi handshake successful.\n\n"
-
-            "Next, we observe active telemetry: Heading 253.7 degrees. Depth 14.6 meters. Internal temperature: 35.4°C. "
-            "Battery at 83%. Leak sensor nominal. DVL reports bottom lock achieved. Camera feed initialized.\n\n"
-
-            "From here, diagnostics continue: Propulsion test passed. Manipulator test failed: motor controller not responding. "
-            "Fallback routine engaged. Logging full diagnostic traceback for future analysis.\n\n"
-
-            "Users should be aware that any error or warning must be scannable and clearly distinguishable from regular output. "
-            "This can be done through font weight, color, or formatting styles such as indentation and bulleting. For example:\n"
-            "- ERROR: Manipulator arm failed to extend\n"
-            "- WARNING: Depth sensor value out of expected range\n"
-            "- INFO: Waiting for surface command acknowledgment\n\n"
-
-            "In a real interface, the user may copy this text for later use or export logs to a file. Therefore, the interface "
-            "should maintain formatting consistency and avoid cutting off words or lines unexpectedly.\n\n"
-
-            "Scrolling must be vertical only. Horizontal scrolling makes reading long logs a chore and degrades user experience. "
-            "Wrapping should occur at word boundaries to enhance legibility. Margins and line spacing should be adequate but not excessive.\n\n"
-
-            "This is line 30. Still scrolling? Good. If your vertical scrollbar is behaving, you’re seeing this message exactly as intended.\n\n"
-
-            "Let’s push to 40 lines: Data stream stable. Reconnection attempts: 0. Command acknowledgment rate: 99.7%. "
-            "Uplink stable. Downlink stable. Operator status: Connected. Console heartbeat confirmed.\n\n"
-
-            "Final diagnostics: All systems nominal. UI test passed. Scrollbar visible. Text wrapping complete. Layout responsive. "
-            "Mission control ready for deployment.\n\n"
-
-            "End of long message."
-        )
-
-        message_label = QLabel(message_text)
-        message_label.setWordWrap(True)
-        message_label.setFont(QFont("Arial", 15))
-        message_label.setAlignment(Qt.AlignmentFlag.AlignHCenter)
-        message_label.setContentsMargins(0, 0, 0, 0)
-
-        message_label.setFixedWidth(500)
-        message_label.setObjectName(f"Console_messages{coug_number}")
-
-        scroll_content = QWidget()
-        scroll_layout = QVBoxLayout(scroll_content)
-        scroll_layout.setContentsMargins(0, 0, 0, 0)
-        scroll_layout.addWidget(message_label)
-
-        # Create QScrollArea and set scroll content
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setWidget(scroll_content)
-        scroll_area.setFixedHeight(int(self.height() * (2/3)))
-
-        # Add scroll_area to your layout
-        temp_layout.addWidget(scroll_area)
+        # The console log, only the visible lines of the vehicle's ring buffer are laid out and painted
+        console_view = ConsoleLogView(self.console_model(coug_number))
+        console_view.setFont(QFont("Arial", 13))
+        console_view.setObjectName(f"Console_messages{coug_number}")
+        console_view.setFixedHeight(int(self.height() * (2/3)))
+
+        # Filter row above the console
+        filter_edit = QLineEdit()
+        filter_edit.setPlaceholderText("Filter, e.g. ERROR, leak, DVL")
+        severity_box = QComboBox()
+        severity_box.addItems(["All"] + SEVERITIES)
+        filter_edit.textChanged.connect(lambda _: self.filter_console(coug_number, filter_edit, severity_box, console_view))
+        severity_box.currentTextChanged.connect(lambda _: self.filter_console(coug_number, filter_edit, severity_box, console_view))
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(filter_edit)
+        filter_layout.addWidget(severity_box)
 
         temp_layout.addWidget(self.make_hline())
         temp_layout.addSpacing(10)
-        temp_layout.addWidget(scroll_area)
+        temp_layout.addLayout(filter_layout)
+        temp_layout.addWidget(console_view)
 
         spacer = QSpacerItem(0, 0, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
         temp_layout.addItem(spacer)
@@ -634,24 +683,13 @@ class MainWindow(QMainWindow):
         # Add the temp container to the coug layout
         getattr(self, f"coug{coug_number}layout").addWidget(temp_container)
 
-    #used to create an icon next to text in a pre-determined fashion
-    def create_icon_and_text(self, text, icon=None, temp_tab_spacing=None):
-        temp_container = QWidget()
-        temp_layout = QHBoxLayout(temp_container)
-        if temp_tab_spacing: 
-            temp_layout.setContentsMargins(temp_tab_spacing, 0, 0, 0)
-        temp_layout.setSpacing(20)
-        if icon:
-            icon_label = QLabel()
-            icon_label.setPixmap(self.style().standardIcon(icon).pixmap(16, 16))
-            icon_label.setContentsMargins(0, 0, 0, 0)
-            icon_label.setFixedSize(16, 16)
-            temp_layout.addWidget(icon_label, alignment=Qt.AlignmentFlag.AlignVCenter)
-        text_label = QLabel(text)
-        text_label.setFont(QFont("Arial", 13))
-        text_label.setContentsMargins(0, 0, 0, 0)
-        temp_layout.addWidget(text_label, alignment=Qt.AlignmentFlag.AlignVCenter)
-        return temp_container
+    #creates a status indicator for a feedback cell, adds it to the layout and registers it
+    def add_status_widget(self, layout, key, coug_number, page, text, temp_tab_spacing):
+        widget = StatusIndicator(text, self.icon_cache, self.feedback_dict[key][coug_number], temp_tab_spacing)
+        widget.setObjectName(f"{key}{coug_number}")
+        layout.addWidget(widget)
+        self.widget_registry.register(key, coug_number, page, widget, layout, text)
+        return widget
 
     def create_title_label(self, text):
         # Create and style the label
@@ -666,26 +704,37 @@ class MainWindow(QMainWindow):
         temp_container.setFixedWidth(300)
         temp_layout = QVBoxLayout(temp_container)
 
+        #every button sends its own command to this coug only
         #load mission (blue)
-        self.create_coug_button(coug_number, "load_mission", "Load Mission", "blue", self.load_missions_button)
+        self.create_coug_button(coug_number, "load_mission", "Load Mission", "blue",
+            self.coug_command(coug_number, "load_mission", "Loading the mission"))
         #start mission (blue)
-        self.create_coug_button(coug_number, "start_mission", "Start Mission", "blue", self.start_missions_button)
+        self.create_coug_button(coug_number, "start_mission", "Start Mission", "blue",
+            self.coug_command(coug_number, "start_mission", "Starting the mission"))
         #disarm thruster (yellow)
-        self.create_coug_button(coug_number, "disarm_thruster", "Disarm Thruster", "yellow", self.start_missions_button)
+        self.create_coug_button(coug_number, "disarm_thruster", "Disarm Thruster", "yellow",
+            self.coug_command(coug_number, "disarm_thruster", "Disarming the thruster"))
         #deactivate DVL (yellow)
-        self.create_coug_button(coug_number, "deactivate_DVL", "Deactivate DVl", "yellow", self.start_missions_button)
+        self.create_coug_button(coug_number, "deactivate_DVL", "Deactivate DVl", "yellow",
+            self.coug_command(coug_number, "deactivate_dvl", "Deactivating the DVL"))
         #toggle running lights (yellow)
-        self.create_coug_button(coug_number, "toggle_lights", "Toggle Running Lights", "yellow", self.start_missions_button)
+        self.create_coug_button(coug_number, "toggle_lights", "Toggle Running Lights", "yellow",
+            self.coug_command(coug_number, "toggle_lights", "Toggling the running lights"))
         #restart R-Pi (yellow)
-        self.create_coug_button(coug_number, "restart_RP", "Restart R-Pi", "yellow", self.start_missions_button)
+        self.create_coug_button(coug_number, "restart_RP", "Restart R-Pi", "yellow",
+            self.coug_command(coug_number, "restart_pi", "Restarting the R-Pi"))
         #return to base (blue)
-        self.create_coug_button(coug_number, "return_to_base", "Return to Base", "blue", self.start_missions_button)
+        self.create_coug_button(coug_number, "return_to_base", "Return to Base", "blue",
+            self.coug_command(coug_number, "return_to_base", "Returning to base"))
         #system reboot (red)
-        self.create_coug_button(coug_number, "system_reboot", "System Reboot", "red", self.start_missions_button)
+        self.create_coug_button(coug_number, "system_reboot", "System Reboot", "red",
+            self.coug_command(coug_number, "system_reboot", "Rebooting the system"))
         #abort mission (red)
-        self.create_coug_button(coug_number, "abort_misson", "Abort Mission", "red", self.start_missions_button)
+        self.create_coug_button(coug_number, "abort_misson", "Abort Mission", "red",
+            self.coug_command(coug_number, "abort_mission", "Aborting the mission"))
         #emergency shutdown (red)
-        self.create_coug_button(coug_number, "emergency_shutdown", "Emergency Shutdown", "red", self.start_missions_button)
+        self.create_coug_button(coug_number, "emergency_shutdown", "Emergency Shutdown", "red",
+            self.coug_command(coug_number, "emergency_shutdown", "Shutting down"))
 
 
         #add all the buttons to the layout
@@ -741,17 +790,8 @@ class MainWindow(QMainWindow):
         temp_layout.addSpacing(20)
         temp_layout.addWidget(temp_label)
 
-        wifi_widget = self.create_icon_and_text("Wifi", self.icons_dict[self.feedback_dict["Wifi_connections"][coug_number]], 0)
-        wifi_widget.setObjectName(f"Wifi_connections{coug_number}")
-        temp_layout.addWidget(wifi_widget)
-
-        radio_widget = self.create_icon_and_text("Radio", self.icons_dict[self.feedback_dict["Radio_connections"][coug_number]], 0)
-        radio_widget.setObjectName(f"Radio_connections{coug_number}")
-        temp_layout.addWidget(radio_widget)
-
-        modem_widget = self.create_icon_and_text("Modem", self.icons_dict[self.feedback_dict["Modem_connections"][coug_number]], 0)
-        modem_widget.setObjectName(f"Modem_connections{coug_number}")
-        temp_layout.addWidget(modem_widget)
+        for key, text in self.fleet_schema.connections:
+            self.add_status_widget(temp_layout, key, coug_number, "Coug", text, 0)
         temp_layout.addSpacing(20)
 
         temp_label = QLabel("Sensors")
@@ -760,29 +800,8 @@ class MainWindow(QMainWindow):
         temp_layout.addSpacing(20)
         temp_layout.addWidget(temp_label)
 
-        modem_sensor_widget = self.create_icon_and_text("Modem", self.icons_dict[self.feedback_dict["Modem_sensors"][coug_number]], 0)
-        modem_sensor_widget.setObjectName(f"Modem_sensors{coug_number}")
-        temp_layout.addWidget(modem_sensor_widget)
-
-        DVL_sensor_widget = self.create_icon_and_text("DVL", self.icons_dict[self.feedback_dict["DVL_sensors"][coug_number]], 0)
-        DVL_sensor_widget.setObjectName(f"DVL_sensors{coug_number}")
-        temp_layout.addWidget(DVL_sensor_widget)
-
-        GPS_sensor_widget = self.create_icon_and_text("GPS", self.icons_dict[self.feedback_dict["GPS_sensors"][coug_number]], 0)
-        GPS_sensor_widget.setObjectName(f"GPS_sensors{coug_number}")
-        temp_layout.addWidget(GPS_sensor_widget)
-        
-        IMU_sensor_widget = self.create_icon_and_text("IMU", self.icons_dict[self.feedback_dict["IMU_sensors"][coug_number]], 0)
-        IMU_sensor_widget.setObjectName(f"IMU_sensors{coug_number}")
-        temp_layout.addWidget(IMU_sensor_widget)
-
-        Leak_sensor_widget = self.create_icon_and_text("Leak Detector", self.icons_dict[self.feedback_dict["Leak_sensors"][coug_number]], 0)
-        Leak_sensor_widget.setObjectName(f"Leak_sensors{coug_number}")
-        temp_layout.addWidget(Leak_sensor_widget)
-
-        Battery_sensor_widget = self.create_icon_and_text("Battery", self.icons_dict[self.feedback_dict["Battery_sensors"][coug_number]], 0)
-        Battery_sensor_widget.setObjectName(f"Battery_sensors{coug_number}")
-        temp_layout.addWidget(Battery_sensor_widget)
+        for key, text in self.fleet_schema.sensors:
+            self.add_status_widget(temp_layout, key, coug_number, "Coug", text, 0)
 
         return temp_container
 
@@ -809,25 +828,8 @@ class MainWindow(QMainWindow):
         temp_layout.addSpacing(20)
         temp_layout.addWidget(temp_label)
 
-        Safety_Monitoring_widget = self.create_icon_and_text("Safety Monitoring", self.icons_dict[self.feedback_dict["Safety_Monitoring_nodes"][coug_number]], 0)
-        Safety_Monitoring_widget.setObjectName(f"Safety_Monitoring_nodes{coug_number}")
-        temp_layout.addWidget(Safety_Monitoring_widget)
-
-        Depth_Controller_widget = self.create_icon_and_text("Depth Controller", self.icons_dict[self.feedback_dict["Depth_Controller_nodes"][coug_number]], 0)
-        Depth_Controller_widget.setObjectName(f"Depth_Controller_nodes{coug_number}")
-        temp_layout.addWidget(Depth_Controller_widget)
-        
-        Heading_Controller_widget = self.create_icon_and_text("Heading Controller", self.icons_dict[self.feedback_dict["Heading_Controller_nodes"][coug_number]], 0)
-        Heading_Controller_widget.setObjectName(f"Heading_Controller_nodes{coug_number}")
-        temp_layout.addWidget(Heading_Controller_widget)
-
-        Factor_Graph_widget = self.create_icon_and_text("Factor Graph", self.icons_dict[self.feedback_dict["Factor_Graph_nodes"][coug_number]], 0)
-        Factor_Graph_widget.setObjectName(f"Factor_Graph_nodes{coug_number}")
-        temp_layout.addWidget(Factor_Graph_widget)
-
-        Modem_Timing_widget = self.create_icon_and_text("Modem Timing", self.icons_dict[self.feedback_dict["Modem_Timing_nodes"][coug_number]], 0)
-        Modem_Timing_widget.setObjectName(f"Modem_Timing_nodes{coug_number}")
-        temp_layout.addWidget(Modem_Timing_widget)
+        for key, text in self.fleet_schema.nodes:
+            self.add_status_widget(temp_layout, key, coug_number, "Coug", text, 0)
 
         temp_label = QLabel("Mission")
 
@@ -861,14 +863,78 @@ class MainWindow(QMainWindow):
 
         return temp_container
 
-    #currently used as a proof of concept of receiving subscriptions
-    def recieve_message(self, message): 
-        self.confirm_reject_label.setText(message.data)
+    #currently used as a proof of concept of receiving subscriptions, called on the GUI thread by self.ros_bridge
+    @probe()
+    def recieve_message(self, topic, message): 
+        if topic == "fleet_status":
+            self.apply_fleet_status(message)
+        elif topic == "qos_event":
+            self.show_qos_event(message)
+        elif topic == "replay_seek":
+            #a replay went back in time, the lines after the new position will be replayed again
+            self.clear_consoles()
+        else:
+            ack = parse_ack(message.data)
+            if ack is not None:
+                self.command_tracker.handle_ack(ack)
+            elif not is_command(message.data):
+                #commands from another GUI are not confirmations
+                self.confirm_reject_label.setText(message.data)
+
+    #writes a decoded FleetStatus into feedback_dict, only cells that actually changed are redrawn
+    def apply_fleet_status(self, status):
+        coug_number = status.vehicle_id
+        trace = self.telemetry_latency.dispatched(status)
+        if coug_number not in self.fleet_schema.vehicle_ids:
+            return
+        changed = []
+        for key, value in status.states.items():
+            if self.feedback_dict[key][coug_number] != value:
+                self.set_feedback(key, coug_number, value)
+                changed.append(key)
+        for key, value in status.texts.items():
+            if key in ("Status_messages", "Last_messages"):
+                if self.feedback_dict[key][coug_number] != value:
+                    self.set_feedback(key, coug_number, value)
+                    changed.append(key)
+            else:
+                self.feedback_dict[key][coug_number] = value
+        for severity, text in status.console:
+            self.append_console_message(coug_number, text, severity)
+        if trace is not None:
+            self.telemetry_latency.stored(trace, self.is_shown(changed, coug_number))
+
+    #whether any of the cells has a visible widget
+    def is_shown(self, keys, coug_number):
+        for key in keys:
+            for handle in self.widget_registry.handles_for(key, coug_number).values():
+                if handle.widget.isVisible():
+                    return True
+        return False
+
+    def export_latency(self):
+        path = time.strftime("telemetry_latency_%Y%m%d_%H%M%S.json")
+        self.telemetry_latency.export(path)
+        self.statusBar().showMessage(f"Latency histograms written to {path}", 10000)
+
+    #deadline, liveliness and incompatible qos events from qos_profiles, shown in the status bar and the coug's console
+    def show_qos_event(self, event):
+        text = f"{event.topic}: {event.detail}"
+        self.statusBar().showMessage(text, 10000)
+        coug_number = event.vehicle_id
+        if coug_number not in self.fleet_schema.vehicle_ids:
+            return
+        severity = "INFO" if event.alive else "WARNING"
+        if event.kind == "incompatible_qos":
+            severity = "ERROR"
+        self.append_console_message(coug_number, f"{severity}: {text}", severity)
+        if event.kind == "liveliness_changed":
+            self.set_feedback("Status_messages", coug_number, "running" if event.alive else "no connection")
 
 #used by ros to open a window. Needed in order to start PyQt on a different thread than ros
-def OpenWindow(ros_node):
+def OpenWindow(ros_node, fleet_schema=None):
     app = QApplication(sys.argv)
-    window = MainWindow(ros_node)
+    window = MainWindow(ros_node, fleet_schema)
     window.show()
     return app, window  # Return both
 
@@ -0,0 +1,351 @@
+import struct
+import threading
+import time
+from collections import namedtuple
+
+from testing_turtle_gui.console_log import SEVERITIES
+from testing_turtle_gui.fleet_schema import TEXT_FIELDS
+
+#Binary fleet status message, sent as the data of a std_msgs/UInt8MultiArray on 'fleet_status'.
+#All integers are little endian.
+#
+#  header   version u8, kind u8, vehicle_id u16, seq u32, stamp_ns i64
+#  states   keyframe: count u8, then the status codes (0->negative, 1->positive, 2->waiting,
+#           3->unknown) packed 4 per byte, 2 bits each, in FleetSchema.status_fields order
+#           delta: count u8, then one byte per changed field, field index << 2 | code
+#  texts    count u8, then per text: field index u8 (into TEXT_FIELDS), length u16, utf-8
+#           (a delta only carries the texts that changed)
+#  console  count u8, then per line: severity index u8 (into SEVERITIES), length u16, utf-8
+#
+#Both ends build the same FleetSchema, so field names never go over the wire.
+#seq counts up by one per message from a vehicle, so the decoder can tell when it missed
+#one. A keyframe carries the full state and brings the decoder back in sync.
+
+VERSION = 1
+KIND_KEYFRAME = 0
+KIND_DELTA = 1
+#the delta state byte has 6 bits for the field index
+MAX_DELTA_FIELDS = 64
+#counts are u8 and text lengths u16, longer batches have to be split over several messages
+MAX_CONSOLE_LINES = 255
+MAX_TEXT_BYTES = 0xFFFF
+
+HEADER = struct.Struct("<BBHIq")
+COUNT = struct.Struct("<B")
+TEXT_HEADER = struct.Struct("<BH")
+
+#byte -> the 4 status codes packed in it, so decoding never shifts bits one field at a time
+UNPACKED_BYTES = [tuple((byte >> shift) & 3 for shift in (0, 2, 4, 6)) for byte in range(256)]
+
+#one decoded status message. states/texts are {feedback_dict key: value}, console is [(severity, text)]
+FleetStatus = namedtuple("FleetStatus", ["vehicle_id", "seq", "stamp_ns", "kind", "states", "texts", "console"])
+
+
+class CodecError(ValueError):
+    pass
+
+
+class CodecStats:
+    """
+    Counts what went through an encoder or decoder: messages by kind, bytes on the wire,
+    missed messages and the time spent decoding.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.messages = 0
+        self.keyframes = 0
+        self.deltas = 0
+        self.bytes = 0
+        self.gaps = 0
+        self.missed_messages = 0
+        self.decode_ns = 0
+
+    def count(self, kind, size):
+        self.messages += 1
+        self.bytes += size
+        if kind == KIND_KEYFRAME:
+            self.keyframes += 1
+        else:
+            self.deltas += 1
+
+    def summary(self):
+        messages = max(self.messages, 1)
+        return {
+            "messages": self.messages,
+            "keyframes": self.keyframes,
+            "deltas": self.deltas,
+            "bytes": self.bytes,
+            "bytes_per_message": self.bytes / messages,
+            "gaps": self.gaps,
+            "missed_messages": self.missed_messages,
+            "mean_decode_us": self.decode_ns / messages / 1000,
+        }
+
+
+class StatusEncoder:
+    """
+    Packs a vehicle's status into the binary fleet status format.
+    """
+
+    def __init__(self, schema):
+        self.status_keys = [key for key, _ in schema.status_fields]
+        if len(self.status_keys) > MAX_DELTA_FIELDS:
+            raise CodecError(f"delta messages support at most {MAX_DELTA_FIELDS} status fields")
+        self.status_index = {key: i for i, key in enumerate(self.status_keys)}
+        self.text_index = {key: i for i, key in enumerate(TEXT_FIELDS)}
+        self.severity_index = {severity: i for i, severity in enumerate(SEVERITIES)}
+
+    def encode(self, vehicle_id, seq, stamp_ns, states, texts=None, console=None, kind=KIND_KEYFRAME):
+        """
+        Parameters:
+            vehicle_id (int): which vehicle the status is from
+            seq (int): per-vehicle sequence number
+            stamp_ns (int): when the vehicle took the status, in nanoseconds
+            states (dict): feedback_dict key -> status code. For a keyframe missing keys are
+                sent as 3 (unknown), for a delta only the given keys are sent
+            texts (dict): optional TEXT_FIELDS key -> string
+            console (list): optional [(severity, text)] console lines, at most MAX_CONSOLE_LINES
+            kind (int): KIND_KEYFRAME or KIND_DELTA
+
+        Raises CodecError when there are too many console lines or a text is longer than
+        MAX_TEXT_BYTES in utf-8.
+        """
+        parts = [HEADER.pack(VERSION, kind, vehicle_id, seq & 0xFFFFFFFF, stamp_ns)]
+        if kind == KIND_KEYFRAME:
+            parts.append(self.pack_states([states.get(key, 3) for key in self.status_keys]))
+        else:
+            parts.append(self.pack_changed_states(states))
+        parts.append(self.pack_texts(texts or {}))
+        parts.append(self.pack_console(console or []))
+        return b"".join(parts)
+
+    def pack_changed_states(self, states):
+        packed = bytes((self.status_index[key] << 2) | (code & 3) for key, code in states.items())
+        return COUNT.pack(len(packed)) + packed
+
+    @staticmethod
+    def pack_states(codes):
+        packed = bytearray((len(codes) + 3) // 4)
+        for i, code in enumerate(codes):
+            packed[i >> 2] |= (code & 3) << ((i & 3) * 2)
+        return COUNT.pack(len(codes)) + bytes(packed)
+
+    def pack_texts(self, texts):
+        parts = [COUNT.pack(len(texts))]
+        for key, text in texts.items():
+            data = self.text_bytes(text, key)
+            parts.append(TEXT_HEADER.pack(self.text_index[key], len(data)))
+            parts.append(data)
+        return b"".join(parts)
+
+    def pack_console(self, console):
+        if len(console) > MAX_CONSOLE_LINES:
+            raise CodecError(f"a status message carries at most {MAX_CONSOLE_LINES} console lines, not {len(console)}")
+        parts = [COUNT.pack(len(console))]
+        for severity, text in console:
+            data = self.text_bytes(text, "console line")
+            parts.append(TEXT_HEADER.pack(self.severity_index.get(severity, 1), len(data)))
+            parts.append(data)
+        return b"".join(parts)
+
+    @staticmethod
+    def text_bytes(text, name):
+        data = text.encode("utf-8")
+        if len(data) > MAX_TEXT_BYTES:
+            raise CodecError(f"{name} is {len(data)} bytes in utf-8, at most {MAX_TEXT_BYTES} fit in a status message")
+        return data
+
+
+class StatusDecoder:
+    """
+    Unpacks binary fleet status messages into FleetStatus tuples, ready to be written
+    into feedback_dict without any string parsing.
+
+    The decoder keeps each vehicle's full state, rebuilt from keyframes and deltas, and
+    watches the sequence numbers. When messages from a vehicle go missing the vehicle is
+    put in needs_keyframe until its next keyframe arrives (deltas are still applied).
+    decode can be called from several threads.
+
+    Vehicles repeat the same status codes most of the time, so the decoded keyframe states
+    dict is cached by its packed bytes. The states dicts are shared and must not be modified.
+    """
+
+    STATES_CACHE_SIZE = 4096
+
+    def __init__(self, schema, on_gap=None):
+        """
+        Parameters:
+            schema (FleetSchema): must match the vehicles' schema
+            on_gap (function): optional, called as on_gap(vehicle_id, missed_messages)
+        """
+        self.status_keys = [key for key, _ in schema.status_fields]
+        self.on_gap = on_gap
+        self._states_cache = {}
+        #vehicle_id -> last seq seen
+        self.last_seq = {}
+        #vehicle_id -> {feedback_dict key: value}, the rebuilt state of each vehicle
+        self.vehicle_states = {}
+        self.needs_keyframe = set()
+        self.stats = CodecStats()
+        #vehicles can be decoded from several executor threads at once
+        self._lock = threading.Lock()
+
+    def decode(self, payload):
+        with self._lock:
+            return self._decode(payload)
+
+    def _decode(self, payload):
+        start_ns = time.perf_counter_ns()
+        try:
+            version, kind, vehicle_id, seq, stamp_ns = HEADER.unpack_from(payload, 0)
+            if version != VERSION:
+                raise CodecError(f"unsupported fleet status version {version}")
+            offset = HEADER.size
+            if kind == KIND_KEYFRAME:
+                states, offset = self.unpack_states(payload, offset)
+            else:
+                states, offset = self.unpack_changed_states(payload, offset)
+            texts, offset = self.unpack_strings(payload, offset, TEXT_FIELDS)
+            console, offset = self.unpack_strings(payload, offset, SEVERITIES)
+        except (struct.error, IndexError) as error:
+            raise CodecError(f"truncated fleet status message: {error}") from error
+        if offset != len(payload):
+            raise CodecError(f"fleet status message has {len(payload) - offset} bytes after its console lines")
+        texts = dict(texts)
+
+        self.check_sequence(vehicle_id, seq, kind)
+        vehicle_state = self.vehicle_states.setdefault(vehicle_id, {})
+        if kind == KIND_KEYFRAME:
+            vehicle_state.clear()
+        vehicle_state.update(states)
+        vehicle_state.update(texts)
+
+        self.stats.count(kind, len(payload))
+        self.stats.decode_ns += time.perf_counter_ns() - start_ns
+        return FleetStatus(vehicle_id, seq, stamp_ns, kind, states, texts, console)
+
+    def check_sequence(self, vehicle_id, seq, kind):
+        last_seq = self.last_seq.get(vehicle_id)
+        self.last_seq[vehicle_id] = seq
+        if last_seq is None:
+            #first message from this vehicle, a delta alone doesn't give the whole state
+            if kind != KIND_KEYFRAME:
+                self.needs_keyframe.add(vehicle_id)
+            return
+        missed = (seq - last_seq - 1) & 0xFFFFFFFF
+        #anything going backwards (a restarted vehicle) shows up as a huge miss, treat it as a restart
+        if missed and missed < 0x80000000:
+            self.stats.gaps += 1
+            self.stats.missed_messages += missed
+            if kind != KIND_KEYFRAME:
+                self.needs_keyframe.add(vehicle_id)
+            if self.on_gap:
+                self.on_gap(vehicle_id, missed)
+        if kind == KIND_KEYFRAME:
+            self.needs_keyframe.discard(vehicle_id)
+
+    def unpack_changed_states(self, payload, offset):
+        count = payload[offset]
+        offset += 1
+        end = offset + count
+        if end > len(payload):
+            raise IndexError("states run past the end of the message")
+        keys = self.status_keys
+        states = {keys[byte >> 2]: byte & 3 for byte in payload[offset:end]}
+        return states, end
+
+    def unpack_states(self, payload, offset):
+        count = payload[offset]
+        offset += 1
+        end = offset + (count + 3) // 4
+        if end > len(payload):
+            raise IndexError("states run past the end of the message")
+        packed = bytes(payload[offset - 1:end])
+        states = self._states_cache.get(packed)
+        if states is not None:
+            return states, end
+
+        codes = [code for byte in payload[offset:end] for code in UNPACKED_BYTES[byte]]
+        #3 means the vehicle didn't report the field, zip stops at the shorter of keys and codes
+        states = {key: code for key, code in zip(self.status_keys, codes[:count]) if code != 3}
+        if len(self._states_cache) >= self.STATES_CACHE_SIZE:
+            self._states_cache.clear()
+        self._states_cache[packed] = states
+        return states, end
+
+    @staticmethod
+    def unpack_strings(payload, offset, names):
+        (count,) = COUNT.unpack_from(payload, offset)
+        offset += 1
+        strings = []
+        size = len(payload)
+        for _ in range(count):
+            if offset + TEXT_HEADER.size > size:
+                raise IndexError("strings run past the end of the message")
+            index, length = TEXT_HEADER.unpack_from(payload, offset)
+            offset += TEXT_HEADER.size
+            if offset + length > size:
+                raise IndexError("strings run past the end of the message")
+            strings.append((names[index], bytes(payload[offset:offset + length]).decode("utf-8", errors="replace")))
+            offset += length
+        return strings, offset
+
+
+class DeltaEncoder:
+    """
+    Vehicle side encoder that only sends what changed since the last message.
+
+    Every keyframe_interval-th message (and the first one, and any message after
+    request_keyframe) is a keyframe with the full state, everything else is a delta with
+    the changed status codes and texts. Console lines are always sent.
+    """
+
+    def __init__(self, schema, keyframe_interval=20):
+        self.encoder = StatusEncoder(schema)
+        self.keyframe_interval = keyframe_interval
+        #vehicle_id -> (states, texts) last sent
+        self._last_sent = {}
+        self._seq = {}
+        self._keyframe_requested = set()
+        self.stats = CodecStats()
+
+    #the next message for the vehicle (or every vehicle) will be a keyframe
+    def request_keyframe(self, vehicle_id=None):
+        if vehicle_id is None:
+            self._keyframe_requested.update(self._seq)
+        else:
+            self._keyframe_requested.add(vehicle_id)
+
+    def encode(self, vehicle_id, stamp_ns, states, texts=None, console=None):
+        """
+        Parameters:
+            vehicle_id (int): which vehicle the status is from
+            stamp_ns (int): when the vehicle took the status, in nanoseconds
+            states (dict): the vehicle's full current feedback_dict key -> status code
+            texts (dict): the vehicle's full current TEXT_FIELDS key -> string
+            console (list): new [(severity, text)] console lines since the last message, at
+                most MAX_CONSOLE_LINES, send the rest with the next message
+        """
+        texts = texts or {}
+        seq = self._seq.get(vehicle_id, -1) + 1
+        last = self._last_sent.get(vehicle_id)
+
+        if last is None or seq % self.keyframe_interval == 0 or vehicle_id in self._keyframe_requested:
+            self._keyframe_requested.discard(vehicle_id)
+            kind = KIND_KEYFRAME
+            payload = self.encoder.encode(vehicle_id, seq, stamp_ns, states, texts, console, kind)
+        else:
+            kind = KIND_DELTA
+            last_states, last_texts = last
+            changed_states = {key: code for key, code in states.items() if last_states.get(key) != code}
+            changed_texts = {key: text for key, text in texts.items() if last_texts.get(key) != text}
+            payload = self.encoder.encode(vehicle_id, seq, stamp_ns, changed_states, changed_texts, console, kind)
+
+        #only once encoding succeeded, a rejected message must not leave a gap in seq
+        self._seq[vehicle_id] = seq
+        self._last_sent[vehicle_id] = (dict(states), dict(texts))
+        self.stats.count(kind, len(payload))
+        return payload
@@ -0,0 +1,157 @@
+import json
+import time
+
+from PyQt6.QtCore import QObject, QEvent
+
+from testing_turtle_gui.latency_stats import LatencyHistogram
+
+#The stages a fleet status goes through, from the vehicle stamping it to the GUI painting it
+#  link      vehicle stamp -> middleware receive (the radio, wifi or acoustic modem hop)
+#  executor  middleware receive -> subscription callback starting (waiting in the ros executor)
+#  handoff   callback starting -> GUI thread dispatch (decoding and the ros bridge queue)
+#  store     GUI thread dispatch -> feedback_dict written
+#  render    feedback_dict written -> window painted (the update scheduler's frame and Qt painting)
+#The link stage compares the vehicle's clock with this computer's, it is only meaningful
+#with the clocks synced (chrony, PTP). On rclpy without MessageInfo the middleware receive
+#time is not known, the executor stage is then left out and link runs to the callback.
+STAGES = ["link", "executor", "handoff", "store", "render"]
+
+
+class LatencyTrace:
+    __slots__ = ("vehicle_id", "link", "stamp_ns", "received_ns", "callback_ns", "dispatch_ns", "store_ns")
+
+    def __init__(self, vehicle_id, link, stamp_ns, received_ns, callback_ns):
+        self.vehicle_id = vehicle_id
+        self.link = link
+        self.stamp_ns = stamp_ns
+        self.received_ns = received_ns
+        self.callback_ns = callback_ns
+        self.dispatch_ns = None
+        self.store_ns = None
+
+
+class TelemetryLatency(QObject):
+    """
+    End to end latency of fleet status messages, per vehicle, per stage (see STAGES) and per
+    link (the topic a status came in on), kept in LatencyHistograms.
+
+    MinimalSubscriber starts a trace for every status it decodes, and the window fills in
+    the GUI side: apply_fleet_status takes the trace back when the status is dispatched
+    and marks it stored once feedback_dict is written. A status that changed a visible
+    widget then waits for the update scheduler's next frame and the paint after it, which
+    is when its render stage and total ("to screen") latency are recorded. Times are wall
+    clock (time.time_ns), like the vehicles' stamps.
+
+    Traces are started on ros executor threads, everything else happens on the GUI thread.
+    """
+
+    #traces are dropped when the GUI thread falls this far behind
+    MAX_IN_FLIGHT = 10000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        #(vehicle_id, seq) -> LatencyTrace, from the ros thread to the GUI thread
+        self._in_flight = {}
+        #stored traces waiting for the update scheduler's frame, and then for the paint
+        self._awaiting_frame = []
+        self._awaiting_paint = []
+        self.dropped = 0
+        #vehicle_id -> {stage: LatencyHistogram}, with "total" from the vehicle stamp to the paint
+        self.by_vehicle = {}
+        #link -> {stage: LatencyHistogram}, the same for every link
+        self.by_link = {}
+
+    #called on the ros executor thread, received_ns is None when the middleware receive time is not known
+    def received(self, status, link, received_ns, callback_ns):
+        if len(self._in_flight) >= self.MAX_IN_FLIGHT:
+            self.dropped += len(self._in_flight)
+            self._in_flight.clear()
+        self._in_flight[(status.vehicle_id, status.seq)] = LatencyTrace(
+            status.vehicle_id, link, status.stamp_ns, received_ns, callback_ns)
+
+    #returns the status's trace, or None when it has none (replays, or tracking is off)
+    def dispatched(self, status):
+        if not self._in_flight:
+            return None
+        trace = self._in_flight.pop((status.vehicle_id, status.seq), None)
+        if trace is not None:
+            trace.dispatch_ns = time.time_ns()
+        return trace
+
+    def stored(self, trace, shown):
+        """
+        Parameters:
+            trace (LatencyTrace): from dispatched
+            shown (bool): whether the status changed a visible widget, only those wait for the paint
+        """
+        trace.store_ns = time.time_ns()
+        received_ns = trace.received_ns or trace.callback_ns
+        for histograms in (self._histograms(self.by_vehicle, trace.vehicle_id), self._histograms(self.by_link, trace.link)):
+            histograms["link"].record(received_ns - trace.stamp_ns)
+            if trace.received_ns:
+                histograms["executor"].record(trace.callback_ns - trace.received_ns)
+            histograms["handoff"].record(trace.dispatch_ns - trace.callback_ns)
+            histograms["store"].record(trace.store_ns - trace.dispatch_ns)
+        if shown:
+            self._awaiting_frame.append(trace)
+
+    #connected to UpdateScheduler.frame_applied
+    def frame_applied(self):
+        if self._awaiting_frame:
+            self._awaiting_paint.extend(self._awaiting_frame)
+            self._awaiting_frame.clear()
+
+    def eventFilter(self, watched, event):
+        if self._awaiting_paint and event.type() == QEvent.Type.UpdateRequest:
+            #paint now, so the time after painting can be taken
+            watched.event(event)
+            painted_ns = time.time_ns()
+            for trace in self._awaiting_paint:
+                for histograms in (self.by_vehicle[trace.vehicle_id], self.by_link[trace.link]):
+                    histograms["render"].record(painted_ns - trace.store_ns)
+                    histograms["total"].record(painted_ns - trace.stamp_ns)
+            self._awaiting_paint.clear()
+            return True
+        return False
+
+    @staticmethod
+    def _histograms(table, key):
+        histograms = table.get(key)
+        if histograms is None:
+            histograms = table[key] = {stage: LatencyHistogram() for stage in STAGES + ["total"]}
+        return histograms
+
+    def reset(self):
+        for table in (self.by_vehicle, self.by_link):
+            for histograms in table.values():
+                for histogram in histograms.values():
+                    histogram.reset()
+        self.dropped = 0
+
+    #{"vehicles": {id: {stage: summary}}, "links": {topic: {stage: summary}}}, summaries from LatencyHistogram.summary
+    def summary(self):
+        return {
+            "vehicles": {str(vehicle_id): {stage: histogram.summary() for stage, histogram in histograms.items()}
+                         for vehicle_id, histograms in sorted(self.by_vehicle.items())},
+            "links": {link: {stage: histogram.summary() for stage, histogram in histograms.items()}
+                      for link, histograms in sorted(self.by_link.items())},
+            "dropped_traces": self.dropped,
+        }
+
+    def export(self, path):
+        with open(path, "w") as export_file:
+            json.dump(dict(self.summary(), exported_at=time.strftime("%Y-%m-%dT%H:%M:%S")), export_file, indent=2)
+            export_file.write("\n")
+
+    #one line per vehicle and per link, p50/p99 of every stage in ms
+    def report(self):
+        lines = [f"{'':<22}" + "".join(f"{stage:>15}" for stage in STAGES + ["total"]) + "   (p50/p99 ms)"]
+        for title, table in (("Coug", self.by_vehicle), ("", self.by_link)):
+            for key, histograms in sorted(table.items()):
+                cells = []
+                for stage in STAGES + ["total"]:
+                    histogram = histograms[stage]
+                    cells.append(f"{histogram.percentile(50) / 1e6:.1f}/{histogram.percentile(99) / 1e6:.1f}"
+                                 if histogram.count else "-")
+                lines.append(f"{f'{title} {key}'.strip():<22}" + "".join(f"{cell:>15}" for cell in cells))
+        return lines
@@ -0,0 +1,298 @@
+import bisect
+import glob
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+
+#Recordings are a directory of segment files, written in order and never modified once
+#closed, each with a sparse index file next to it.
+#
+#segment_000001.rec
+#  header   magic 8 bytes, start_ns i64
+#  records  length u32 (of the whole record, header included), recv_ns i64, topic id u8, payload
+#           topic id TOPIC_DEFINITION defines a topic: payload is the new id u8 then the name in utf-8
+#           a length of 0 marks the end of a segment that was not closed (the rest is preallocated zeros)
+#segment_000001.idx
+#  entries  recv_ns i64, offset u32, vehicle u16
+#           vehicle TIME_ENTRY: first record written at least index_interval after the previous entry
+#           vehicle TOPIC_ENTRY: a topic definition, so a reader starting mid segment knows the topics
+#           any other vehicle: a fleet status keyframe from that vehicle
+#Topic ids are only valid inside their segment, every segment defines the topics it uses.
+
+MAGIC = b"CGREC\x01\x00\x00"
+SEGMENT_HEADER = struct.Struct("<8sq")
+RECORD_HEADER = struct.Struct("<IqB")
+INDEX_ENTRY = struct.Struct("<qIH")
+TOPIC_DEFINITION = 255
+TIME_ENTRY = 0xFFFF
+TOPIC_ENTRY = 0xFFFE
+#space kept free at the end of a segment for a topic definition and the end marker
+SEGMENT_RESERVE = RECORD_HEADER.size * 2 + 256
+#record lengths and index offsets are u32, so a segment must stay below 4 GiB
+MAX_SEGMENT_BYTES = 2 ** 32 - 1
+
+Record = namedtuple("Record", ["recv_ns", "topic", "payload"])
+IndexEntry = namedtuple("IndexEntry", ["recv_ns", "segment", "offset", "vehicle"])
+
+
+def segment_paths(directory):
+    return sorted(glob.glob(os.path.join(directory, "segment_*.rec")))
+
+
+class TelemetryRecorder:
+    """
+    Appends every received message, with the time it was received, to memory mapped
+    segment files.
+
+    Segments are preallocated and mapped, so recording a message is a couple of copies
+    into memory, the kernel writes the pages out in the background. When a segment is
+    full the recorder moves on to a new one, and deletes the oldest ones beyond
+    max_segments. The index is written out with every time entry, so a reader sees it
+    while the recording is still running. record can be called from any thread.
+    """
+
+    def __init__(self, directory, segment_bytes=64 * 1024 * 1024, max_segments=None, index_interval_ms=1000):
+        """
+        Parameters:
+            directory (str): where the segments go, created if needed
+            segment_bytes (int): size of each segment file, at most MAX_SEGMENT_BYTES
+            max_segments (int): optional, how many segments are kept, the oldest are deleted
+            index_interval_ms (int): time between two entries of the sparse time index
+        """
+        if not 0 < segment_bytes <= MAX_SEGMENT_BYTES:
+            raise ValueError(f"segment_bytes must be between 1 and {MAX_SEGMENT_BYTES}, not {segment_bytes}")
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.index_interval_ns = int(index_interval_ms * 1e6)
+        os.makedirs(directory, exist_ok=True)
+        existing = segment_paths(directory)
+        self._next_segment = int(os.path.basename(existing[-1])[8:-4]) + 1 if existing else 1
+        self._lock = threading.Lock()
+        self._file = None
+        self._map = None
+        self._index_file = None
+        self._position = 0
+        #no segment is open yet, the first record opens one
+        self._capacity = 0
+        self._topic_ids = {}
+        self._next_index_ns = 0
+
+        self.record_count = 0
+        self.byte_count = 0
+        self.segment_count = 0
+
+    def record(self, topic, payload, recv_ns=None, keyframe_vehicle=None):
+        """
+        Parameters:
+            topic (str): the topic the message came in on
+            payload (bytes): the message, e.g. the raw fleet status bytes or a String's utf-8
+            recv_ns (int): optional receive time (time.time_ns()), now by default
+            keyframe_vehicle (int): set when the message is a fleet status keyframe of that
+                vehicle, so replays can seek to it
+        """
+        if recv_ns is None:
+            recv_ns = time.time_ns()
+        size = RECORD_HEADER.size + len(payload)
+        if SEGMENT_HEADER.size + size + SEGMENT_RESERVE > MAX_SEGMENT_BYTES:
+            raise ValueError(f"a {len(payload)} byte message does not fit in a recording segment")
+        with self._lock:
+            topic_id = self._topic_ids.get(topic)
+            #room for the record, a topic definition and the end marker
+            if self._position + size + SEGMENT_RESERVE > self._capacity:
+                self._open_segment(recv_ns, size)
+                topic_id = None
+            if topic_id is None:
+                topic_id = self._define_topic(topic, recv_ns)
+
+            position = self._position
+            if recv_ns >= self._next_index_ns:
+                self._write_index(recv_ns, position, TIME_ENTRY)
+                self._next_index_ns = recv_ns + self.index_interval_ns
+                #once per interval, so the index on disk is never more than an interval behind
+                self._index_file.flush()
+            if keyframe_vehicle is not None:
+                self._write_index(recv_ns, position, keyframe_vehicle)
+            RECORD_HEADER.pack_into(self._map, position, size, recv_ns, topic_id)
+            self._map[position + RECORD_HEADER.size:position + size] = payload
+            self._position = position + size
+
+            self.record_count += 1
+            self.byte_count += size
+
+    def _write(self, recv_ns, topic_id, payload):
+        size = RECORD_HEADER.size + len(payload)
+        RECORD_HEADER.pack_into(self._map, self._position, size, recv_ns, topic_id)
+        self._map[self._position + RECORD_HEADER.size:self._position + size] = payload
+        self._position += size
+
+    def _define_topic(self, topic, recv_ns):
+        if len(self._topic_ids) >= TOPIC_DEFINITION:
+            raise ValueError(f"a segment can hold at most {TOPIC_DEFINITION} topics")
+        topic_id = len(self._topic_ids)
+        self._topic_ids[topic] = topic_id
+        self._write_index(recv_ns, self._position, TOPIC_ENTRY)
+        self._write(recv_ns, TOPIC_DEFINITION, bytes([topic_id]) + topic.encode("utf-8"))
+        return topic_id
+
+    def _write_index(self, recv_ns, offset, vehicle):
+        self._index_file.write(INDEX_ENTRY.pack(recv_ns, offset, vehicle))
+
+    def _open_segment(self, start_ns, record_size):
+        self._close_segment()
+        path = os.path.join(self.directory, f"segment_{self._next_segment:06d}.rec")
+        self._next_segment += 1
+        size = max(self.segment_bytes, SEGMENT_HEADER.size + record_size + SEGMENT_RESERVE)
+        self._file = open(path, "w+b")
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        SEGMENT_HEADER.pack_into(self._map, 0, MAGIC, start_ns)
+        self._position = SEGMENT_HEADER.size
+        self._capacity = size
+        self._index_file = open(path[:-4] + ".idx", "wb")
+        self._topic_ids = {}
+        self._next_index_ns = 0
+        self.segment_count += 1
+        self._delete_old_segments()
+
+    #unmaps the segment and cuts off the unused preallocated space
+    def _close_segment(self):
+        if self._map is None:
+            return
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(self._position)
+        self._file.close()
+        self._index_file.close()
+        self._map = None
+        self._position = 0
+        self._capacity = 0
+
+    def _delete_old_segments(self):
+        if not self.max_segments:
+            return
+        for path in segment_paths(self.directory)[:-self.max_segments]:
+            os.remove(path)
+            if os.path.exists(path[:-4] + ".idx"):
+                os.remove(path[:-4] + ".idx")
+
+    #writes the index and the mapped pages out, the recording stays open
+    def flush(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.flush()
+                self._index_file.flush()
+
+    def close(self):
+        with self._lock:
+            self._close_segment()
+
+    def stats(self):
+        return {
+            "records": self.record_count,
+            "bytes": self.byte_count,
+            "segments": self.segment_count,
+        }
+
+
+class RecordingReader:
+    """
+    Reads a recording back, in order, and finds where to start reading for a given time
+    through the segments' sparse indexes.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.segments = segment_paths(directory)
+        if not self.segments:
+            raise FileNotFoundError(f"no recording segments in {directory}")
+        #time entries and keyframe entries of every segment, in order
+        self.time_index = []
+        self.keyframe_index = []
+        #segment -> offsets of its topic definitions
+        self.topic_offsets = {}
+        for segment, path in enumerate(self.segments):
+            index_path = path[:-4] + ".idx"
+            if not os.path.exists(index_path):
+                continue
+            with open(index_path, "rb") as index_file:
+                data = index_file.read()
+            usable = len(data) - len(data) % INDEX_ENTRY.size
+            for recv_ns, offset, vehicle in INDEX_ENTRY.iter_unpack(data[:usable]):
+                entry = IndexEntry(recv_ns, segment, offset, vehicle)
+                if vehicle == TIME_ENTRY:
+                    self.time_index.append(entry)
+                elif vehicle == TOPIC_ENTRY:
+                    self.topic_offsets.setdefault(segment, []).append(offset)
+                else:
+                    self.keyframe_index.append(entry)
+        self._time_keys = [entry.recv_ns for entry in self.time_index]
+
+    def start_ns(self):
+        with open(self.segments[0], "rb") as segment_file:
+            return SEGMENT_HEADER.unpack(segment_file.read(SEGMENT_HEADER.size))[1]
+
+    #the last time index entry at or before recv_ns, where reading has to start to see every record from recv_ns on
+    def seek_entry(self, recv_ns):
+        position = bisect.bisect_right(self._time_keys, recv_ns) - 1
+        if position < 0:
+            return None
+        return self.time_index[position]
+
+    def last_keyframes(self, recv_ns):
+        """
+        Returns {vehicle: IndexEntry} of the last fleet status keyframe of each vehicle at
+        or before recv_ns.
+        """
+        keyframes = {}
+        for entry in self.keyframe_index:
+            if entry.recv_ns > recv_ns:
+                break
+            keyframes[entry.vehicle] = entry
+        return keyframes
+
+    def records(self, segment=0, offset=None):
+        """
+        Yields every Record from a position on, through the end of the recording.
+
+        Parameters:
+            segment (int): index into self.segments
+            offset (int): byte offset of a record in that segment (from an IndexEntry), the
+                start of the segment by default
+        """
+        for segment_number in range(segment, len(self.segments)):
+            start = offset if segment_number == segment and offset is not None else None
+            yield from self._segment_records(segment_number, start)
+
+    def _segment_records(self, segment, start):
+        with open(self.segments[segment], "rb") as segment_file:
+            size = os.fstat(segment_file.fileno()).st_size
+            if size <= SEGMENT_HEADER.size:
+                return
+            with mmap.mmap(segment_file.fileno(), size, access=mmap.ACCESS_READ) as data:
+                magic, _ = SEGMENT_HEADER.unpack_from(data, 0)
+                if magic != MAGIC:
+                    raise ValueError(f"{self.segments[segment]} is not a recording segment")
+                topics = {}
+                position = SEGMENT_HEADER.size
+                if start is not None:
+                    #the topics used after start may be defined before it
+                    for definition in self.topic_offsets.get(segment, []):
+                        if definition < start:
+                            length, _, _ = RECORD_HEADER.unpack_from(data, definition)
+                            topics[data[definition + RECORD_HEADER.size]] = bytes(
+                                data[definition + RECORD_HEADER.size + 1:definition + length]).decode("utf-8")
+                    position = start
+                while position + RECORD_HEADER.size <= size:
+                    length, recv_ns, topic_id = RECORD_HEADER.unpack_from(data, position)
+                    if length < RECORD_HEADER.size or position + length > size:
+                        break
+                    payload_start = position + RECORD_HEADER.size
+                    if topic_id == TOPIC_DEFINITION:
+                        topics[data[payload_start]] = bytes(data[payload_start + 1:position + length]).decode("utf-8")
+                    else:
+                        yield Record(recv_ns, topics.get(topic_id, ""), data[payload_start:position + length])
+                    position += length
@@ -0,0 +1,321 @@
+import argparse
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QWidget, QHBoxLayout, QPushButton, QComboBox, QSlider, QLabel
+
+from testing_turtle_gui.command_pipeline import parse_ack
+from testing_turtle_gui.fleet_schema import FleetSchema, TEXT_FIELDS
+from testing_turtle_gui.telemetry_codec import StatusDecoder, FleetStatus, CodecError, KIND_KEYFRAME
+from testing_turtle_gui.telemetry_recorder import RecordingReader
+
+#stands in for std_msgs/String, recieve_message only reads .data
+TextMessage = namedtuple("TextMessage", ["data"])
+
+#speed 0 replays as fast as the GUI takes the messages
+SPEEDS = {"1x": 1.0, "10x": 10.0, "Max": 0.0}
+
+#the replay thread waits while this many messages are queued for the GUI thread
+MAX_BACKLOG = 5000
+
+
+class ReplaySource(QObject):
+    """
+    Plays a recording (see telemetry_recorder) into a MainWindow in place of
+    MinimalSubscriber, at the recorded pace times speed, or as fast as possible.
+
+    Messages go through window.ros_bridge exactly like live ones, from a thread of their
+    own, so a replay exercises the whole update path. Seeking starts decoding at each
+    vehicle's last keyframe before the target, fast forwards to the target without
+    drawing anything, and then hands the GUI one keyframe per vehicle. Seeking back also
+    clears the consoles, their lines from there on are replayed again.
+
+    Recorded acks are left out, they answer commands of the recorded session and must not
+    reach the window's CommandTracker. Other text on 'topic' is replayed.
+    """
+
+    #emitted when the end of the recording is reached
+    finished = pyqtSignal()
+    #emitted with the receive time of every delivered message, at most every 100 ms
+    position_changed = pyqtSignal(object)
+    #emitted with the seek position once the state there is handed to the window, it
+    #reaches the GUI thread after the rebuilt keyframes
+    seeked = pyqtSignal(object)
+
+    def __init__(self, reader, window, speed=1.0, parent=None):
+        """
+        Parameters:
+            reader (RecordingReader): the recording
+            window (MainWindow): gets the messages through window.ros_bridge
+            speed (float): 1.0 plays at the recorded pace, 10.0 ten times faster, 0 as fast as possible
+            parent (QObject): optional Qt parent
+        """
+        super().__init__(parent)
+        self.reader = reader
+        self.window = window
+        self.decoder = StatusDecoder(window.fleet_schema)
+        self.start_ns = reader.start_ns()
+        self.position_ns = self.start_ns
+        self.delivered_count = 0
+
+        self._condition = threading.Condition()
+        self._speed = speed
+        self._paused = False
+        self._steps = 0
+        self._seek_ns = None
+        self._stopped = False
+        #recording time that plays at wall time _anchor_wall_ns, moved on every pause, seek and speed change
+        self._anchor_ns = None
+        self._anchor_wall_ns = None
+        self._last_position_signal_ns = 0
+        self._thread = None
+        self.started_wall_ns = None
+        self.finished_wall_ns = None
+
+    def start(self):
+        self.started_wall_ns = time.perf_counter_ns()
+        self._thread = threading.Thread(target=self._run, name="replay", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join()
+
+    def pause(self):
+        with self._condition:
+            self._paused = True
+            self._condition.notify_all()
+
+    def resume(self):
+        with self._condition:
+            self._paused = False
+            self._anchor_ns = None
+            self._condition.notify_all()
+
+    def is_paused(self):
+        return self._paused
+
+    #delivers the next message while paused
+    def step(self):
+        with self._condition:
+            self._steps += 1
+            self._condition.notify_all()
+
+    def set_speed(self, speed):
+        with self._condition:
+            self._speed = speed
+            self._anchor_ns = None
+            self._condition.notify_all()
+
+    def seek(self, recv_ns):
+        with self._condition:
+            self._seek_ns = recv_ns
+            self._condition.notify_all()
+
+    def elapsed_s(self):
+        end_ns = self.finished_wall_ns or time.perf_counter_ns()
+        return (end_ns - self.started_wall_ns) / 1e9 if self.started_wall_ns else 0.0
+
+    def _run(self):
+        records = self.reader.records()
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                seek_ns, self._seek_ns = self._seek_ns, None
+            if seek_ns is not None:
+                records = self._seek(seek_ns)
+
+            record = next(records, None)
+            if record is None:
+                self.finished_wall_ns = time.perf_counter_ns()
+                self.finished.emit()
+                #stay around for seeks back into the recording
+                with self._condition:
+                    while not self._stopped and self._seek_ns is None:
+                        self._condition.wait()
+                continue
+            if not self._wait_for_turn(record.recv_ns):
+                #a seek (or stop) came in while waiting, the record is dropped
+                continue
+            self._deliver(record)
+
+    #sleeps until the record is due, returns False when interrupted by a seek or stop
+    def _wait_for_turn(self, recv_ns):
+        with self._condition:
+            while True:
+                if self._stopped or self._seek_ns is not None:
+                    return False
+                if self._paused:
+                    if self._steps:
+                        self._steps -= 1
+                        return True
+                    self._condition.wait()
+                    continue
+                if not self._speed:
+                    break
+                now_ns = time.perf_counter_ns()
+                if self._anchor_ns is None:
+                    self._anchor_ns, self._anchor_wall_ns = recv_ns, now_ns
+                due_ns = self._anchor_wall_ns + (recv_ns - self._anchor_ns) / self._speed
+                if due_ns <= now_ns:
+                    break
+                self._condition.wait((due_ns - now_ns) / 1e9)
+        #as fast as possible still lets the GUI keep up
+        while self.window.ros_bridge.backlog() > MAX_BACKLOG and not self._stopped:
+            time.sleep(0.001)
+        return True
+
+    def _deliver(self, record):
+        self.position_ns = record.recv_ns
+        if record.topic.endswith("fleet_status"):
+            try:
+                status = self.decoder.decode(record.payload)
+            except CodecError:
+                return
+            self.window.ros_bridge.enqueue("fleet_status", status)
+        elif record.topic == "topic":
+            text = bytes(record.payload).decode("utf-8")
+            if parse_ack(text) is not None:
+                return
+            self.window.ros_bridge.enqueue("topic", TextMessage(text))
+        else:
+            return
+        self.delivered_count += 1
+        if record.recv_ns - self._last_position_signal_ns >= 100_000_000:
+            self._last_position_signal_ns = record.recv_ns
+            self.position_changed.emit(record.recv_ns)
+
+    #rebuilds every vehicle's state at recv_ns and returns the records from there on
+    def _seek(self, recv_ns):
+        if recv_ns < self.position_ns:
+            #through the bridge, so it lands after the lines already queued and before the replayed ones
+            self.window.ros_bridge.enqueue("replay_seek", recv_ns)
+        starts = [(entry.segment, entry.offset) for entry in self.reader.last_keyframes(recv_ns).values()]
+        time_entry = self.reader.seek_entry(recv_ns)
+        if time_entry:
+            starts.append((time_entry.segment, time_entry.offset))
+        segment, offset = min(starts) if starts else (0, None)
+
+        self.decoder = StatusDecoder(self.window.fleet_schema)
+        records = self.reader.records(segment, offset)
+        next_record = None
+        for record in records:
+            if record.recv_ns >= recv_ns:
+                next_record = record
+                break
+            if record.topic.endswith("fleet_status"):
+                try:
+                    self.decoder.decode(record.payload)
+                except CodecError:
+                    pass
+
+        for vehicle_id, vehicle_state in self.decoder.vehicle_states.items():
+            states = {key: value for key, value in vehicle_state.items() if key not in TEXT_FIELDS}
+            texts = {key: value for key, value in vehicle_state.items() if key in TEXT_FIELDS}
+            status = FleetStatus(vehicle_id, self.decoder.last_seq.get(vehicle_id, 0), recv_ns, KIND_KEYFRAME, states, texts, [])
+            self.window.ros_bridge.enqueue("fleet_status", status)
+
+        self.position_ns = recv_ns
+        self._last_position_signal_ns = 0
+        with self._condition:
+            self._anchor_ns = None
+        self.seeked.emit(recv_ns)
+
+        def remaining():
+            if next_record is not None:
+                yield next_record
+                yield from records
+        return remaining()
+
+
+class ReplayControls(QWidget):
+    """
+    Play/pause, step, speed and a position slider for a ReplaySource.
+    """
+
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self.source = source
+        layout = QHBoxLayout(self)
+
+        self.play_button = QPushButton("Pause")
+        self.play_button.clicked.connect(self.toggle_pause)
+        layout.addWidget(self.play_button)
+
+        self.step_button = QPushButton("Step")
+        self.step_button.clicked.connect(source.step)
+        layout.addWidget(self.step_button)
+
+        self.speed_box = QComboBox()
+        self.speed_box.addItems(list(SPEEDS))
+        self.speed_box.currentTextChanged.connect(lambda text: source.set_speed(SPEEDS[text]))
+        layout.addWidget(self.speed_box)
+
+        #the slider is in seconds from the start of the recording
+        end_ns = source.reader.time_index[-1].recv_ns if source.reader.time_index else source.start_ns
+        self.slider = QSlider(Qt.Orientation.Horizontal)
+        self.slider.setRange(0, max(1, (end_ns - source.start_ns) // 1_000_000_000))
+        self.slider.sliderReleased.connect(self.seek_to_slider)
+        layout.addWidget(self.slider, stretch=1)
+
+        self.position_label = QLabel("0 s")
+        layout.addWidget(self.position_label)
+
+        source.position_changed.connect(self.show_position)
+        source.seeked.connect(self.show_position)
+        source.finished.connect(lambda: self.position_label.setText(
+            f"{self.position_label.text()} (end, {source.delivered_count} msgs in {source.elapsed_s():.1f} s)"))
+
+    def toggle_pause(self):
+        if self.source.is_paused():
+            self.source.resume()
+            self.play_button.setText("Pause")
+        else:
+            self.source.pause()
+            self.play_button.setText("Play")
+
+    def seek_to_slider(self):
+        self.source.seek(self.source.start_ns + self.slider.value() * 1_000_000_000)
+
+    def show_position(self, recv_ns):
+        seconds = (recv_ns - self.source.start_ns) / 1e9
+        self.position_label.setText(f"{seconds:.1f} s")
+        if not self.slider.isSliderDown():
+            self.slider.setValue(int(seconds))
+
+
+#replays a recording into the GUI without ros:  python3 -m testing_turtle_gui.telemetry_replay <recording dir>
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded mission into the GUI")
+    parser.add_argument("recording", help="directory written by TelemetryRecorder")
+    parser.add_argument("--speed", choices=list(SPEEDS), default="1x")
+    parser.add_argument("--fleet-config", help="fleet json file, see fleet_schema.DEFAULT_FLEET")
+    args = parser.parse_args()
+
+    #imported here so the replay classes can be used without loading the whole GUI
+    from testing_turtle_gui.tabbed_window import MainWindow
+
+    fleet_schema = FleetSchema.from_json(args.fleet_config) if args.fleet_config else FleetSchema()
+    app = QApplication(sys.argv)
+    window = MainWindow(None, fleet_schema)
+    window.setWindowTitle("CoUGARS_GUI (replay)")
+    source = ReplaySource(RecordingReader(args.recording), window, SPEEDS[args.speed], parent=window)
+    controls = ReplayControls(source)
+    controls.speed_box.setCurrentText(args.speed)
+    window.main_layout.insertWidget(0, controls)
+    window.show()
+    source.start()
+    exit_code = app.exec()
+    source.stop()
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
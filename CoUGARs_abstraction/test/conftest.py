@@ -0,0 +1,24 @@
+import os
+import sys
+import types
+
+import pytest
+
+#the widgets are built without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+#colcon installs this directory as the testing_turtle_gui package, from a plain checkout
+#the directory itself is made importable under that name
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+try:
+    import testing_turtle_gui  # noqa: F401
+except ImportError:
+    package = types.ModuleType("testing_turtle_gui")
+    package.__path__ = [PACKAGE_DIR]
+    sys.modules["testing_turtle_gui"] = package
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
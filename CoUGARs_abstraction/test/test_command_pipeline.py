@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+from testing_turtle_gui.command_pipeline import (
+    ACKED, PENDING, REJECTED, TIMED_OUT, CommandTracker, is_command, parse_ack)
+
+
+@pytest.fixture
+def sent():
+    return []
+
+
+@pytest.fixture
+def tracker(qapp, sent):
+    return CommandTracker(lambda commands: sent.append([(command.id, command.attempt) for command in commands]),
+                          timeout_ms=0, max_retries=2)
+
+
+def ack_for(command, **fields):
+    return dict({"ack": command.id, "vehicle": command.vehicle_id, "attempt": command.attempt, "accepted": True,
+                 "detail": "ok"}, **fields)
+
+
+def test_submit_sends_one_command_per_vehicle(tracker, sent):
+    commands = tracker.submit([1, 2], "start_mission", "Starting the missions...")
+    assert [command.vehicle_id for command in commands] == [1, 2]
+    assert len({command.batch for command in commands}) == 1
+    assert sent == [[(commands[0].id, 1), (commands[1].id, 1)]]
+    assert all(command.state == PENDING for command in commands)
+
+    encoded = json.loads(commands[0].encode())
+    assert encoded["origin"] == tracker.session
+    assert encoded["id"].startswith(tracker.session + "-")
+    assert is_command(commands[0].encode())
+
+
+def test_ids_are_unique_across_trackers(qapp):
+    first = CommandTracker(lambda commands: None).submit([1], "recall", "")[0]
+    second = CommandTracker(lambda commands: None).submit([1], "recall", "")[0]
+    assert first.id != second.id
+
+
+def test_ack_and_rejection(tracker):
+    accepted, rejected = tracker.submit([1, 2], "start_mission", "")
+    assert tracker.handle_ack(ack_for(accepted)) is accepted
+    assert tracker.handle_ack(ack_for(rejected, accepted=False, detail="leak detected")) is rejected
+    assert accepted.state == ACKED
+    assert (rejected.state, rejected.detail) == (REJECTED, "leak detected")
+    assert accepted.round_trip_ns >= 0
+    assert tracker.pending == {}
+    assert tracker.history == [accepted, rejected]
+    assert tracker.stats()["round_trip_by_vehicle"][1]["count"] == 1
+
+
+def test_unmatched_acks_are_counted(tracker):
+    command = tracker.submit([1], "recall", "")[0]
+    assert tracker.handle_ack(ack_for(command, ack="someone-else-1")) is None
+    #the right id from the wrong vehicle does not confirm the command
+    assert tracker.handle_ack(ack_for(command, vehicle=2)) is None
+    assert command.state == PENDING
+    tracker.handle_ack(ack_for(command))
+    #a late second ack for a finished command
+    assert tracker.handle_ack(ack_for(command)) is None
+    assert tracker.unmatched_ack_count == 3
+    assert tracker.acked_count == 1
+
+
+def test_retries_then_times_out(tracker, sent):
+    command = tracker.submit([1], "recall", "")[0]
+    tracker._check_timeouts()
+    tracker._check_timeouts()
+    assert sent == [[(command.id, 1)], [(command.id, 2)], [(command.id, 3)]]
+    assert command.state == PENDING
+    tracker._check_timeouts()
+    assert command.state == TIMED_OUT
+    assert tracker.pending == {}
+    assert (tracker.retry_count, tracker.timed_out_count) == (2, 1)
+    assert tracker.handle_ack(ack_for(command)) is None
+
+
+def test_round_trip_is_measured_from_the_acked_attempt(tracker):
+    first, second = tracker.submit([1, 2], "recall", "")
+    tracker._check_timeouts()
+    for command in (first, second):
+        #the first attempt went out a second before the retry
+        command.attempt_ns[1] = command.attempt_ns[2] - 1_000_000_000
+    tracker.handle_ack(ack_for(first, attempt=1))
+    tracker.handle_ack(ack_for(second, attempt=2))
+    assert first.round_trip_ns >= 1_000_000_000
+    assert second.round_trip_ns < 1_000_000_000
+
+
+def test_command_changed_is_emitted(tracker):
+    changes = []
+    tracker.command_changed.connect(lambda command: changes.append(command.state))
+    command = tracker.submit([1], "recall", "")[0]
+    tracker.handle_ack(ack_for(command))
+    assert changes == [PENDING, ACKED]
+
+
+def test_parse_ack_only_accepts_acks():
+    assert parse_ack('{"ack": "a-1", "vehicle": 1}') == {"ack": "a-1", "vehicle": 1}
+    assert parse_ack("Starting the missions...") is None
+    assert parse_ack('{"id": "a-1", "vehicle": 1, "command": "recall"}') is None
+    assert parse_ack("{not json") is None
+    assert parse_ack("[1, 2]") is None
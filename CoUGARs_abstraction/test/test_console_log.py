@@ -0,0 +1,87 @@
+import pytest
+
+from testing_turtle_gui.console_log import ConsoleLogModel, ConsoleLogView, RingBuffer, make_entry, severity_of
+
+
+def test_ring_buffer_keeps_the_newest_items():
+    buffer = RingBuffer(3)
+    for item in range(5):
+        buffer.append(item)
+    assert list(buffer) == [2, 3, 4]
+    assert len(buffer) == 3
+    assert buffer.is_full()
+    assert buffer[0] == 2
+    assert buffer[-1] == 4
+    with pytest.raises(IndexError):
+        buffer[3]
+
+
+def test_ring_buffer_reports_every_dropped_item():
+    evicted = []
+    buffer = RingBuffer(2, on_evict=evicted.append)
+    assert buffer.append("a") is None
+    buffer.append("b")
+    assert buffer.append("c") == "a"
+    assert buffer.pop_oldest() == "b"
+    buffer.append("d")
+    buffer.clear()
+    assert evicted == ["a", "b", "c", "d"]
+    assert len(buffer) == 0
+    with pytest.raises(IndexError):
+        buffer.pop_oldest()
+
+
+def test_severity_of_reads_the_prefix():
+    assert severity_of("ERROR: Leak detected") == "ERROR"
+    assert severity_of("[WARNING] Depth out of range") == "WARNING"
+    assert severity_of("no prefix") == "INFO"
+
+
+def test_model_append_drops_the_oldest_row(qapp):
+    model = ConsoleLogModel(RingBuffer(2))
+    for text in ("one", "two", "three"):
+        model.append(make_entry(1, text))
+    assert model.rowCount() == 2
+    assert [entry.text for entry in model.buffer] == ["two", "three"]
+
+
+def test_model_clear_resets_and_evicts(qapp):
+    evicted = []
+    model = ConsoleLogModel(RingBuffer(4, on_evict=evicted.append))
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+    model.append(make_entry(1, "one"))
+    model.clear()
+    assert model.rowCount() == 0
+    assert [entry.text for entry in evicted] == ["one"]
+    assert resets == [True]
+
+
+def test_view_uses_one_results_model_and_keeps_it_live(qapp):
+    model = ConsoleLogModel(RingBuffer(10))
+    view = ConsoleLogView(model)
+    results_model = view.results_model
+    model.append(make_entry(1, "ERROR: leak"))
+
+    view.show_entries([model.buffer[0]], lambda entry: "leak" in entry.text)
+    view.show_entries([model.buffer[0]], lambda entry: "leak" in entry.text)
+    assert view.model() is results_model is view.results_model
+
+    #lines arriving after the search are added when they match
+    model.append(make_entry(1, "INFO: depth 3 m"))
+    model.append(make_entry(1, "ERROR: second leak"))
+    assert [entry.text for entry in results_model.buffer] == ["ERROR: leak", "ERROR: second leak"]
+
+    view.show_entries(None)
+    assert view.model() is model
+
+
+def test_view_empties_results_when_the_log_is_cleared(qapp):
+    model = ConsoleLogModel(RingBuffer(10))
+    view = ConsoleLogView(model)
+    model.append(make_entry(1, "ERROR: leak"))
+    view.show_entries([model.buffer[0]], lambda entry: "leak" in entry.text)
+    model.clear()
+    assert view.results_model.rowCount() == 0
+    model.append(make_entry(1, "ERROR: new leak"))
+    assert [entry.text for entry in view.results_model.buffer] == ["ERROR: new leak"]
@@ -0,0 +1,98 @@
+from testing_turtle_gui.console_log import RingBuffer, make_entry
+from testing_turtle_gui.console_search import ConsoleSearchIndex
+
+
+def make_index(lines):
+    index = ConsoleSearchIndex()
+    entries = [make_entry(vehicle, text) for vehicle, text in lines]
+    for entry in entries:
+        index.add(entry)
+    return index, entries
+
+
+def texts(results):
+    return [entry.text for entry in results]
+
+
+def test_search_finds_substrings_newest_first():
+    index, _ = make_index([
+        (1, "INFO: DVL reports bottom lock achieved"),
+        (2, "ERROR: Leak detected in forward hull"),
+        (1, "WARNING: Depth sensor value out of expected range"),
+        (3, "ERROR: Leak detected in aft hull"),
+    ])
+    assert texts(index.search("leak")) == ["ERROR: Leak detected in aft hull", "ERROR: Leak detected in forward hull"]
+    assert texts(index.search("dept")) == ["WARNING: Depth sensor value out of expected range"]
+    assert texts(index.search("leak aft")) == ["ERROR: Leak detected in aft hull"]
+    assert index.search("doesnotexist") == []
+
+
+def test_search_filters_by_severity_and_vehicle():
+    index, _ = make_index([
+        (1, "ERROR: Leak detected"),
+        (2, "ERROR: Leak detected"),
+        (2, "INFO: Leak sensor ok"),
+    ])
+    assert [entry.vehicle for entry in index.search(severity="ERROR")] == [2, 1]
+    assert texts(index.search("leak", vehicle=2)) == ["INFO: Leak sensor ok", "ERROR: Leak detected"]
+    assert texts(index.search("leak", severity="INFO", vehicle=2)) == ["INFO: Leak sensor ok"]
+    assert index.search(severity="ERROR", vehicle=3) == []
+
+
+def test_search_stops_at_the_limit():
+    index, entries = make_index([(1, f"INFO: ping {i}") for i in range(20)])
+    assert index.search("ping", limit=5) == entries[:-6:-1]
+
+
+def test_terms_with_punctuation_match():
+    index, _ = make_index([
+        (1, "ERROR: R-Pi restarted"),
+        (1, "INFO: Depth 14.6 m"),
+        (1, "INFO: no error here"),
+    ])
+    assert texts(index.search("ERROR:")) == ["ERROR: R-Pi restarted"]
+    assert texts(index.search("r-pi")) == ["ERROR: R-Pi restarted"]
+    assert texts(index.search("14.6")) == ["INFO: Depth 14.6 m"]
+    assert texts(index.search("-")) == ["ERROR: R-Pi restarted"]
+
+
+def test_short_terms_match():
+    lines = [(1, f"DEBUG: Modem packet {i} received") for i in range(300)] + [(1, "INFO: depth 7 m")]
+    index, _ = make_index(lines)
+    assert texts(index.search("7 h")) == ["INFO: depth 7 m"]
+    results = index.search("1", limit=1000)
+    assert texts(results) == [text for _, text in reversed(lines) if "1" in text]
+    #in so many lines that the newest lines are walked instead of merging the postings
+    assert texts(index.search("1", limit=5)) == [text for _, text in reversed(lines) if "1" in text][:5]
+    assert texts(index.search("de", limit=1)) == ["INFO: depth 7 m"]
+    assert index.search("zq") == []
+
+
+def test_terms_in_many_tokens_but_few_lines_match():
+    lines = [(1, f"DEBUG: Modem packet {i} received") for i in range(2000)]
+    index, _ = make_index(lines)
+    assert texts(index.search("199")) == [text for _, text in reversed(lines) if "199" in text][:500]
+
+
+def test_evicted_lines_leave_the_index():
+    index = ConsoleSearchIndex()
+    buffer = RingBuffer(2, on_evict=index.remove)
+    for text in ("ERROR: first leak", "INFO: depth", "ERROR: second leak"):
+        entry = make_entry(1, text)
+        index.add(entry)
+        buffer.append(entry)
+    assert len(index) == 2
+    assert texts(index.search("leak")) == ["ERROR: second leak"]
+    assert index.search("first") == []
+    buffer.clear()
+    assert len(index) == 0
+    assert index.search("leak") == []
+
+
+def test_matches_applies_the_same_filters():
+    entry = make_entry(4, "ERROR: R-Pi restarted")
+    assert ConsoleSearchIndex.matches(entry, ["r-pi"], "ERROR", 4)
+    assert not ConsoleSearchIndex.matches(entry, ["r-pi"], "INFO", 4)
+    assert not ConsoleSearchIndex.matches(entry, ["r-pi"], None, 5)
+    assert not ConsoleSearchIndex.matches(entry, ["leak"])
+    assert ConsoleSearchIndex.matches(entry, [])
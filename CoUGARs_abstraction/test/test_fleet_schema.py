@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from testing_turtle_gui.fleet_schema import CONSOLE_FIELD, DEFAULT_FLEET, TEXT_FIELDS, FleetSchema
+
+
+def test_default_fleet():
+    schema = FleetSchema()
+    assert schema.vehicle_ids == [1, 2, 3]
+    assert schema.labels["Leak_sensors"] == "Leak Detector"
+    assert [key for key, _ in schema.general_page_sensors] == DEFAULT_FLEET["general_page_sensors"]
+
+
+def test_feedback_dict_covers_every_field_and_vehicle():
+    schema = FleetSchema({"vehicle_ids": [4, 7], "console_capacity": 10})
+    feedback_dict = schema.make_feedback_dict()
+    assert set(feedback_dict) == {key for key, _ in schema.status_fields} | set(TEXT_FIELDS) | {CONSOLE_FIELD}
+    assert all(set(values) == {4, 7} for values in feedback_dict.values())
+    assert feedback_dict[CONSOLE_FIELD][4].capacity == 10
+
+
+def test_general_pages():
+    schema = FleetSchema({"vehicle_ids": list(range(1, 8)), "general_page_size": 3})
+    assert schema.general_page_count() == 3
+    assert schema.general_page_vehicles(2) == [7]
+    assert FleetSchema({"vehicle_ids": []}).general_page_count() == 1
+
+
+@pytest.mark.parametrize("key", ["general_page_size", "console_capacity"])
+@pytest.mark.parametrize("value", [0, -1])
+def test_sizes_below_one_are_rejected(key, value):
+    with pytest.raises(ValueError):
+        FleetSchema({key: value})
+
+
+def test_from_json(tmp_path):
+    path = tmp_path / "fleet.json"
+    path.write_text(json.dumps({"vehicle_ids": ["5", 6]}))
+    assert FleetSchema.from_json(path).vehicle_ids == [5, 6]
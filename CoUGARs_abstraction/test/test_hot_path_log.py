@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from testing_turtle_gui.hot_path_log import HotPathLogger
+
+
+class FakeLogger:
+    def __init__(self, level=20):
+        self.level = level
+        self.lines = []
+
+    def get_effective_level(self):
+        return self.level
+
+    def info(self, text):
+        self.lines.append(text)
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        HotPathLogger(FakeLogger(), "loud")
+
+
+def test_sync_writes_every_record():
+    logger = FakeLogger()
+    hot_log = HotPathLogger(logger, "sync")
+    hot_log.log('Publishing from GUI: "%s"', "go")
+    hot_log.log("no arguments %s")
+    assert logger.lines == ['Publishing from GUI: "go"', "no arguments %s"]
+
+
+def test_sampled_writes_the_first_record_of_every_window():
+    logger = FakeLogger()
+    hot_log = HotPathLogger(logger, "sampled", sample_every=3)
+    for i in range(7):
+        hot_log.log("pub %d", i)
+    assert logger.lines == ["pub 0", "pub 3 (2 similar not logged)", "pub 6 (2 similar not logged)"]
+    assert (hot_log.written_count, hot_log.skipped_count) == (3, 4)
+
+
+def test_records_below_the_level_are_not_formatted():
+    class Unformattable:
+        def __str__(self):
+            raise AssertionError("formatted")
+
+    logger = FakeLogger(level=30)
+    hot_log = HotPathLogger(logger, "sync")
+    hot_log.log("%s", Unformattable())
+    assert logger.lines == []
+    logger.level = 20
+    hot_log.refresh_level()
+    hot_log.log("now %s", "on")
+    assert logger.lines == ["now on"]
+
+
+def test_off_writes_nothing():
+    logger = FakeLogger()
+    HotPathLogger(logger, "off").log("pub %d", 1)
+    assert logger.lines == []
+
+
+def test_async_writes_everything_and_close_joins_the_worker():
+    logger = FakeLogger()
+    hot_log = HotPathLogger(logger, "async")
+    worker = hot_log._worker
+    for i in range(1000):
+        hot_log.log("pub %d", i)
+    hot_log.close()
+    assert not worker.is_alive()
+    assert logger.lines == [f"pub {i}" for i in range(1000)]
+    hot_log.log("after close %d", 1)
+    assert len(logger.lines) == 1000
+    assert "hot_path_log" not in [thread.name for thread in threading.enumerate()]
+
+
+def test_async_drops_records_beyond_max_pending():
+    blocked = threading.Lock()
+
+    class BlockedLogger(FakeLogger):
+        #the worker waits here, so it cannot drain while the records are logged
+        def info(self, text):
+            with blocked:
+                self.lines.append(text)
+
+    logger = BlockedLogger()
+    hot_log = HotPathLogger(logger, "async", max_pending=10)
+    with blocked:
+        for i in range(50):
+            hot_log.log("pub %d", i)
+        #at most one record was taken off the queue before the worker blocked
+        assert hot_log.dropped_count >= 50 - 10 - 1
+    hot_log.close()
+    assert len(logger.lines) + hot_log.dropped_count == 50
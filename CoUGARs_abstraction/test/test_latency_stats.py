@@ -0,0 +1,33 @@
+from testing_turtle_gui.latency_stats import LatencyHistogram
+
+
+def test_percentiles_are_accurate_to_a_bucket():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms * 1_000_000)
+    step = 2 ** (1 / LatencyHistogram.BUCKETS_PER_DOUBLING)
+    for percent in (50, 90, 99):
+        exact = percent * 1_000_000
+        assert exact <= histogram.percentile(percent) <= exact * step
+    assert histogram.percentile(100) == 100_000_000
+    assert histogram.summary()["count"] == 100
+
+
+def test_bucket_count_follows_the_resolution():
+    assert LatencyHistogram.BUCKET_COUNT == LatencyHistogram.BUCKETS_PER_DOUBLING * LatencyHistogram.MAX_DOUBLINGS
+    histogram = LatencyHistogram()
+    #a day is well inside the range, only durations beyond MAX_DOUBLINGS go in the last bucket
+    assert histogram.bucket_of(86_400 * 10 ** 9) < histogram.BUCKET_COUNT - 1
+    assert histogram.bucket_of(histogram.MIN_NS * 2 ** (histogram.MAX_DOUBLINGS + 1)) == histogram.BUCKET_COUNT - 1
+    assert histogram.bucket_of(0) == 0
+
+
+def test_merge_and_reset():
+    first, second = LatencyHistogram(), LatencyHistogram()
+    first.record(2_000)
+    second.record(5_000_000)
+    first.merge(second)
+    assert (first.count, first.min_ns, first.max_ns) == (2, 2_000, 5_000_000)
+    first.reset()
+    assert first.count == 0
+    assert first.percentile(50) is None
@@ -0,0 +1,46 @@
+import pytest
+
+pytest.importorskip("rclpy")
+
+from rclpy.qos import DurabilityPolicy, ReliabilityPolicy  # noqa: E402
+
+from testing_turtle_gui.qos_profiles import QosConfig, vehicle_of  # noqa: E402
+
+
+def test_topics_get_their_profiles():
+    config = QosConfig()
+    assert config.profile_name("coug3/fleet_status") == "telemetry"
+    assert config.profile_name("/fleet_status") == "telemetry"
+    assert config.profile_name("coug3/cmd") == "command"
+    assert config.profile_name("fleet_keyframe_request") == "default"
+    assert config.profile("fleet_status").reliability == ReliabilityPolicy.BEST_EFFORT
+
+
+def test_commands_are_not_retained_and_topic_keeps_the_default():
+    config = QosConfig()
+    command = config.profile("coug1/cmd")
+    assert command.durability == DurabilityPolicy.VOLATILE
+    assert command.reliability == ReliabilityPolicy.RELIABLE
+    assert command.lifespan.nanoseconds == 5_000_000_000
+    #nodes publishing on 'topic' with default qos must still match
+    assert config.profile_name("topic") == "default"
+
+
+def test_config_patterns_come_first():
+    config = QosConfig({"profiles": {"radio": {"reliability": "reliable", "depth": 5}},
+                        "topics": {"coug2/fleet_status": "radio"}})
+    assert config.profile_name("coug2/fleet_status") == "radio"
+    assert config.profile_name("coug1/fleet_status") == "telemetry"
+
+
+def test_bad_configs_are_rejected():
+    with pytest.raises(ValueError):
+        QosConfig({"topics": {"fleet_status": "missing"}})
+    with pytest.raises(ValueError):
+        QosConfig({"profiles": {"fast": {"speed": 11}}})
+
+
+def test_vehicle_of():
+    assert vehicle_of("coug12/fleet_status") == 12
+    assert vehicle_of("/coug2/cmd") == 2
+    assert vehicle_of("fleet_status") is None
@@ -0,0 +1,60 @@
+import threading
+import time
+
+from testing_turtle_gui.ros_bridge import RosQtBridge
+
+
+def process_until(qapp, done, timeout_s=10):
+    deadline = time.perf_counter() + timeout_s
+    while not done() and time.perf_counter() < deadline:
+        qapp.processEvents()
+    return done()
+
+
+def test_messages_are_delivered_in_order_on_the_gui_thread(qapp):
+    delivered = []
+    bridge = RosQtBridge(lambda topic, message: delivered.append((topic, message, threading.get_ident())))
+    thread = threading.Thread(target=lambda: [bridge.enqueue("fleet_status", i) for i in range(1000)])
+    thread.start()
+    thread.join()
+    assert bridge.backlog() == 1000
+    assert process_until(qapp, lambda: len(delivered) == 1000)
+    assert [message for _, message, _ in delivered] == list(range(1000))
+    assert {thread_id for _, _, thread_id in delivered} == {threading.get_ident()}
+    assert bridge.backlog() == 0
+
+
+def test_nothing_is_lost_or_miscounted_with_several_threads(qapp):
+    delivered = []
+    bridge = RosQtBridge(lambda topic, message: delivered.append((topic, message)))
+    threads = [threading.Thread(target=lambda topic=topic: [bridge.enqueue(topic, i) for i in range(5000)])
+               for topic in ("coug1/fleet_status", "coug2/fleet_status", "topic", "qos_event")]
+    for thread in threads:
+        thread.start()
+    #drain while the threads are still enqueueing
+    process_until(qapp, lambda: not any(thread.is_alive() for thread in threads))
+    for thread in threads:
+        thread.join()
+    assert process_until(qapp, lambda: len(delivered) == 20000)
+    assert bridge.received_count == bridge.delivered_count == 20000
+    for topic in ("coug1/fleet_status", "coug2/fleet_status", "topic", "qos_event"):
+        assert [message for message_topic, message in delivered if message_topic == topic] == list(range(5000))
+
+
+def test_a_drain_stops_at_what_was_queued_when_it_started(qapp):
+    delivered = []
+
+    def handler(topic, message):
+        delivered.append(message)
+        #a handler that keeps the queue growing must not keep the GUI thread in one drain
+        if message < 10:
+            bridge.enqueue(topic, message + 100)
+
+    bridge = RosQtBridge(handler)
+    for i in range(10):
+        bridge.enqueue("topic", i)
+    bridge._drain()
+    assert delivered == list(range(10))
+    assert bridge.backlog() == 10
+    assert process_until(qapp, lambda: len(delivered) == 20)
+    assert delivered[10:] == list(range(100, 110))
@@ -0,0 +1,61 @@
+import pytest
+
+from testing_turtle_gui.simulated_coug import SimulatedCoug, parse_fault
+
+
+def test_parse_fault():
+    assert parse_fault("leak:2:30") == ("leak", 2, 30.0, 10.0)
+    assert parse_fault("link_loss:1:10:20") == ("link_loss", 1, 10.0, 20.0)
+    assert parse_fault("node_crash 3") == ("node_crash", 3, 0.0, 10.0)
+    with pytest.raises(ValueError):
+        parse_fault("fire:1")
+
+
+def test_link_loss_silences_the_coug_for_its_duration():
+    coug = SimulatedCoug(1)
+    coug.inject("link_loss", 5.0)
+    assert not coug.link_up() and not coug.publishing()
+    coug.step(5.0)
+    assert coug.link_up() and coug.publishing()
+
+
+def test_a_shut_down_coug_is_silent_but_reboots():
+    coug = SimulatedCoug(1)
+    assert coug.handle_command("emergency_shutdown") == (True, "shut down")
+    assert coug.link_up()
+    assert not coug.publishing()
+    assert coug.handle_command("start_mission") == (False, "shut down")
+    assert coug.handle_command("system_reboot") == (True, "rebooted")
+    assert coug.publishing()
+    assert all(coug.states[key] == 1 for key, _ in coug.schema.nodes)
+
+
+def test_start_mission_is_refused_after_a_leak():
+    coug = SimulatedCoug(1)
+    coug.inject("leak")
+    assert coug.handle_command("start_mission") == (False, "leak detected")
+    assert coug.take_console()[-1] == ("ERROR", "Leak detected in the main hull, surfacing")
+
+
+def test_unknown_command():
+    assert SimulatedCoug(1).handle_command("self_destruct")[0] is False
+
+
+def test_take_console_leaves_the_lines_beyond_the_limit():
+    coug = SimulatedCoug(1)
+    for i in range(5):
+        coug.log(f"INFO: line {i}")
+    assert coug.take_console(2) == [("INFO", "line 0"), ("INFO", "line 1")]
+    assert coug.take_console() == [("INFO", f"line {i}") for i in range(2, 5)]
+    assert coug.take_console() == []
+
+
+def test_runs_are_repeatable_with_a_seed():
+    first, second = SimulatedCoug(1, seed=7), SimulatedCoug(1, seed=7)
+    for coug in (first, second):
+        coug.handle_command("start_mission")
+        for _ in range(100):
+            coug.step(0.5, console_rate=2.0)
+    assert first.states == second.states
+    assert first.texts == second.texts
+    assert first.take_console() == second.take_console()
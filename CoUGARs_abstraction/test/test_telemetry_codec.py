@@ -0,0 +1,160 @@
+import pytest
+
+from testing_turtle_gui.fleet_schema import FleetSchema
+from testing_turtle_gui.telemetry_codec import (
+    HEADER, KIND_DELTA, KIND_KEYFRAME, MAX_CONSOLE_LINES, MAX_TEXT_BYTES, CodecError, DeltaEncoder, StatusDecoder,
+    StatusEncoder)
+
+SCHEMA = FleetSchema()
+KEYS = [key for key, _ in SCHEMA.status_fields]
+
+
+def test_keyframe_round_trip():
+    states = {key: i % 3 for i, key in enumerate(KEYS)}
+    texts = {"Status_messages": "running", "Modems": "ping 40 m"}
+    console = [("ERROR", "Leak detected"), ("INFO", "Depth 14.6 m, héading 90")]
+    payload = StatusEncoder(SCHEMA).encode(2, 7, 123456789, states, texts, console)
+
+    status = StatusDecoder(SCHEMA).decode(payload)
+    assert (status.vehicle_id, status.seq, status.stamp_ns, status.kind) == (2, 7, 123456789, KIND_KEYFRAME)
+    assert status.states == states
+    assert status.texts == texts
+    assert status.console == console
+
+
+def test_keyframe_leaves_out_unreported_fields():
+    payload = StatusEncoder(SCHEMA).encode(1, 0, 0, {KEYS[0]: 2})
+    assert StatusDecoder(SCHEMA).decode(payload).states == {KEYS[0]: 2}
+
+
+def test_unsupported_version_is_rejected():
+    payload = bytearray(StatusEncoder(SCHEMA).encode(1, 0, 0, {}))
+    payload[0] = 99
+    with pytest.raises(CodecError):
+        StatusDecoder(SCHEMA).decode(bytes(payload))
+
+
+@pytest.mark.parametrize("cut", [1, 3, 8])
+def test_truncated_message_is_rejected(cut):
+    encoder = DeltaEncoder(SCHEMA)
+    encoder.encode(1, 0, {}, {"Status_messages": "waiting"})
+    payload = encoder.encode(1, 0, {}, {"Status_messages": "hello world"})
+    with pytest.raises(CodecError):
+        StatusDecoder(SCHEMA).decode(payload[:-cut])
+
+
+def test_every_prefix_of_a_message_is_rejected():
+    payload = StatusEncoder(SCHEMA).encode(1, 0, 0, {KEYS[0]: 1}, {"Missions": "survey"}, [("INFO", "ok")])
+    decoder = StatusDecoder(SCHEMA)
+    for end in range(len(payload)):
+        with pytest.raises(CodecError):
+            decoder.decode(payload[:end])
+
+
+def test_trailing_bytes_are_rejected():
+    payload = StatusEncoder(SCHEMA).encode(1, 0, 0, {})
+    with pytest.raises(CodecError):
+        StatusDecoder(SCHEMA).decode(payload + b"\x00")
+
+
+def test_too_many_console_lines_are_rejected():
+    encoder = StatusEncoder(SCHEMA)
+    encoder.encode(1, 0, 0, {}, console=[("INFO", "line")] * MAX_CONSOLE_LINES)
+    with pytest.raises(CodecError):
+        encoder.encode(1, 0, 0, {}, console=[("INFO", "line")] * (MAX_CONSOLE_LINES + 1))
+
+
+def test_too_long_texts_are_rejected():
+    encoder = StatusEncoder(SCHEMA)
+    with pytest.raises(CodecError):
+        encoder.encode(1, 0, 0, {}, {"Last_messages": "x" * (MAX_TEXT_BYTES + 1)})
+    with pytest.raises(CodecError):
+        encoder.encode(1, 0, 0, {}, console=[("INFO", "é" * (MAX_TEXT_BYTES // 2 + 1))])
+
+
+def test_rejected_message_does_not_use_up_a_seq():
+    encoder = DeltaEncoder(SCHEMA)
+    encoder.encode(1, 0, {})
+    with pytest.raises(CodecError):
+        encoder.encode(1, 0, {}, console=[("INFO", "line")] * (MAX_CONSOLE_LINES + 1))
+    payload = encoder.encode(1, 0, {})
+    assert HEADER.unpack_from(payload)[3] == 1
+    assert HEADER.unpack_from(payload)[1] == KIND_DELTA
+
+
+def test_deltas_only_carry_changes():
+    encoder = DeltaEncoder(SCHEMA, keyframe_interval=3)
+    decoder = StatusDecoder(SCHEMA)
+    states = {key: 1 for key in KEYS}
+    texts = {"Status_messages": "waiting"}
+
+    first = decoder.decode(encoder.encode(1, 0, states, texts))
+    assert first.kind == KIND_KEYFRAME
+    states[KEYS[2]] = 0
+    delta = decoder.decode(encoder.encode(1, 0, states, texts, [("INFO", "new line")]))
+    assert delta.kind == KIND_DELTA
+    assert delta.states == {KEYS[2]: 0}
+    assert delta.texts == {}
+    assert delta.console == [("INFO", "new line")]
+    assert decoder.decode(encoder.encode(1, 0, states, texts)).states == {}
+    #every keyframe_interval-th message is a keyframe again
+    assert decoder.decode(encoder.encode(1, 0, states, texts)).kind == KIND_KEYFRAME
+
+    assert decoder.vehicle_states[1] == dict(states, **texts)
+    assert encoder.stats.keyframes == 2
+    assert encoder.stats.deltas == 2
+
+
+def test_request_keyframe():
+    encoder = DeltaEncoder(SCHEMA)
+    encoder.encode(1, 0, {})
+    encoder.encode(2, 0, {})
+    encoder.request_keyframe(2)
+    assert HEADER.unpack_from(encoder.encode(1, 0, {}))[1] == KIND_DELTA
+    assert HEADER.unpack_from(encoder.encode(2, 0, {}))[1] == KIND_KEYFRAME
+    encoder.request_keyframe()
+    assert HEADER.unpack_from(encoder.encode(1, 0, {}))[1] == KIND_KEYFRAME
+
+
+def test_gap_needs_a_keyframe():
+    gaps = []
+    encoder = DeltaEncoder(SCHEMA)
+    decoder = StatusDecoder(SCHEMA, on_gap=lambda vehicle_id, missed: gaps.append((vehicle_id, missed)))
+    decoder.decode(encoder.encode(1, 0, {KEYS[0]: 1}))
+    encoder.encode(1, 0, {KEYS[0]: 0})
+    encoder.encode(1, 0, {KEYS[0]: 1})
+    decoder.decode(encoder.encode(1, 0, {KEYS[0]: 2}))
+    assert gaps == [(1, 2)]
+    assert decoder.needs_keyframe == {1}
+    assert (decoder.stats.gaps, decoder.stats.missed_messages) == (1, 2)
+
+    encoder.request_keyframe(1)
+    decoder.decode(encoder.encode(1, 0, {KEYS[0]: 2}))
+    assert decoder.needs_keyframe == set()
+
+
+def test_first_delta_from_a_vehicle_needs_a_keyframe():
+    encoder = DeltaEncoder(SCHEMA)
+    encoder.encode(3, 0, {})
+    decoder = StatusDecoder(SCHEMA)
+    decoder.decode(encoder.encode(3, 0, {}))
+    assert decoder.needs_keyframe == {3}
+
+
+def test_restarted_vehicle_is_not_a_gap():
+    decoder = StatusDecoder(SCHEMA)
+    encoder = StatusEncoder(SCHEMA)
+    decoder.decode(encoder.encode(1, 50, 0, {}))
+    decoder.decode(encoder.encode(1, 0, 0, {}))
+    assert decoder.stats.gaps == 0
+
+
+def test_truncated_delta_does_not_change_the_state():
+    encoder = DeltaEncoder(SCHEMA)
+    decoder = StatusDecoder(SCHEMA)
+    decoder.decode(encoder.encode(1, 0, {}, {"Status_messages": "waiting"}))
+    payload = encoder.encode(1, 0, {}, {"Status_messages": "hello world"})
+    with pytest.raises(CodecError):
+        decoder.decode(payload[:-3])
+    assert decoder.vehicle_states[1]["Status_messages"] == "waiting"
+    assert decoder.last_seq[1] == 0
@@ -0,0 +1,106 @@
+import os
+
+import pytest
+
+from testing_turtle_gui.telemetry_recorder import (
+    MAX_SEGMENT_BYTES, RecordingReader, TelemetryRecorder, segment_paths)
+
+START_NS = 1_700_000_000_000_000_000
+MS = 1_000_000
+
+
+def record_messages(recorder, count, payload_bytes=100):
+    for i in range(count):
+        topic = "coug1/fleet_status" if i % 2 == 0 else "topic"
+        recorder.record(topic, i.to_bytes(4, "little") * (payload_bytes // 4), START_NS + i * 10 * MS,
+                        keyframe_vehicle=1 if i % 20 == 0 else None)
+
+
+def numbers(records):
+    return [int.from_bytes(bytes(record.payload[:4]), "little") for record in records]
+
+
+def test_records_read_back_in_order(tmp_path):
+    recorder = TelemetryRecorder(tmp_path)
+    record_messages(recorder, 50)
+    recorder.close()
+
+    records = list(RecordingReader(tmp_path).records())
+    assert numbers(records) == list(range(50))
+    assert [record.topic for record in records[:2]] == ["coug1/fleet_status", "topic"]
+    assert records[3].recv_ns == START_NS + 30 * MS
+    assert RecordingReader(tmp_path).start_ns() == START_NS
+    assert recorder.stats()["records"] == 50
+
+
+def test_segments_rotate_and_old_ones_are_deleted(tmp_path):
+    recorder = TelemetryRecorder(tmp_path, segment_bytes=4096)
+    record_messages(recorder, 200)
+    recorder.close()
+    assert len(segment_paths(tmp_path)) > 2
+    #every segment defines its own topics
+    assert numbers(RecordingReader(tmp_path).records()) == list(range(200))
+    assert all(os.path.getsize(path) <= 4096 for path in segment_paths(tmp_path))
+
+    kept = TelemetryRecorder(tmp_path / "kept", segment_bytes=4096, max_segments=2)
+    record_messages(kept, 200)
+    kept.close()
+    paths = segment_paths(tmp_path / "kept")
+    assert len(paths) == 2
+    assert sorted(os.listdir(tmp_path / "kept")) == sorted(
+        os.path.basename(path) for path in paths + [path[:-4] + ".idx" for path in paths])
+    assert numbers(RecordingReader(tmp_path / "kept").records())[-1] == 199
+
+
+def test_a_new_recorder_continues_the_numbering(tmp_path):
+    for _ in range(2):
+        recorder = TelemetryRecorder(tmp_path)
+        record_messages(recorder, 3)
+        recorder.close()
+    assert [os.path.basename(path) for path in segment_paths(tmp_path)] == ["segment_000001.rec", "segment_000002.rec"]
+
+
+def test_unclosed_segment_can_be_read(tmp_path):
+    recorder = TelemetryRecorder(tmp_path, segment_bytes=1024 * 1024, index_interval_ms=100)
+    record_messages(recorder, 40)
+    #the index is on disk while recording, without flush or close
+    assert len(RecordingReader(tmp_path).time_index) >= 3
+    recorder.flush()
+    #the segment is still preallocated, the reader stops at the first empty record
+    assert numbers(RecordingReader(tmp_path).records()) == list(range(40))
+    recorder.close()
+
+
+def test_seek_through_the_index(tmp_path):
+    recorder = TelemetryRecorder(tmp_path, segment_bytes=4096, index_interval_ms=100)
+    record_messages(recorder, 200)
+    recorder.close()
+    reader = RecordingReader(tmp_path)
+
+    target_ns = START_NS + 1234 * MS
+    entry = reader.seek_entry(target_ns)
+    assert entry.recv_ns <= target_ns
+    records = [record for record in reader.records(entry.segment, entry.offset) if record.recv_ns >= target_ns]
+    assert numbers(records) == list(range(124, 200))
+    #topics defined before the seek position are known
+    assert {record.topic for record in records} == {"coug1/fleet_status", "topic"}
+
+    keyframes = reader.last_keyframes(target_ns)
+    assert list(keyframes) == [1]
+    assert keyframes[1].recv_ns == START_NS + 1200 * MS
+    first = next(reader.records(keyframes[1].segment, keyframes[1].offset))
+    assert numbers([first]) == [120]
+
+    assert reader.seek_entry(START_NS - 1) is None
+
+
+def test_segment_size_is_limited(tmp_path):
+    with pytest.raises(ValueError):
+        TelemetryRecorder(tmp_path, segment_bytes=MAX_SEGMENT_BYTES + 1)
+    with pytest.raises(ValueError):
+        TelemetryRecorder(tmp_path, segment_bytes=0)
+
+
+def test_missing_recording(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        RecordingReader(tmp_path)
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+from PyQt6.QtCore import QEventLoop, QTimer
+
+from testing_turtle_gui.fleet_schema import FleetSchema
+from testing_turtle_gui.telemetry_codec import DeltaEncoder, HEADER, KIND_KEYFRAME
+from testing_turtle_gui.telemetry_recorder import RecordingReader, TelemetryRecorder
+from testing_turtle_gui.telemetry_replay import ReplaySource
+
+START_NS = 1_700_000_000_000_000_000
+MS = 1_000_000
+SCHEMA = FleetSchema({"vehicle_ids": [1, 2]})
+
+
+@pytest.fixture
+def recording(tmp_path):
+    encoder = DeltaEncoder(SCHEMA, keyframe_interval=10)
+    recorder = TelemetryRecorder(tmp_path, index_interval_ms=100)
+    for i in range(100):
+        vehicle_id = 1 + i % 2
+        texts = {"Status_messages": f"status {i}"}
+        payload = encoder.encode(vehicle_id, START_NS, {}, texts, [("INFO", f"line {i}")])
+        keyframe = HEADER.unpack_from(payload)[1] == KIND_KEYFRAME
+        recorder.record(f"coug{vehicle_id}/fleet_status", payload, START_NS + i * 10 * MS,
+                        vehicle_id if keyframe else None)
+    ack = {"ack": "abcd1234-1", "vehicle": 1, "attempt": 1, "accepted": True, "detail": "mission started"}
+    recorder.record("topic", json.dumps(ack).encode("utf-8"), START_NS + 1000 * MS)
+    recorder.record("topic", b"Starting the missions...", START_NS + 1001 * MS)
+    recorder.close()
+    return RecordingReader(tmp_path)
+
+
+@pytest.fixture
+def window(qapp):
+    from testing_turtle_gui.tabbed_window import MainWindow
+    window = MainWindow(None, SCHEMA)
+    yield window
+    window.close()
+
+
+#runs action and then the event loop until signal is emitted, connected first so the signal can't be missed
+def wait_for(signal, action, timeout_ms=10000):
+    loop = QEventLoop()
+    timer = QTimer()
+    timer.setSingleShot(True)
+    timer.timeout.connect(loop.quit)
+    signal.connect(loop.quit)
+    timer.start(timeout_ms)
+    action()
+    loop.exec()
+    signal.disconnect(loop.quit)
+    assert timer.isActive(), "timed out"
+
+
+def console_texts(window, vehicle_id):
+    return [entry.text for entry in window.feedback_dict["Console_messages"][vehicle_id]]
+
+
+def play_to_the_end(source):
+    wait_for(source.finished, source.start)
+    #the last messages are still on their way through the bridge
+    loop = QEventLoop()
+    QTimer.singleShot(50, loop.quit)
+    loop.exec()
+
+
+def test_replay_delivers_the_recording(recording, window):
+    source = ReplaySource(recording, window, speed=0.0)
+    play_to_the_end(source)
+    source.stop()
+    assert window.feedback_dict["Status_messages"][1] == "status 98"
+    assert window.feedback_dict["Status_messages"][2] == "status 99"
+    assert console_texts(window, 1) == [f"line {i}" for i in range(0, 100, 2)]
+    assert window.confirm_reject_label.text() == "Starting the missions..."
+
+
+def test_recorded_acks_do_not_reach_the_command_tracker(recording, window):
+    source = ReplaySource(recording, window, speed=0.0)
+    play_to_the_end(source)
+    source.stop()
+    assert window.command_tracker.unmatched_ack_count == 0
+    assert source.delivered_count == 101
+
+
+def test_seeking_back_clears_the_consoles(recording, window):
+    source = ReplaySource(recording, window, speed=0.0)
+    play_to_the_end(source)
+    assert len(window.console_index) == 100
+
+    source.pause()
+    wait_for(source.seeked, lambda: source.seek(START_NS + 505 * MS))
+    #the state at the seek position is rebuilt without replaying the console
+    assert window.feedback_dict["Status_messages"][1] == "status 50"
+    assert window.feedback_dict["Status_messages"][2] == "status 49"
+    assert console_texts(window, 1) == []
+    assert len(window.console_index) == 0
+
+    wait_for(source.finished, source.resume)
+    source.stop()
+    assert console_texts(window, 2) == [f"line {i}" for i in range(51, 100, 2)]
+
+
+def test_seeking_forward_keeps_the_consoles(recording, window):
+    source = ReplaySource(recording, window, speed=0.0)
+    source.pause()
+    source.start()
+    wait_for(source.position_changed, source.step)
+    wait_for(source.seeked, lambda: source.seek(START_NS + 505 * MS))
+    source.stop()
+    assert console_texts(window, 1) == ["line 0"]
+    assert window.feedback_dict["Status_messages"][2] == "status 49"
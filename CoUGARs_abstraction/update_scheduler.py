@@ -0,0 +1,79 @@
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from testing_turtle_gui.perf_probes import probe
+
+
+class UpdateScheduler(QObject):
+    """
+    Collects dirty (field, coug) cells and applies them at most once per frame.
+
+    Marking a cell dirty only records it. A single-shot timer fires at the next frame
+    boundary (max_hz caps the rate) and calls apply(field, coug) once for every cell
+    that changed since the last frame, no matter how many times it changed.
+    """
+
+    #emitted after a frame's cells were applied
+    frame_applied = pyqtSignal()
+
+    def __init__(self, apply, max_hz=30, parent=None):
+        """
+        Parameters:
+            apply (function): called on the GUI thread as apply(field, coug_number)
+            max_hz (int): maximum number of frames applied per second
+            parent (QObject): optional Qt parent
+        """
+        super().__init__(parent)
+        self.apply = apply
+        self._dirty = {}
+        self._last_frame = 0.0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self.set_max_hz(max_hz)
+
+        #counters
+        self.updates_received = 0
+        self.updates_applied = 0
+        self.updates_coalesced = 0
+        self.frames = 0
+
+    def set_max_hz(self, max_hz):
+        self.max_hz = max_hz
+        self.frame_interval = 1.0 / max_hz
+
+    def mark_dirty(self, field, coug_number):
+        self.updates_received += 1
+        if (field, coug_number) in self._dirty:
+            self.updates_coalesced += 1
+        else:
+            self._dirty[(field, coug_number)] = True
+
+        if not self._timer.isActive():
+            #wait for the rest of the frame if the last one was applied recently
+            wait = self._last_frame + self.frame_interval - time.monotonic()
+            self._timer.start(max(0, int(wait * 1000)))
+
+    #applies every dirty cell, normally called by the timer
+    @probe("update_scheduler.flush")
+    def flush(self):
+        self._timer.stop()
+        dirty, self._dirty = self._dirty, {}
+        self._last_frame = time.monotonic()
+        if not dirty:
+            return
+        self.frames += 1
+        for field, coug_number in dirty:
+            self.apply(field, coug_number)
+            self.updates_applied += 1
+        self.frame_applied.emit()
+
+    def stats(self):
+        return {
+            "updates_received": self.updates_received,
+            "updates_applied": self.updates_applied,
+            "updates_coalesced": self.updates_coalesced,
+            "frames": self.frames,
+        }
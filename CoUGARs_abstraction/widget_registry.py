@@ -0,0 +1,74 @@
+class WidgetHandle:
+    """
+    The live widget showing one feedback cell on one page, and the layout it sits in.
+    """
+
+    __slots__ = ("widget", "layout", "label")
+
+    def __init__(self, widget, layout, label):
+        self.widget = widget
+        self.layout = layout
+        self.label = label
+
+
+class WidgetRegistry:
+    """
+    Maps (field, coug_number, page) straight to the widget handles built for it.
+
+    Filled by the page builders as they create widgets, so updates never have to search
+    the widget tree. A cell can be shown on more than one page (e.g. "General" and "Coug"),
+    handles_for(field, coug_number) returns all of them so they are updated together.
+    """
+
+    def __init__(self):
+        self._handles = {}
+        #(field, coug_number) -> {page: handle}
+        self._by_cell = {}
+        #(coug_number, page) -> fields registered there
+        self._by_vehicle = {}
+
+    def register(self, field, coug_number, page, widget, layout, label=""):
+        """
+        Parameters:
+            field (str): feedback_dict key, e.g. "Wifi_connections"
+            coug_number (int): which Coug the widget belongs to
+            page (str): which page the widget is on, e.g. "General" or "Coug"
+            widget (QWidget): the widget showing the cell
+            layout (QLayout): the layout the widget was added to
+            label (str): text shown next to the status icon
+        """
+        handle = WidgetHandle(widget, layout, label)
+        self._handles[(field, coug_number, page)] = handle
+        self._by_cell.setdefault((field, coug_number), {})[page] = handle
+        self._by_vehicle.setdefault((coug_number, page), set()).add(field)
+        return handle
+
+    def unregister(self, field, coug_number, page):
+        self._handles.pop((field, coug_number, page), None)
+        pages = self._by_cell.get((field, coug_number))
+        if pages:
+            pages.pop(page, None)
+            if not pages:
+                del self._by_cell[(field, coug_number)]
+        fields = self._by_vehicle.get((coug_number, page))
+        if fields:
+            fields.discard(field)
+
+    #drops every handle of one vehicle on one page, e.g. when its General page column is torn down
+    def unregister_vehicle(self, coug_number, page):
+        for field in self._by_vehicle.pop((coug_number, page), set()):
+            self._handles.pop((field, coug_number, page), None)
+            pages = self._by_cell.get((field, coug_number))
+            if pages:
+                pages.pop(page, None)
+                if not pages:
+                    del self._by_cell[(field, coug_number)]
+
+    def get(self, field, coug_number, page):
+        return self._handles.get((field, coug_number, page))
+
+    def handles_for(self, field, coug_number):
+        return self._by_cell.get((field, coug_number), {})
+
+    def __len__(self):
+        return len(self._handles)